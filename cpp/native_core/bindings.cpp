@@ -1,6 +1,9 @@
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include <stdexcept>
+
 #include "native_core.hpp"
 
 namespace py = pybind11;
@@ -57,6 +60,41 @@ Vectorized great-circle distances (meters) for paired coordinates.
         R"pbdoc(
 Project bounding box center from image plane to ground coordinates.
 Uses pinhole model + yaw/pitch/roll to cast a ray to ground plane (flat-earth).
+)pbdoc");
+
+    m.def(
+        "geo_project_bboxes_to_ground",
+        [](double lat_deg, double lon_deg, double alt_m, double yaw_rad, double pitch_rad, double roll_rad,
+           double fx, double fy, double cx, double cy,
+           py::array_t<double, py::array::c_style | py::array::forcecast> bboxes) {
+            if (bboxes.ndim() != 2 || bboxes.shape(1) != 4) {
+                throw std::invalid_argument("bboxes must have shape (N, 4)");
+            }
+            const auto count = static_cast<std::size_t>(bboxes.shape(0));
+            py::array_t<double> out({static_cast<py::ssize_t>(count), static_cast<py::ssize_t>(2)});
+            const double* src = bboxes.data();
+            double* dst = out.mutable_data();
+            {
+                py::gil_scoped_release release;
+                geo_project_bboxes_to_ground(lat_deg, lon_deg, alt_m, yaw_rad, pitch_rad, roll_rad, fx, fy, cx,
+                                             cy, src, count, dst);
+            }
+            return out;
+        },
+        py::arg("lat_deg"),
+        py::arg("lon_deg"),
+        py::arg("alt_m"),
+        py::arg("yaw_rad"),
+        py::arg("pitch_rad"),
+        py::arg("roll_rad"),
+        py::arg("fx"),
+        py::arg("fy"),
+        py::arg("cx"),
+        py::arg("cy"),
+        py::arg("bboxes"),
+        R"pbdoc(
+Batched geo_project_bbox_to_ground for boxes sharing one camera pose.
+Takes a float64 (N, 4) array (no per-element conversion) and returns (N, 2) lat, lon.
 )pbdoc");
 
     m.def(
@@ -92,32 +130,41 @@ Compute total route length (meters). Altitude is currently ignored.
     m.def(
         "route_energy_cost",
         [](const std::vector<double>& lats, const std::vector<double>& lons, const std::vector<double>& alts,
-           double mass_kg, double base_power_w) {
+           double mass_kg, double base_power_w, double cruise_speed_mps, double turn_time_s,
+           double climb_efficiency) {
             if (lats.size() != lons.size() || lats.size() != alts.size()) {
                 throw py::value_error("route_energy_cost: vector sizes must match");
             }
-            return route_energy_cost(lats, lons, alts, mass_kg, base_power_w);
+            return route_energy_cost(
+                lats, lons, alts, mass_kg, base_power_w, cruise_speed_mps, turn_time_s, climb_efficiency);
         },
         py::arg("lats"),
         py::arg("lons"),
         py::arg("alts"),
         py::arg("mass_kg"),
         py::arg("base_power_w"),
+        py::arg("cruise_speed_mps") = 12.0,
+        py::arg("turn_time_s") = 4.0,
+        py::arg("climb_efficiency") = 0.5,
         R"pbdoc(
-Placeholder energy cost model proportional to distance, mass, and base power.
+Route energy in Wh: cruise over distance, climb (m*g*dh / efficiency) and turns
+(share of turn_time_s proportional to the turn angle). Same model as
+fire_uav.module_core.energy.route_cost.
 )pbdoc");
 
     py::class_<BBoxTracker>(m, "BBoxTracker")
         .def(
-            py::init<double, double, double, double, int, int>(),
+            py::init<double, double, double, double, int, int, const std::string&>(),
             py::arg("alpha") = 0.5,
             py::arg("max_center_distance_px") = 80.0,
             py::arg("iou_threshold") = 0.25,
             py::arg("max_age_seconds") = 2.0,
             py::arg("min_hits") = 2,
             py::arg("max_missed") = 10,
+            py::arg("assignment") = "greedy",
             R"pbdoc(
 Lightweight IoU/center-based tracker with bbox smoothing.
+assignment: "greedy" (score-sorted) or "hungarian" (optimal linear assignment per class).
 )pbdoc")
         .def(
             "assign_and_smooth",
@@ -139,8 +186,14 @@ Lightweight IoU/center-based tracker with bbox smoothing.
                     d.timestamp = (t.size() >= 7) ? py::cast<double>(t[6]) : 0.0;
                     dets.push_back(d);
                 }
+                std::vector<AssignResult> results;
+                {
+                    // Python objects are only touched outside this block.
+                    py::gil_scoped_release release;
+                    results = self.assign_and_smooth(dets);
+                }
                 py::list out;
-                for (const auto& res : self.assign_and_smooth(dets)) {
+                for (const auto& res : results) {
                     out.append(py::make_tuple(res.det_index, res.track_id, py::make_tuple(res.x1, res.y1, res.x2, res.y2)));
                 }
                 return out;
@@ -150,6 +203,5 @@ Lightweight IoU/center-based tracker with bbox smoothing.
 Assign detections to tracks and smooth bboxes.
 Input: list of tuples (class_id, confidence, x1, y1, x2, y2[, timestamp_seconds]).
 Returns list of tuples (det_index, track_id, (x1,y1,x2,y2)).
-)pbdoc",
-            py::call_guard<py::gil_scoped_release>());
+)pbdoc");
 }
@@ -3,6 +3,8 @@
 #include <algorithm>
 #include <cmath>
 #include <chrono>
+#include <limits>
+#include <numeric>
 #include <stdexcept>
 #include <tuple>
 #include <vector>
@@ -10,6 +12,9 @@
 namespace {
 constexpr double kEarthRadiusM = 6'371'000.0;  // meters
 constexpr double kPi = 3.14159265358979323846;
+constexpr double kInf = std::numeric_limits<double>::infinity();
+// Cost of a gated-out pair; exceeds any sum of scores (scores are in [0, 1]).
+constexpr double kGatedCost = 1e6;
 
 inline double deg2rad(double deg) {
     return deg * kPi / 180.0;
@@ -33,6 +38,66 @@ double geo_distance_m(double lat1_deg, double lon1_deg, double lat2_deg, double
     return kEarthRadiusM * c;
 }
 
+namespace {
+// Camera pose shared by every box of a frame: rotation, intrinsics and ENU scale
+// are computed once, then each box costs one matrix-vector product.
+struct GroundProjection {
+    double lat_deg, lon_deg, alt_m;
+    double fx, fy, cx, cy;
+    double r[3][3];
+    double deg_per_m_lat, deg_per_m_lon;
+
+    GroundProjection(double lat, double lon, double alt, double yaw_rad, double pitch_rad, double roll_rad,
+                     double fx_, double fy_, double cx_, double cy_)
+        : lat_deg(lat), lon_deg(lon), alt_m(alt), cx(cx_), cy(cy_) {
+        // Guard intrinsics to avoid division by zero.
+        fx = (fx_ == 0.0) ? 1.0 : fx_;
+        fy = (fy_ == 0.0) ? 1.0 : fy_;
+
+        // Rotation Z (yaw) * Y (pitch) * X (roll) -> world (ENU-ish).
+        const double cyaw = std::cos(yaw_rad), syaw = std::sin(yaw_rad);
+        const double cpitch = std::cos(pitch_rad), spitch = std::sin(pitch_rad);
+        const double croll = std::cos(roll_rad), sroll = std::sin(roll_rad);
+        r[0][0] = cyaw * cpitch;
+        r[0][1] = cyaw * spitch * sroll - syaw * croll;
+        r[0][2] = cyaw * spitch * croll + syaw * sroll;
+        r[1][0] = syaw * cpitch;
+        r[1][1] = syaw * spitch * sroll + cyaw * croll;
+        r[1][2] = syaw * spitch * croll - cyaw * sroll;
+        r[2][0] = -spitch;
+        r[2][1] = cpitch * sroll;
+        r[2][2] = cpitch * croll;
+
+        deg_per_m_lat = rad2deg(1.0 / kEarthRadiusM);
+        deg_per_m_lon = rad2deg(1.0 / (kEarthRadiusM * std::cos(deg2rad(lat_deg))));
+    }
+
+    // Pinhole model + flat earth: cast a ray from camera through bbox center and
+    // intersect with ground plane z=0 (alt_m above ground). Assumes camera frame
+    // has +X right, +Y down, +Z forward.
+    void project(double x_min, double y_min, double x_max, double y_max, double* out_lat,
+                 double* out_lon) const {
+        const double u = (x_min + x_max) * 0.5;
+        const double v = (y_min + y_max) * 0.5;
+        // Ray in camera frame.
+        const double dir_cam[3] = {(u - cx) / fx, (v - cy) / fy, 1.0};
+
+        const double dx = r[0][0] * dir_cam[0] + r[0][1] * dir_cam[1] + r[0][2] * dir_cam[2];
+        const double dy = r[1][0] * dir_cam[0] + r[1][1] * dir_cam[1] + r[1][2] * dir_cam[2];
+        const double dz = r[2][0] * dir_cam[0] + r[2][1] * dir_cam[1] + r[2][2] * dir_cam[2];
+
+        // Intersect with ground plane z=0 from origin at (0,0,alt_m).
+        *out_lat = lat_deg;
+        *out_lon = lon_deg;
+        if (std::abs(dz) > 1e-6) {
+            const double t = -alt_m / dz;  // step along ray
+            *out_lat = lat_deg + t * dy * deg_per_m_lat;
+            *out_lon = lon_deg + t * dx * deg_per_m_lon;
+        }
+    }
+};
+}  // namespace
+
 void geo_project_bbox_to_ground(
     double lat_deg, double lon_deg, double alt_m,
     double yaw_rad, double pitch_rad, double roll_rad,
@@ -40,48 +105,10 @@ void geo_project_bbox_to_ground(
     double x_min, double y_min, double x_max, double y_max,
     double* out_lat_center_deg,
     double* out_lon_center_deg) {
-    // Pinhole model + flat earth: cast a ray from camera through bbox center and
-    // intersect with ground plane z=0 (alt_m above ground). Assumes camera frame
-    // has +X right, +Y down, +Z forward.
-    const double u = (x_min + x_max) * 0.5;
-    const double v = (y_min + y_max) * 0.5;
-    // Guard intrinsics to avoid division by zero.
-    fx = (fx == 0.0) ? 1.0 : fx;
-    fy = (fy == 0.0) ? 1.0 : fy;
-    const double x_cam = (u - cx) / fx;
-    const double y_cam = (v - cy) / fy;
-    // Ray in camera frame.
-    const double dir_cam[3] = {x_cam, y_cam, 1.0};
-
-    // Rotation Z (yaw) * Y (pitch) * X (roll) -> world (ENU-ish).
-    const double cyaw = std::cos(yaw_rad), syaw = std::sin(yaw_rad);
-    const double cpitch = std::cos(pitch_rad), spitch = std::sin(pitch_rad);
-    const double croll = std::cos(roll_rad), sroll = std::sin(roll_rad);
-
-    const double r00 = cyaw * cpitch;
-    const double r01 = cyaw * spitch * sroll - syaw * croll;
-    const double r02 = cyaw * spitch * croll + syaw * sroll;
-    const double r10 = syaw * cpitch;
-    const double r11 = syaw * spitch * sroll + cyaw * croll;
-    const double r12 = syaw * spitch * croll - cyaw * sroll;
-    const double r20 = -spitch;
-    const double r21 = cpitch * sroll;
-    const double r22 = cpitch * croll;
-
-    const double dx = r00 * dir_cam[0] + r01 * dir_cam[1] + r02 * dir_cam[2];
-    const double dy = r10 * dir_cam[0] + r11 * dir_cam[1] + r12 * dir_cam[2];
-    const double dz = r20 * dir_cam[0] + r21 * dir_cam[1] + r22 * dir_cam[2];
-
-    // Intersect with ground plane z=0 from origin at (0,0,alt_m).
+    const GroundProjection proj(lat_deg, lon_deg, alt_m, yaw_rad, pitch_rad, roll_rad, fx, fy, cx, cy);
     double out_lat = lat_deg;
     double out_lon = lon_deg;
-    if (std::abs(dz) > 1e-6) {
-        const double t = -alt_m / dz;  // step along ray
-        const double gx = t * dx;
-        const double gy = t * dy;
-        offset_latlon(lat_deg, lon_deg, gx, gy, &out_lat, &out_lon);
-    }
-
+    proj.project(x_min, y_min, x_max, y_max, &out_lat, &out_lon);
     if (out_lat_center_deg) {
         *out_lat_center_deg = out_lat;
     }
@@ -90,6 +117,19 @@ void geo_project_bbox_to_ground(
     }
 }
 
+void geo_project_bboxes_to_ground(
+    double lat_deg, double lon_deg, double alt_m,
+    double yaw_rad, double pitch_rad, double roll_rad,
+    double fx, double fy, double cx, double cy,
+    const double* bboxes, std::size_t count,
+    double* out_latlon) {
+    const GroundProjection proj(lat_deg, lon_deg, alt_m, yaw_rad, pitch_rad, roll_rad, fx, fy, cx, cy);
+    for (std::size_t i = 0; i < count; ++i) {
+        const double* b = bboxes + 4 * i;
+        proj.project(b[0], b[1], b[2], b[3], out_latlon + 2 * i, out_latlon + 2 * i + 1);
+    }
+}
+
 void offset_latlon(double lat_deg, double lon_deg, double dx_m, double dy_m,
                    double* out_lat_deg, double* out_lon_deg) {
     // ENU approximation.
@@ -137,18 +177,201 @@ double route_length_m(const std::vector<double>& lats_deg,
     return total;
 }
 
+namespace {
+// Same constants as fire_uav.module_core.geometry / energy.route_cost.
+constexpr double kWgs84RadiusM = 6'378'137.0;
+constexpr double kGravity = 9.80665;
+constexpr double kSecondsPerHour = 3600.0;
+
+double haversine_wgs84_m(double lat1_deg, double lon1_deg, double lat2_deg, double lon2_deg) {
+    const double lat1 = deg2rad(lat1_deg);
+    const double lat2 = deg2rad(lat2_deg);
+    const double a = std::pow(std::sin((lat2 - lat1) / 2), 2) +
+                     std::cos(lat1) * std::cos(lat2) * std::pow(std::sin(deg2rad(lon2_deg - lon1_deg) / 2), 2);
+    return 2 * kWgs84RadiusM * std::asin(std::sqrt(std::min(1.0, a)));
+}
+}  // namespace
+
 double route_energy_cost(const std::vector<double>& lats_deg,
                          const std::vector<double>& lons_deg,
                          const std::vector<double>& alts_m,
                          double mass_kg,
-                         double base_power_w) {
+                         double base_power_w,
+                         double cruise_speed_mps,
+                         double turn_time_s,
+                         double climb_efficiency) {
     if (lats_deg.size() != lons_deg.size() || lats_deg.size() != alts_m.size()) {
         throw std::invalid_argument("route_energy_cost: vector sizes must match");
     }
-    const double length_m = route_length_m(lats_deg, lons_deg, alts_m);
-    // Placeholder model; refine with aerodynamics/drag as needed.
-    const double energy = length_m * mass_kg * base_power_w * 1e-3;
-    return energy;
+    const size_t n = lats_deg.size();
+    if (n < 2) {
+        return 0.0;
+    }
+    if (cruise_speed_mps <= 0.0) {
+        return kInf;
+    }
+    // Cruise over horizontal distance + climb (m*g*dh / efficiency, descent is free)
+    // + turn at every inner waypoint (share of turn_time_s proportional to the angle).
+    double energy_ws = 0.0;
+    for (size_t i = 1; i < n; ++i) {
+        const double dist = haversine_wgs84_m(lats_deg[i - 1], lons_deg[i - 1], lats_deg[i], lons_deg[i]);
+        energy_ws += dist / cruise_speed_mps * base_power_w;
+        const double climb = alts_m[i] - alts_m[i - 1];
+        if (climb > 0.0) {
+            energy_ws += climb * mass_kg * kGravity / climb_efficiency;
+        }
+    }
+    for (size_t i = 1; i + 1 < n; ++i) {
+        const double k0 = std::cos(deg2rad((lats_deg[i] + lats_deg[i - 1]) / 2));
+        const double k1 = std::cos(deg2rad((lats_deg[i + 1] + lats_deg[i]) / 2));
+        const double dx0 = (lons_deg[i] - lons_deg[i - 1]) * k0, dy0 = lats_deg[i] - lats_deg[i - 1];
+        const double dx1 = (lons_deg[i + 1] - lons_deg[i]) * k1, dy1 = lats_deg[i + 1] - lats_deg[i];
+        const double angle = std::abs(std::atan2(dx0 * dy1 - dy0 * dx1, dx0 * dx1 + dy0 * dy1));
+        energy_ws += angle / kPi * turn_time_s * base_power_w;
+    }
+    return energy_ws / kSecondsPerHour;
+}
+
+// ───────────── Linear assignment ─────────────
+namespace {
+// One shortest augmenting path from row i (Crouse 2016); returns sink column or -1.
+int augmenting_path(int nc,
+                    const double* cost,
+                    const std::vector<double>& u,
+                    const std::vector<double>& v,
+                    std::vector<int>& path,
+                    const std::vector<int>& row4col,
+                    std::vector<double>& shortest,
+                    int i,
+                    std::vector<bool>& sr,
+                    std::vector<bool>& sc,
+                    std::vector<int>& remaining,
+                    double* p_min_val) {
+    double min_val = 0.0;
+    int num_remaining = nc;
+    for (int it = 0; it < nc; ++it) {
+        // Reverse order keeps a constant cost matrix assigned to the identity.
+        remaining[it] = nc - it - 1;
+    }
+    std::fill(sr.begin(), sr.end(), false);
+    std::fill(sc.begin(), sc.end(), false);
+    std::fill(shortest.begin(), shortest.end(), kInf);
+
+    int sink = -1;
+    while (sink == -1) {
+        int index = -1;
+        double lowest = kInf;
+        sr[i] = true;
+        for (int it = 0; it < num_remaining; ++it) {
+            const int j = remaining[it];
+            const double r = min_val + cost[static_cast<size_t>(i) * nc + j] - u[i] - v[j];
+            if (r < shortest[j]) {
+                path[j] = i;
+                shortest[j] = r;
+            }
+            // On ties prefer a column that closes the path (free column).
+            if (shortest[j] < lowest || (shortest[j] == lowest && row4col[j] == -1)) {
+                lowest = shortest[j];
+                index = it;
+            }
+        }
+        min_val = lowest;
+        if (min_val == kInf) {
+            return -1;
+        }
+        const int j = remaining[index];
+        if (row4col[j] == -1) {
+            sink = j;
+        } else {
+            i = row4col[j];
+        }
+        sc[j] = true;
+        remaining[index] = remaining[--num_remaining];
+    }
+    *p_min_val = min_val;
+    return sink;
+}
+}  // namespace
+
+bool linear_sum_assignment(int nr, int nc, const std::vector<double>& cost,
+                           std::vector<int>* rows, std::vector<int>* cols) {
+    rows->clear();
+    cols->clear();
+    if (nr == 0 || nc == 0) {
+        return true;
+    }
+    // Tall matrices are solved transposed.
+    const bool transpose = nc < nr;
+    std::vector<double> temp;
+    const double* c = cost.data();
+    if (transpose) {
+        temp.resize(static_cast<size_t>(nr) * nc);
+        for (int i = 0; i < nr; ++i) {
+            for (int j = 0; j < nc; ++j) {
+                temp[static_cast<size_t>(j) * nr + i] = cost[static_cast<size_t>(i) * nc + j];
+            }
+        }
+        std::swap(nr, nc);
+        c = temp.data();
+    }
+
+    std::vector<double> u(nr, 0.0);
+    std::vector<double> v(nc, 0.0);
+    std::vector<double> shortest(nc);
+    std::vector<int> path(nc, -1);
+    std::vector<int> col4row(nr, -1);
+    std::vector<int> row4col(nc, -1);
+    std::vector<bool> sr(nr);
+    std::vector<bool> sc(nc);
+    std::vector<int> remaining(nc);
+
+    for (int cur_row = 0; cur_row < nr; ++cur_row) {
+        double min_val = 0.0;
+        const int sink = augmenting_path(nc, c, u, v, path, row4col, shortest, cur_row, sr, sc, remaining, &min_val);
+        if (sink < 0) {
+            return false;
+        }
+        // Update dual variables.
+        u[cur_row] += min_val;
+        for (int i = 0; i < nr; ++i) {
+            if (sr[i] && i != cur_row) {
+                u[i] += min_val - shortest[col4row[i]];
+            }
+        }
+        for (int j = 0; j < nc; ++j) {
+            if (sc[j]) {
+                v[j] -= min_val - shortest[j];
+            }
+        }
+        // Augment previous solution.
+        int j = sink;
+        while (true) {
+            const int i = path[j];
+            row4col[j] = i;
+            std::swap(col4row[i], j);
+            if (i == cur_row) {
+                break;
+            }
+        }
+    }
+
+    rows->reserve(nr);
+    cols->reserve(nr);
+    if (transpose) {
+        std::vector<int> order(nr);
+        std::iota(order.begin(), order.end(), 0);
+        std::stable_sort(order.begin(), order.end(), [&](int a, int b) { return col4row[a] < col4row[b]; });
+        for (int k : order) {
+            rows->push_back(col4row[k]);
+            cols->push_back(k);
+        }
+    } else {
+        for (int i = 0; i < nr; ++i) {
+            rows->push_back(i);
+            cols->push_back(col4row[i]);
+        }
+    }
+    return true;
 }
 
 // ───────────── Tracking / smoothing ─────────────
@@ -157,14 +380,21 @@ BBoxTracker::BBoxTracker(double alpha,
                          double iou_threshold,
                          double max_age_seconds,
                          int min_hits,
-                         int max_missed)
+                         int max_missed,
+                         const std::string& assignment)
     : alpha_(alpha),
       max_center_distance_(max_center_distance_px),
       iou_threshold_(iou_threshold),
       max_age_seconds_(max_age_seconds),
       min_hits_(min_hits),
       max_missed_(max_missed),
-      next_track_id_(0) {}
+      hungarian_(assignment == "hungarian"),
+      next_track_id_(0) {
+    if (assignment != "greedy" && assignment != "hungarian") {
+        throw std::invalid_argument("BBoxTracker: unknown assignment mode '" + assignment + "'");
+    }
+}
+
 
 double BBoxTracker::iou(const TrackState& t, double x1, double y1, double x2, double y2) {
     const double inter_x1 = std::max(t.x1, x1);
@@ -205,6 +435,105 @@ double BBoxTracker::center_sim(const TrackState& t,
     return std::max(0.0, 1.0 - dist / max_center_dist);
 }
 
+bool BBoxTracker::pair_score(const TrackState& t, const DetectionInput& d, double* score) const {
+    if (d.class_id != t.class_id) {
+        return false;
+    }
+    const double i = iou(t, d.x1, d.y1, d.x2, d.y2);
+    const double c = center_sim(t, d.x1, d.y1, d.x2, d.y2, max_center_distance_);
+    if (i < iou_threshold_ && c <= 0.0) {
+        return false;
+    }
+    *score = (i >= iou_threshold_) ? i : (0.001 + 0.2 * c);
+    return true;
+}
+
+std::vector<std::pair<size_t, size_t>> BBoxTracker::match_greedy(
+    const std::vector<DetectionInput>& detections) const {
+    // Candidate list (score, track_idx, det_idx) in track-major order; stable sort keeps
+    // that order on equal scores, matching the Python tracker.
+    std::vector<std::tuple<double, size_t, size_t>> candidates;
+    for (size_t ti = 0; ti < tracks_.size(); ++ti) {
+        for (size_t di = 0; di < detections.size(); ++di) {
+            double score = 0.0;
+            if (pair_score(tracks_[ti], detections[di], &score)) {
+                candidates.emplace_back(score, ti, di);
+            }
+        }
+    }
+    std::stable_sort(candidates.begin(), candidates.end(),
+                     [](const auto& a, const auto& b) { return std::get<0>(a) > std::get<0>(b); });
+
+    std::vector<bool> det_used(detections.size(), false);
+    std::vector<bool> track_used(tracks_.size(), false);
+    std::vector<std::pair<size_t, size_t>> pairs;
+    for (const auto& cand : candidates) {
+        const size_t ti = std::get<1>(cand);
+        const size_t di = std::get<2>(cand);
+        if (track_used[ti] || det_used[di]) {
+            continue;
+        }
+        track_used[ti] = true;
+        det_used[di] = true;
+        pairs.emplace_back(ti, di);
+    }
+    return pairs;
+}
+
+std::vector<std::pair<size_t, size_t>> BBoxTracker::match_hungarian(
+    const std::vector<DetectionInput>& detections) const {
+    std::vector<int> classes;
+    classes.reserve(detections.size());
+    for (const auto& d : detections) {
+        classes.push_back(d.class_id);
+    }
+    std::sort(classes.begin(), classes.end());
+    classes.erase(std::unique(classes.begin(), classes.end()), classes.end());
+
+    std::vector<std::pair<size_t, size_t>> pairs;
+    std::vector<int> rows, cols;
+    for (int cls : classes) {
+        std::vector<size_t> track_idx, det_idx;
+        for (size_t ti = 0; ti < tracks_.size(); ++ti) {
+            if (tracks_[ti].class_id == cls) {
+                track_idx.push_back(ti);
+            }
+        }
+        if (track_idx.empty()) {
+            continue;
+        }
+        for (size_t di = 0; di < detections.size(); ++di) {
+            if (detections[di].class_id == cls) {
+                det_idx.push_back(di);
+            }
+        }
+        const int nr = static_cast<int>(track_idx.size());
+        const int nc = static_cast<int>(det_idx.size());
+        std::vector<double> cost(static_cast<size_t>(nr) * nc, kGatedCost);
+        std::vector<bool> valid(cost.size(), false);
+        bool any_valid = false;
+        for (int r = 0; r < nr; ++r) {
+            for (int c = 0; c < nc; ++c) {
+                double score = 0.0;
+                if (pair_score(tracks_[track_idx[r]], detections[det_idx[c]], &score)) {
+                    cost[static_cast<size_t>(r) * nc + c] = -score;
+                    valid[static_cast<size_t>(r) * nc + c] = true;
+                    any_valid = true;
+                }
+            }
+        }
+        if (!any_valid || !linear_sum_assignment(nr, nc, cost, &rows, &cols)) {
+            continue;
+        }
+        for (size_t k = 0; k < rows.size(); ++k) {
+            if (valid[static_cast<size_t>(rows[k]) * nc + cols[k]]) {
+                pairs.emplace_back(track_idx[rows[k]], det_idx[cols[k]]);
+            }
+        }
+    }
+    return pairs;
+}
+
 void BBoxTracker::prune(double now) {
     std::vector<TrackState> kept;
     kept.reserve(tracks_.size());
@@ -219,46 +548,31 @@ void BBoxTracker::prune(double now) {
 }
 
 std::vector<AssignResult> BBoxTracker::assign_and_smooth(const std::vector<DetectionInput>& detections) {
-    using Clock = std::chrono::steady_clock;
-    const double now = std::chrono::duration<double>(Clock::now().time_since_epoch()).count();
+    // Track ages are measured against detection timestamps (epoch seconds, as passed from
+    // Python); wall clock is only used when no timestamp is available.
+    using Clock = std::chrono::system_clock;
+    double now = std::chrono::duration<double>(Clock::now().time_since_epoch()).count();
     if (detections.empty()) {
         prune(now);
         return {};
     }
-
-    // Build candidate list (score, track_idx, det_idx).
-    std::vector<std::tuple<double, size_t, size_t>> candidates;
-    for (size_t ti = 0; ti < tracks_.size(); ++ti) {
-        const auto& t = tracks_[ti];
-        for (size_t di = 0; di < detections.size(); ++di) {
-            const auto& d = detections[di];
-            if (d.class_id != t.class_id) {
-                continue;
-            }
-            const double i = iou(t, d.x1, d.y1, d.x2, d.y2);
-            const double c = center_sim(t, d.x1, d.y1, d.x2, d.y2, max_center_distance_);
-            if (i < iou_threshold_ && c <= 0.0) {
-                continue;
-            }
-            const double score = (i >= iou_threshold_) ? i : (0.001 + 0.2 * c);
-            candidates.emplace_back(score, ti, di);
-        }
+    double latest = 0.0;
+    for (const auto& d : detections) {
+        latest = std::max(latest, d.timestamp);
     }
-    std::sort(candidates.begin(), candidates.end(),
-              [](const auto& a, const auto& b) { return std::get<0>(a) > std::get<0>(b); });
+    if (latest > 0.0) {
+        now = latest;
+    }
+    prune(now);
 
-    std::vector<int> det_assigned(detections.size(), -1);  // track idx
+    const auto pairs = hungarian_ ? match_hungarian(detections) : match_greedy(detections);
+
+    std::vector<bool> det_assigned(detections.size(), false);
     std::vector<bool> track_used(tracks_.size(), false);
     std::vector<AssignResult> results;
     results.reserve(detections.size());
 
-    // Greedy assign.
-    for (const auto& cand : candidates) {
-        const size_t ti = std::get<1>(cand);
-        const size_t di = std::get<2>(cand);
-        if (track_used[ti] || det_assigned[di] != -1) {
-            continue;
-        }
+    for (const auto& [ti, di] : pairs) {
         auto& t = tracks_[ti];
         const auto& d = detections[di];
         // Smooth bbox.
@@ -270,14 +584,14 @@ std::vector<AssignResult> BBoxTracker::assign_and_smooth(const std::vector<Detec
         t.hits += 1;
         t.missed = 0;
         t.last_seen = (d.timestamp > 0.0) ? d.timestamp : now;
-        det_assigned[di] = static_cast<int>(ti);
+        det_assigned[di] = true;
         track_used[ti] = true;
         results.push_back({t.x1, t.y1, t.x2, t.y2, t.track_id, static_cast<int>(di)});
     }
 
     // Create tracks for unassigned detections.
     for (size_t di = 0; di < detections.size(); ++di) {
-        if (det_assigned[di] != -1) {
+        if (det_assigned[di]) {
             continue;
         }
         const auto& d = detections[di];
@@ -287,8 +601,8 @@ std::vector<AssignResult> BBoxTracker::assign_and_smooth(const std::vector<Detec
         results.push_back({d.x1, d.y1, d.x2, d.y2, t.track_id, static_cast<int>(di)});
     }
 
-    // Increment missed for unused tracks.
-    track_used.resize(tracks_.size(), false);
+    // Increment missed for unused tracks (tracks created this frame count as used).
+    track_used.resize(tracks_.size(), true);
     for (size_t ti = 0; ti < tracks_.size(); ++ti) {
         if (!track_used[ti]) {
             tracks_[ti].missed += 1;
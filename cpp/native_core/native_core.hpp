@@ -1,5 +1,8 @@
 #pragma once
 
+#include <cstddef>
+#include <string>
+#include <utility>
 #include <vector>
 
 // Geodesic distance between two WGS84 points (degrees) using haversine, meters.
@@ -14,6 +17,15 @@ void geo_project_bbox_to_ground(
     double* out_lat_center_deg,
     double* out_lon_center_deg);
 
+// Batched variant for boxes sharing one camera pose: `bboxes` is row-major (count, 4)
+// x_min, y_min, x_max, y_max; `out_latlon` receives (count, 2) lat, lon.
+void geo_project_bboxes_to_ground(
+    double lat_deg, double lon_deg, double alt_m,
+    double yaw_rad, double pitch_rad, double roll_rad,
+    double fx, double fy, double cx, double cy,
+    const double* bboxes, std::size_t count,
+    double* out_latlon);
+
 // Offset lat/lon by local ENU displacements (meters).
 void offset_latlon(double lat_deg, double lon_deg, double dx_m, double dy_m,
                    double* out_lat_deg, double* out_lon_deg);
@@ -30,13 +42,16 @@ double route_length_m(const std::vector<double>& lats_deg,
                       const std::vector<double>& lons_deg,
                       const std::vector<double>& alts_m);
 
-// Placeholder energy cost model for a route.
-// Throws std::invalid_argument on size mismatch.
+// Route energy in Wh: cruise, climb and turn costs (same model as
+// fire_uav.module_core.energy.route_cost). Throws std::invalid_argument on size mismatch.
 double route_energy_cost(const std::vector<double>& lats_deg,
                          const std::vector<double>& lons_deg,
                          const std::vector<double>& alts_m,
                          double mass_kg,
-                         double base_power_w);
+                         double base_power_w,
+                         double cruise_speed_mps = 12.0,
+                         double turn_time_s = 4.0,
+                         double climb_efficiency = 0.5);
 
 // ───────────── Tracking / smoothing ─────────────
 struct DetectionInput {
@@ -52,14 +67,23 @@ struct AssignResult {
     int det_index;
 };
 
+// Minimum-cost rectangular assignment (shortest augmenting path, same choice order
+// as scipy.optimize.linear_sum_assignment). cost is row-major nr x nc.
+// Returns false if the matrix is infeasible.
+bool linear_sum_assignment(int nr, int nc, const std::vector<double>& cost,
+                           std::vector<int>* rows, std::vector<int>* cols);
+
 class BBoxTracker {
 public:
+    // assignment: "greedy" (score-sorted) or "hungarian" (optimal over gated cost matrix).
+    // Throws std::invalid_argument on unknown mode.
     BBoxTracker(double alpha,
                 double max_center_distance_px,
                 double iou_threshold,
                 double max_age_seconds,
                 int min_hits,
-                int max_missed);
+                int max_missed,
+                const std::string& assignment = "greedy");
 
     std::vector<AssignResult> assign_and_smooth(const std::vector<DetectionInput>& detections);
 
@@ -80,10 +104,15 @@ private:
     double max_age_seconds_;
     int min_hits_;
     int max_missed_;
+    bool hungarian_;
     int next_track_id_;
     std::vector<TrackState> tracks_;
 
     static double iou(const TrackState& t, double x1, double y1, double x2, double y2);
     static double center_sim(const TrackState& t, double x1, double y1, double x2, double y2, double max_center_dist);
+    // Gated score of a (track, detection) pair; returns false if the pair is gated out.
+    bool pair_score(const TrackState& t, const DetectionInput& d, double* score) const;
+    std::vector<std::pair<size_t, size_t>> match_greedy(const std::vector<DetectionInput>& detections) const;
+    std::vector<std::pair<size_t, size_t>> match_hungarian(const std::vector<DetectionInput>& detections) const;
     void prune(double now);
 };
@@ -10,6 +10,7 @@ import fire_uav.infrastructure.providers as deps
 from fire_uav.services.bus import Event, bus
 from fire_uav.services.components.camera import CameraThread
 from fire_uav.services.components.detect import DetectThread
+from fire_uav.services.components.mailbox import make_frame_mailbox
 from fire_uav.services.lifecycle.manager import LifecycleManager
 
 _log = logging.getLogger(__name__)
@@ -26,7 +27,7 @@ def init_core(*, fps: int = 30) -> None:
     if deps.lifecycle_manager is not None:
         return
 
-    deps.frame_queue = Queue(maxsize=5)
+    deps.frame_queue = make_frame_mailbox()
     deps.dets_queue = Queue(maxsize=5)
 
     if _camera_available():
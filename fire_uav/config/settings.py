@@ -30,6 +30,14 @@ class Settings:
     track_min_hits: int = 2
     track_max_missed: int = 10
     track_max_center_distance_px: float = 80.0
+    track_assignment: str = "greedy"  # greedy | hungarian
+    track_motion_model: str = "none"  # none | kalman
+    track_yaw_compensation: bool = True
+    geo_projector: str = "flat"  # flat | dem
+    dem_dir: Path = Path("data/dem")
+    dem_max_open_tiles: int = 16
+    dem_home_elevation_m: float | None = None  # None → высота над рельефом под БПЛА
+    elevation_http_url: str | None = None  # opentopodata-совместимый запасной сервис
     visualizer_enabled: bool = False
     visualizer_url: str = "http://127.0.0.1:8000"
 
@@ -38,6 +46,23 @@ class Settings:
     yolo_conf: float = 0.4
     yolo_iou: float = 0.45
     yolo_classes: List[int] = field(default_factory=lambda: [0, 1, 2])
+    detect_batch_size: int = 1  # >1 — кадры копятся в пачку на один вызов модели
+    detect_batch_wait_ms: float = 20.0  # сколько ждать добора пачки после первого кадра
+    frame_queue_size: int = 1  # 1 — только последний кадр; >1 — кольцо, старые вытесняются
+    detect_adaptive_skip: bool = True  # в детектор идёт каждый k-й кадр по замеренной задержке
+    detect_target_load: float = 0.9  # целевая загрузка детектора для подбора k
+    detect_max_frame_stride: int = 15  # верхняя граница k
+    detect_backend: str = "torch"  # torch | onnx
+    detect_imgsz: int = 640  # размер входа экспортированной модели
+    onnx_intra_op_threads: int = 0  # 0 — по числу ядер
+    onnx_inter_op_threads: int = 0
+    onnx_providers: List[str] = field(default_factory=lambda: ["CPUExecutionProvider"])
+    detect_int8_model: str | None = None  # INT8 ONNX из quantize_detector; задан — грузится он
+    detect_tile_size: int = 0  # >0 — нарезка кадра на тайлы этого размера (px), 0 — весь кадр
+    detect_tile_overlap: float = 0.2  # доля перекрытия соседних тайлов
+    detect_tile_full_frame: bool = True  # плюс проход по всему кадру для крупных объектов
+    detect_tile_merge_ios: float = 0.6  # порог склейки боксов тайлов (пересечение / меньший)
+    detect_tile_batch: int = 8  # тайлов на один вызов модели
 
     # Общие пути
     output_root: Path = Path("data/outputs")
@@ -55,6 +80,10 @@ class Settings:
     agg_max_distance_m: float = 35.0
     agg_ttl_seconds: float = 8.0
 
+    # Манёвры: обход запретных зон
+    no_fly_geojson: str = "data/no_fly_zones.geojson"
+    nfz_margin_m: float = 20.0
+
     # ------------------------ #
 
     @classmethod
@@ -85,12 +114,59 @@ class Settings:
             track_max_center_distance_px=float(
                 data.get("track_max_center_distance_px", defaults.track_max_center_distance_px)
             ),
+            track_assignment=str(data.get("track_assignment", defaults.track_assignment)),
+            track_motion_model=str(data.get("track_motion_model", defaults.track_motion_model)),
+            track_yaw_compensation=bool(
+                data.get("track_yaw_compensation", defaults.track_yaw_compensation)
+            ),
+            geo_projector=str(data.get("geo_projector", defaults.geo_projector)),
+            dem_dir=Path(data.get("dem_dir", defaults.dem_dir)),
+            dem_max_open_tiles=int(data.get("dem_max_open_tiles", defaults.dem_max_open_tiles)),
+            dem_home_elevation_m=data.get(
+                "dem_home_elevation_m", defaults.dem_home_elevation_m
+            ),
+            elevation_http_url=data.get(
+                "elevation_http_url", defaults.elevation_http_url
+            ),
             visualizer_enabled=bool(data.get("visualizer_enabled", defaults.visualizer_enabled)),
             visualizer_url=data.get("visualizer_url", defaults.visualizer_url),
             yolo_model=data.get("yolo_model", defaults.yolo_model),
             yolo_conf=float(data.get("yolo_conf", defaults.yolo_conf)),
             yolo_iou=float(data.get("yolo_iou", defaults.yolo_iou)),
             yolo_classes=list(data.get("yolo_classes", defaults.yolo_classes)),
+            detect_batch_size=int(data.get("detect_batch_size", defaults.detect_batch_size)),
+            detect_batch_wait_ms=float(
+                data.get("detect_batch_wait_ms", defaults.detect_batch_wait_ms)
+            ),
+            frame_queue_size=int(data.get("frame_queue_size", defaults.frame_queue_size)),
+            detect_adaptive_skip=bool(
+                data.get("detect_adaptive_skip", defaults.detect_adaptive_skip)
+            ),
+            detect_target_load=float(data.get("detect_target_load", defaults.detect_target_load)),
+            detect_max_frame_stride=int(
+                data.get("detect_max_frame_stride", defaults.detect_max_frame_stride)
+            ),
+            detect_backend=str(data.get("detect_backend", defaults.detect_backend)),
+            detect_imgsz=int(data.get("detect_imgsz", defaults.detect_imgsz)),
+            onnx_intra_op_threads=int(
+                data.get("onnx_intra_op_threads", defaults.onnx_intra_op_threads)
+            ),
+            onnx_inter_op_threads=int(
+                data.get("onnx_inter_op_threads", defaults.onnx_inter_op_threads)
+            ),
+            onnx_providers=list(data.get("onnx_providers", defaults.onnx_providers)),
+            detect_int8_model=data.get("detect_int8_model", defaults.detect_int8_model),
+            detect_tile_size=int(data.get("detect_tile_size", defaults.detect_tile_size)),
+            detect_tile_overlap=float(
+                data.get("detect_tile_overlap", defaults.detect_tile_overlap)
+            ),
+            detect_tile_full_frame=bool(
+                data.get("detect_tile_full_frame", defaults.detect_tile_full_frame)
+            ),
+            detect_tile_merge_ios=float(
+                data.get("detect_tile_merge_ios", defaults.detect_tile_merge_ios)
+            ),
+            detect_tile_batch=int(data.get("detect_tile_batch", defaults.detect_tile_batch)),
             output_root=Path(data.get("output_root", defaults.output_root)),
             ground_station_host=data.get("ground_station_host", defaults.ground_station_host),
             ground_station_port=int(data.get("ground_station_port", defaults.ground_station_port)),
@@ -103,6 +179,8 @@ class Settings:
             agg_min_confidence=float(data.get("agg_min_confidence", defaults.agg_min_confidence)),
             agg_max_distance_m=float(data.get("agg_max_distance_m", defaults.agg_max_distance_m)),
             agg_ttl_seconds=float(data.get("agg_ttl_seconds", defaults.agg_ttl_seconds)),
+            no_fly_geojson=str(data.get("no_fly_geojson", defaults.no_fly_geojson)),
+            nfz_margin_m=float(data.get("nfz_margin_m", defaults.nfz_margin_m)),
         )
 
 
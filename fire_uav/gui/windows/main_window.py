@@ -616,11 +616,7 @@ class MainWindow(QObject):
 
     # ---------- slots from threads ---------- #
     def _on_frame(self, frame: NDArray[np.uint8]) -> None:
-        if self._frame_q is not None:
-            try:
-                self._frame_q.put_nowait(frame)
-            except Exception:
-                pass
+        # в очередь детектора кадр кладёт сам поток камеры (out_queue)
         self.app.on_frame(frame)
 
     # ---------- camera helpers ---------- #
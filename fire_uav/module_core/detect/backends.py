@@ -0,0 +1,291 @@
+"""
+Бэкенды инференса детектора: PyTorch (Ultralytics) и ONNX Runtime.
+
+ONNX-модель экспортируется из `settings.yolo_model` один раз и кладётся рядом
+с исходной: `<имя>.<sha256 весов>.onnx`, так что смена весов даёт новый файл,
+а повторный запуск берёт готовый. На CPU ONNX Runtime заметно быстрее PyTorch;
+число потоков (`onnx_intra_op_threads`, `onnx_inter_op_threads`) и провайдеры
+(`onnx_providers`, например OpenVINOExecutionProvider при установленном
+onnxruntime-openvino) настраиваются. Предобработка (letterbox) и NMS для ONNX —
+свои, на NumPy/OpenCV, без PyTorch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from fire_uav.module_core.detect.nms import nms
+from fire_uav.module_core.interfaces.detector import IInferenceBackend, RawDetections
+
+try:
+    import onnxruntime as _ort
+except ImportError:  # pragma: no cover
+    _ort = None
+
+ort: Any | None = _ort
+
+_log = logging.getLogger(__name__)
+
+_PAD_VALUE = 114  # серый фон letterbox, как в Ultralytics
+_MAX_DET = 300
+_STRIDE = 32  # шаг сетки YOLO: вход динамической модели кратен ему
+_export_lock = threading.Lock()
+
+
+def model_digest(model_path: str | Path) -> str:
+    """Короткий sha256 файла весов (или имени, если файла нет — веса скачает Ultralytics)."""
+    path = Path(model_path)
+    h = hashlib.sha256()
+    if path.is_file():
+        with path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+    else:
+        h.update(str(model_path).encode())
+    return h.hexdigest()[:16]
+
+
+def exported_path(model_path: str | Path, fmt: str = "onnx") -> Path:
+    """Путь к экспортированной модели рядом с исходной, с хэшем весов в имени."""
+    path = Path(model_path)
+    return path.with_name(f"{path.stem}.{model_digest(path)}.{fmt}")
+
+
+def export_onnx(model_path: str | Path, imgsz: int = 640) -> Path:
+    """ONNX-версия модели (динамические batch и размер); экспорт только при первом вызове."""
+    target = exported_path(model_path)
+    with _export_lock:
+        if target.is_file():
+            return target
+        from ultralytics import YOLO
+
+        _log.info("Exporting %s to ONNX (imgsz=%d)", model_path, imgsz)
+        produced = Path(YOLO(str(model_path)).export(format="onnx", imgsz=imgsz, dynamic=True))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        data = produced.with_name(produced.name + ".data")
+        if data.is_file():
+            # новый экспортёр torch кладёт веса отдельным файлом — собираем в один
+            import onnx
+
+            onnx.save_model(onnx.load(str(produced)), str(target))
+            produced.unlink()
+            data.unlink()
+        else:
+            shutil.move(str(produced), target)
+    return target
+
+
+def letterbox_shape(
+    shapes: Sequence[Tuple[int, int]], size: int, stride: int = _STRIDE
+) -> Tuple[int, int]:
+    """
+    Общий вход (h, w) для пачки кадров: длинная сторона вписывается в size, короткая
+    добивается только до кратного stride (rect-режим Ultralytics) — для 16:9 это
+    640×384 вместо 640×640, почти вдвое меньше работы сети.
+    """
+    h = w = 0
+    for fh, fw in shapes:
+        r = min(size / fh, size / fw)
+        h = max(h, int(np.ceil(round(fh * r) / stride) * stride))
+        w = max(w, int(np.ceil(round(fw * r) / stride) * stride))
+    return h, w
+
+
+def letterbox(
+    frame_bgr: NDArray[np.uint8], size: int | Tuple[int, int]
+) -> Tuple[NDArray[np.uint8], float, Tuple[int, int]]:
+    """
+    Вписать кадр в size×size (или (h, w)) с полями по центру:
+    (изображение, масштаб, (сдвиг x, сдвиг y)).
+    """
+    th, tw = (size, size) if isinstance(size, int) else size
+    h, w = frame_bgr.shape[:2]
+    r = min(th / h, tw / w)
+    nw, nh = round(w * r), round(h * r)
+    dx, dy = (tw - nw) / 2, (th - nh) / 2
+    img = cv2.resize(frame_bgr, (nw, nh), interpolation=cv2.INTER_LINEAR) if r != 1 else frame_bgr
+    top, left = round(dy - 0.1), round(dx - 0.1)
+    boxed = cv2.copyMakeBorder(
+        img,
+        top,
+        th - nh - top,
+        left,
+        tw - nw - left,
+        cv2.BORDER_CONSTANT,
+        value=(_PAD_VALUE,) * 3,
+    )
+    return np.asarray(boxed, dtype=np.uint8), r, (left, top)
+
+
+def to_tensor(images: Sequence[NDArray[np.uint8]], dtype: Any = np.float32) -> NDArray[Any]:
+    """Кадры BGR одного размера → вход сети: RGB, NCHW, 0…1."""
+    x = np.stack(images)[..., ::-1].transpose(0, 3, 1, 2)
+    return np.ascontiguousarray(x, dtype=dtype) / 255
+
+
+class TorchBackend(IInferenceBackend):
+    """Ultralytics YOLO на PyTorch (как раньше в DetectionEngine)."""
+
+    name = "torch"
+
+    def __init__(self, model_path: str | Path, *, conf: float, iou: float, device: str) -> None:
+        from ultralytics import YOLO
+
+        self._yolo = YOLO(str(model_path))
+        self._yolo.overrides |= {"conf": conf, "iou": iou, "device": device}
+
+    def predict(self, frames_bgr: Sequence[NDArray[np.uint8]]) -> List[RawDetections]:
+        out = []
+        for r in self._yolo(list(frames_bgr), verbose=False):
+            b = r.boxes
+            out.append(
+                RawDetections(
+                    boxes=b.xyxy.cpu().numpy(),
+                    scores=b.conf.cpu().numpy(),
+                    classes=b.cls.cpu().numpy().astype(np.int64),
+                )
+            )
+        return out
+
+
+class OnnxBackend(IInferenceBackend):
+    """YOLO, экспортированный в ONNX, на ONNX Runtime; letterbox и NMS на NumPy."""
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        onnx_path: str | Path,
+        *,
+        conf: float,
+        iou: float,
+        imgsz: int = 640,
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 0,
+        providers: Sequence[str] | None = None,
+    ) -> None:
+        if ort is None:  # pragma: no cover
+            raise RuntimeError("Install `onnxruntime` to use the ONNX detector backend")
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = int(intra_op_threads)  # 0 — по числу ядер
+        opts.inter_op_num_threads = int(inter_op_threads)
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        available = ort.get_available_providers()
+        wanted = [p for p in (providers or ["CPUExecutionProvider"]) if p in available]
+        self._session = ort.InferenceSession(
+            str(onnx_path), sess_options=opts, providers=wanted or ["CPUExecutionProvider"]
+        )
+        inp = self._session.get_inputs()[0]
+        self._input = inp.name
+        self._half = "float16" in inp.type
+        # статический вход (экспорт без dynamic): его размер и batch важнее настроек
+        batch, _, h, _ = inp.shape
+        self._imgsz = h if isinstance(h, int) else int(imgsz)
+        self._rect = not isinstance(h, int)
+        self._max_batch = batch if isinstance(batch, int) else None
+        self.conf = float(conf)
+        self.iou = float(iou)
+
+    def _decode(
+        self,
+        pred: NDArray[np.float32],
+        scale: float,
+        pad: Tuple[int, int],
+        shape: Tuple[int, int],
+    ) -> RawDetections:
+        """(4 + nc, A) → боксы кадра после порога, класс-зависимого NMS и обратного letterbox."""
+        cls_scores = pred[4:]
+        classes = cls_scores.argmax(axis=0)
+        scores = cls_scores[classes, np.arange(pred.shape[1])]
+        ok = scores >= self.conf
+        xywh, scores, classes = pred[:4, ok].T, scores[ok], classes[ok]
+        xyxy = np.empty_like(xywh)
+        xyxy[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+        xyxy[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+        keep = nms(xyxy, scores, self.iou, classes, max_det=_MAX_DET)
+        boxes = np.asarray(xyxy[keep], dtype=np.float32)
+        boxes -= np.array(pad * 2, dtype=np.float32)
+        boxes /= scale
+        h, w = shape
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+        return RawDetections(
+            boxes=boxes, scores=scores[keep], classes=classes[keep].astype(np.int64)
+        )
+
+    def predict(self, frames_bgr: Sequence[NDArray[np.uint8]]) -> List[RawDetections]:
+        frames = list(frames_bgr)
+        step = self._max_batch or max(1, len(frames))
+        out: List[RawDetections] = []
+        for i in range(0, len(frames), step):
+            chunk = frames[i : i + step]
+            size = (
+                letterbox_shape([(f.shape[0], f.shape[1]) for f in chunk], self._imgsz)
+                if self._rect
+                else self._imgsz
+            )
+            boxed = [letterbox(f, size) for f in chunk]
+            x = to_tensor([b[0] for b in boxed], np.float16 if self._half else np.float32)
+            (pred,) = self._session.run(None, {self._input: x})[:1]
+            for p, f, (_, scale, pad) in zip(pred, chunk, boxed):
+                h, w = f.shape[:2]
+                out.append(self._decode(p.astype(np.float32), scale, pad, (h, w)))
+        return out
+
+
+def make_backend(
+    name: str,
+    model_path: str | Path,
+    *,
+    conf: float,
+    iou: float,
+    device: str,
+    imgsz: int = 640,
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+    providers: Sequence[str] | None = None,
+) -> IInferenceBackend:
+    """Бэкенд по имени (`torch` | `onnx`); `.onnx` в `model_path` запускается как есть."""
+    if name == "onnx" or str(model_path).endswith(".onnx"):
+        if ort is None:
+            _log.warning("onnxruntime is not installed, falling back to the PyTorch backend")
+        else:
+            onnx_path = (
+                Path(model_path)
+                if str(model_path).endswith(".onnx")
+                else export_onnx(model_path, imgsz)
+            )
+            return OnnxBackend(
+                onnx_path,
+                conf=conf,
+                iou=iou,
+                imgsz=imgsz,
+                intra_op_threads=intra_op_threads,
+                inter_op_threads=inter_op_threads,
+                providers=providers,
+            )
+    elif name != "torch":
+        raise ValueError(f"Unknown detector backend: {name!r} (expected 'torch' or 'onnx')")
+    return TorchBackend(model_path, conf=conf, iou=iou, device=device)
+
+
+__all__ = [
+    "OnnxBackend",
+    "TorchBackend",
+    "export_onnx",
+    "exported_path",
+    "letterbox",
+    "letterbox_shape",
+    "make_backend",
+    "model_digest",
+    "to_tensor",
+]
@@ -1,13 +1,17 @@
 """
 Обёртка над Ultralytics-YOLO v8: инференс и приведение результатов
-к pydantic-моделям проекта.
+к pydantic-моделям проекта. Сама модель запускается бэкендом
+(`detect.backends`: PyTorch или ONNX Runtime, настройка `detect_backend`);
+INT8-модель из `scripts.quantize_detector` подключается через `detect_int8_model`,
+нарезка кадров высокого разрешения на тайлы — через `detect_tile_size`.
 """
 
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, List, Sequence, cast
+from typing import Any, List, Sequence
 
 import numpy as np
 import torch
@@ -15,11 +19,13 @@ from numpy.typing import NDArray
 
 from fire_uav.config.settings import settings
 from fire_uav.domain.video.camera import CameraParams
+from fire_uav.module_core.detect import backends as _backends
+from fire_uav.module_core.detect.backends import make_backend
+from fire_uav.module_core.detect.quantize import quantized_path
+from fire_uav.module_core.detect.tiling import predict_tiled
+from fire_uav.module_core.interfaces.detector import RawDetections
 from fire_uav.module_core.schema import Detection, DetectionsBatch, FrameMeta
 
-if TYPE_CHECKING:
-    from ultralytics.engine.results import Results
-
 try:
     from ultralytics import YOLO as _YOLO
 except ImportError:  # pragma: no cover
@@ -30,6 +36,31 @@ YOLO: Any | None = _YOLO
 _log = logging.getLogger(__name__)
 
 
+def _registered_int8_model() -> str | None:
+    """
+    INT8-модель из `settings.detect_int8_model`, если она есть, собрана из текущих
+    весов `yolo_model` (хэш в имени) и её есть чем запустить.
+    """
+    path = settings.detect_int8_model
+    if not path:
+        return None
+    if not Path(path).is_file():
+        _log.warning("INT8 model %s not found, using %s", path, settings.yolo_model)
+        return None
+    if Path(path).name != quantized_path(settings.yolo_model).name:
+        _log.warning(
+            "INT8 model %s was built from other weights than %s, using %s",
+            path,
+            settings.yolo_model,
+            settings.yolo_model,
+        )
+        return None
+    if _backends.ort is None:  # pragma: no cover
+        _log.warning("onnxruntime is not installed, INT8 model %s is ignored", path)
+        return None
+    return path
+
+
 class DetectionEngine:
     """YOLO-детектор, возвращающий pydantic-объекты."""
 
@@ -41,61 +72,121 @@ class DetectionEngine:
         conf_threshold: float | None = None,
         iou_threshold: float | None = None,
         device: str | None = None,
+        backend: str | None = None,
+        tile_size: int | None = None,
     ) -> None:
-        if YOLO is None:  # pragma: no cover
-            raise RuntimeError("Install `ultralytics` to use DetectionEngine")
-
-        model_path = model_path or settings.yolo_model
+        model_path = model_path or _registered_int8_model() or settings.yolo_model
         conf_threshold = conf_threshold or settings.yolo_conf
         iou_threshold = iou_threshold or settings.yolo_iou
         device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        backend = backend or settings.detect_backend
+        if YOLO is None and backend == "torch":  # pragma: no cover
+            raise RuntimeError("Install `ultralytics` to use DetectionEngine")
 
-        self._yolo = YOLO(str(model_path))
-        self._yolo.overrides |= {
-            "conf": conf_threshold,
-            "iou": iou_threshold,
-            "device": device,
-        }
+        self._backend = make_backend(
+            backend,
+            model_path,
+            conf=conf_threshold,
+            iou=iou_threshold,
+            device=device,
+            imgsz=settings.detect_imgsz,
+            intra_op_threads=settings.onnx_intra_op_threads,
+            inter_op_threads=settings.onnx_inter_op_threads,
+            providers=settings.onnx_providers,
+        )
         self._wanted = set(wanted_classes or settings.yolo_classes)
+        self.tile_size = settings.detect_tile_size if tile_size is None else int(tile_size)
 
         _log.info(
-            "YOLO %s loaded (device=%s, conf=%.2f, classes=%s)",
+            "YOLO %s loaded (backend=%s, device=%s, conf=%.2f, classes=%s, tiles=%s)",
             model_path,
+            self._backend.name,
             device,
             conf_threshold,
             sorted(self._wanted) if self._wanted else "ALL",
+            self.tile_size or "off",
+        )
+
+    def predict(self, frames_bgr: Sequence[NDArray[np.uint8]]) -> List[RawDetections]:
+        """Сырые боксы по кадрам; при `tile_size` > 0 — нарезанный инференс (`detect.tiling`)."""
+        if not self.tile_size:
+            return self._backend.predict(frames_bgr)
+        return predict_tiled(
+            self._backend.predict,
+            frames_bgr,
+            tile=self.tile_size,
+            overlap=settings.detect_tile_overlap,
+            full_frame=settings.detect_tile_full_frame,
+            merge_threshold=settings.detect_tile_merge_ios,
+            batch=settings.detect_tile_batch,
         )
 
     # ------------------------------------------------------------------ #
+    def _to_detections(
+        self, raw: RawDetections, camera_id: str, timestamp: datetime
+    ) -> List[Detection]:
+        detections: List[Detection] = []
+        for cls, conf, xyxy in zip(raw.classes.tolist(), raw.scores.tolist(), raw.boxes):
+            if self._wanted and cls not in self._wanted:
+                continue
+            x1, y1, x2, y2 = map(int, xyxy)
+            detections.append(
+                Detection(
+                    camera_id=camera_id,
+                    class_id=int(cls),
+                    confidence=float(conf),
+                    bbox=(x1, y1, x2, y2),
+                    timestamp=timestamp,
+                )
+            )
+        return detections
+
     def infer(
         self,
         frame_bgr: NDArray[np.uint8],
         *,
         camera_id: str = "cam0",
         cam_params: CameraParams | None = None,  # резерв
+        timestamp: datetime | None = None,
         return_batch: bool = False,
     ) -> List[Detection] | DetectionsBatch:
-        """Запуск модели и упаковка результата в pydantic-модели."""
+        """
+        Запуск модели и упаковка результата в pydantic-модели. `timestamp` — время
+        кадра для `FrameMeta` и детекций (по умолчанию — момент вызова).
+        """
+        ts = timestamp or datetime.utcnow()
         h, w = frame_bgr.shape[:2]
-        results = cast(List["Results"], self._yolo(frame_bgr, verbose=False))
-
-        detections: List[Detection] = []
-        for r in results:
-            for cls, conf, xyxy in zip(r.boxes.cls, r.boxes.conf, r.boxes.xyxy):
-                cls_id = int(cls)
-                if self._wanted and cls_id not in self._wanted:
-                    continue
-                x1, y1, x2, y2 = map(int, xyxy)
-                detections.append(
-                    Detection(
-                        camera_id=camera_id,
-                        class_id=cls_id,
-                        confidence=float(conf),
-                        bbox=(x1, y1, x2, y2),
-                    )
-                )
+        (raw,) = self.predict([frame_bgr])
+        detections = self._to_detections(raw, camera_id, ts)
 
         if return_batch:
-            meta = FrameMeta(camera_id=camera_id, width=w, height=h)
+            meta = FrameMeta(timestamp=ts, camera_id=camera_id, width=w, height=h)
             return DetectionsBatch(frame=meta, detections=detections)
         return detections
+
+    def infer_batch(
+        self,
+        frames_bgr: Sequence[NDArray[np.uint8]],
+        *,
+        camera_ids: Sequence[str] | None = None,
+        timestamps: Sequence[datetime] | None = None,
+    ) -> List[DetectionsBatch]:
+        """
+        Один вызов модели на пачку кадров (можно разного размера и с разных камер);
+        результат — свой `DetectionsBatch` на каждый кадр, в том же порядке.
+        Без `timestamps` у всех кадров пачки одно время — момент вызова.
+        """
+        if not frames_bgr:
+            return []
+        camera_ids = camera_ids or ["cam0"] * len(frames_bgr)
+        timestamps = timestamps or [datetime.utcnow()] * len(frames_bgr)
+        results = self.predict(frames_bgr)
+        out: List[DetectionsBatch] = []
+        for i, (frame, r) in enumerate(zip(frames_bgr, results)):
+            ts = timestamps[i]
+            h, w = frame.shape[:2]
+            meta = FrameMeta(timestamp=ts, camera_id=camera_ids[i], width=w, height=h)
+            out.append(
+                DetectionsBatch(frame=meta, detections=self._to_detections(r, camera_ids[i], ts))
+            )
+        return out
@@ -0,0 +1,145 @@
+"""
+Оценка детектора на размеченном наборе: mAP@0.5, mAP@0.5:0.95 и recall на NumPy.
+
+Разметка — формат YOLO (`labels/<кадр>.txt` рядом с `images/` или в той же папке:
+`класс cx cy w h` в долях кадра). Сопоставление предсказаний с разметкой и AP
+(огибающая точности, площадь под PR-кривой по 101 точке) — как в Ultralytics val,
+поэтому числа сопоставимы с отчётами обучения.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fire_uav.module_core.interfaces.detector import RawDetections
+
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def list_images(folder: str | Path, limit: int | None = None) -> List[Path]:
+    """Кадры папки (рекурсивно, в стабильном порядке)."""
+    files = sorted(p for p in Path(folder).rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+    return files[:limit] if limit else files
+
+
+def label_path(image: Path) -> Path:
+    """`.../images/x.jpg` → `.../labels/x.txt`; без папки `images` — txt рядом с кадром."""
+    parts = list(image.parts)
+    if "images" in parts:
+        i = len(parts) - 1 - parts[::-1].index("images")
+        parts[i] = "labels"
+    return Path(*parts).with_suffix(".txt")
+
+
+def load_labels(image: Path, shape: Tuple[int, int]) -> RawDetections | None:
+    """Разметка кадра в пикселях (score = 1); None, если файла разметки нет."""
+    path = label_path(image)
+    if not path.is_file():
+        return None
+    rows = np.loadtxt(path, ndmin=2, dtype=np.float32).reshape(-1, 5)
+    h, w = shape
+    cx, cy, bw, bh = rows[:, 1] * w, rows[:, 2] * h, rows[:, 3] * w, rows[:, 4] * h
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+    return RawDetections(
+        boxes=boxes, scores=np.ones(len(rows), np.float32), classes=rows[:, 0].astype(np.int64)
+    )
+
+
+def box_iou_matrix(a: NDArray[np.float32], b: NDArray[np.float32]) -> NDArray[np.float32]:
+    """Попарный IoU боксов xyxy: (N, 4) × (M, 4) → (N, M)."""
+    lt = np.maximum(a[:, None, :2], b[None, :, :2])
+    rb = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(rb - lt, 0, None).prod(axis=2)
+    area_a = (a[:, 2:] - a[:, :2]).prod(axis=1)
+    area_b = (b[:, 2:] - b[:, :2]).prod(axis=1)
+    iou: NDArray[np.float32] = inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+    return iou
+
+
+def match(pred: RawDetections, truth: RawDetections) -> NDArray[np.bool_]:
+    """(N, T): i-е предсказание — верное при пороге IoU t (одна разметка — одно предсказание)."""
+    tp = np.zeros((len(pred.scores), len(IOU_THRESHOLDS)), dtype=bool)
+    if not len(pred.scores) or not len(truth.scores):
+        return tp
+    iou = box_iou_matrix(truth.boxes, pred.boxes)
+    iou = iou * (truth.classes[:, None] == pred.classes[None, :])
+    for k, t in enumerate(IOU_THRESHOLDS):
+        gi, pi = np.nonzero(iou >= t)
+        if not len(gi):
+            continue
+        order = np.argsort(-iou[gi, pi], kind="stable")
+        gi, pi = gi[order], pi[order]
+        _, first_p = np.unique(pi, return_index=True)
+        gi, pi = gi[first_p], pi[first_p]
+        order = np.argsort(-iou[gi, pi], kind="stable")
+        _, first_g = np.unique(gi[order], return_index=True)
+        tp[pi[order][first_g], k] = True
+    return tp
+
+
+def _average_precision(recall: NDArray[np.float64], precision: NDArray[np.float64]) -> float:
+    r = np.concatenate([[0.0], recall, [1.0]])
+    p = np.concatenate([[1.0], precision, [0.0]])
+    p = np.flip(np.maximum.accumulate(np.flip(p)))
+    y = np.interp(np.linspace(0, 1, 101), r, p)
+    return float((y[1:] + y[:-1]).sum() / 2 / 100)
+
+
+def mean_average_precision(
+    preds: Sequence[RawDetections], truths: Sequence[RawDetections]
+) -> Dict[str, float]:
+    """
+    mAP@0.5 и mAP@0.5:0.95 по классам, встречающимся в разметке, и recall@0.5 —
+    доля размеченных объектов, найденных среди переданных предсказаний.
+    """
+    tps, scores, classes = [], [], []
+    for pred, truth in zip(preds, truths):
+        tps.append(match(pred, truth))
+        scores.append(pred.scores)
+        classes.append(pred.classes)
+    tp = np.concatenate(tps) if tps else np.zeros((0, len(IOU_THRESHOLDS)), bool)
+    conf = np.concatenate(scores) if scores else np.zeros(0)
+    pred_cls = np.concatenate(classes) if classes else np.zeros(0, np.int64)
+    target_cls = np.concatenate([t.classes for t in truths]) if truths else np.zeros(0, np.int64)
+
+    order = np.argsort(-conf, kind="stable")
+    tp, pred_cls = tp[order], pred_cls[order]
+    ap: List[NDArray[np.float64]] = []
+    for c in np.unique(target_cls):
+        hits = tp[pred_cls == c].astype(np.float64)
+        if not len(hits):
+            ap.append(np.zeros(len(IOU_THRESHOLDS)))
+            continue
+        tpc = hits.cumsum(axis=0)
+        fpc = (1 - hits).cumsum(axis=0)
+        recall = tpc / (target_cls == c).sum()
+        precision = tpc / (tpc + fpc)
+        ap.append(
+            np.array(
+                [_average_precision(recall[:, k], precision[:, k]) for k in range(tp.shape[1])]
+            )
+        )
+    if not ap:
+        return {"map50": 0.0, "map50_95": 0.0, "recall50": 0.0}
+    ap_arr = np.asarray(ap)
+    return {
+        "map50": float(ap_arr[:, 0].mean()),
+        "map50_95": float(ap_arr.mean()),
+        "recall50": float(tp[:, 0].sum() / len(target_cls)),
+    }
+
+
+__all__ = [
+    "IOU_THRESHOLDS",
+    "box_iou_matrix",
+    "label_path",
+    "list_images",
+    "load_labels",
+    "match",
+    "mean_average_precision",
+]
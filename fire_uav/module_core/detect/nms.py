@@ -0,0 +1,61 @@
+"""
+Non-maximum suppression на NumPy для бэкендов без PyTorch (ONNX Runtime).
+
+Жадный NMS: на каждом шаге берётся лучший оставшийся бокс, IoU с остальными
+считается одним векторным выражением. Класс-зависимый режим — сдвиг боксов
+каждого класса на своё смещение (как в Ultralytics), чтобы боксы разных классов
+не пересекались и не подавляли друг друга.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+_CLASS_OFFSET = 7680.0  # больше любой стороны кадра (как max_wh в Ultralytics)
+
+
+def box_iou(
+    box: NDArray[np.float32], boxes: NDArray[np.float32], metric: str = "iou"
+) -> NDArray[np.float32]:
+    """
+    IoU одного бокса xyxy (4,) со всеми боксами (N, 4); `metric="ios"` — пересечение,
+    делённое на площадь меньшего (склейка тайлов: обрезанный бокс лежит внутри целого).
+    """
+    w = np.clip(np.minimum(box[2], boxes[:, 2]) - np.maximum(box[0], boxes[:, 0]), 0, None)
+    h = np.clip(np.minimum(box[3], boxes[:, 3]) - np.maximum(box[1], boxes[:, 1]), 0, None)
+    inter = w * h
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    if metric == "ios":
+        denom = np.maximum(np.minimum(area, areas), 1e-9)
+    else:
+        denom = np.maximum(area + areas - inter, 1e-9)
+    iou: NDArray[np.float32] = inter / denom
+    return iou
+
+
+def nms(
+    boxes: ArrayLike,
+    scores: ArrayLike,
+    iou_threshold: float,
+    classes: ArrayLike | None = None,
+    max_det: int = 300,
+    metric: str = "iou",
+) -> NDArray[np.intp]:
+    """Индексы оставленных боксов по убыванию score; с `classes` — NMS внутри каждого класса."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float32).ravel()
+    if classes is not None:
+        boxes = boxes + np.asarray(classes, dtype=np.float32).reshape(-1, 1) * _CLASS_OFFSET
+    order = np.argsort(-scores, kind="stable")
+    keep: list[int] = []
+    while len(order) and len(keep) < max_det:
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+        order = rest[box_iou(boxes[i], boxes[rest], metric) <= iou_threshold]
+    return np.asarray(keep, dtype=np.intp)
+
+
+__all__ = ["box_iou", "nms"]
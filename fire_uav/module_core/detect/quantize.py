@@ -0,0 +1,168 @@
+"""
+INT8-квантование детектора после обучения (статическое, ONNX Runtime).
+
+Исходная ONNX-модель — экспорт `backends.export_onnx`; результат кладётся рядом:
+`<имя>.<sha256 весов>.int8.onnx`. Диапазоны активаций калибруются на папке
+реальных кадров (та же предобработка, что в `OnnxBackend`). Голова детектора
+(декодирование DFL, сетка якорей, склейка координат в пикселях с вероятностями
+классов) остаётся в FP32: общий масштаб INT8 на «0…640» и «0…1» обнуляет score.
+"""
+
+from __future__ import annotations
+
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, List, Sequence
+
+import cv2
+import numpy as np
+
+from fire_uav.module_core.detect.backends import (
+    export_onnx,
+    exported_path,
+    letterbox,
+    letterbox_shape,
+    to_tensor,
+)
+
+onnx: Any | None
+quant: Any | None
+try:
+    import onnx as _onnx
+    from onnxruntime import quantization as _quant
+except ImportError:  # pragma: no cover
+    onnx = quant = None
+else:
+    onnx, quant = _onnx, _quant
+
+_log = logging.getLogger(__name__)
+
+CALIBRATION_METHODS = ("minmax", "entropy", "percentile")
+
+
+def quantized_path(model_path: str | Path) -> Path:
+    """Путь INT8-модели рядом с весами, с хэшем весов в имени."""
+    return exported_path(model_path, "int8.onnx")
+
+
+def head_nodes(model: Any) -> List[str]:
+    """
+    Имена узлов головы YOLO: склейки «сырых» выходов свёрток бокса и класса
+    на каждом масштабе, сами эти свёртки и всё, что после склеек. Ищется по структуре графа, а не по
+    именам — новый экспортёр torch не сохраняет пути модулей (`/model.23/...`).
+    """
+    producer = {out: node for node in model.graph.node for out in node.output}
+    frontier: set[str] = set()
+    for node in model.graph.node:
+        inputs = [producer.get(i) for i in node.input]
+        convs = [p for p in inputs if p is not None and p.op_type == "Conv"]
+        if node.op_type == "Concat" and len(inputs) > 1 and len(convs) == len(inputs):
+            # последние свёртки бокса/класса тоже в FP32: у логитов классов большой bias
+            frontier.update([node.name, *(p.name for p in convs)])
+    if not frontier:
+        return []
+    excluded: List[str] = []
+    tainted: set[str] = set()
+    for node in model.graph.node:  # узлы ONNX в топологическом порядке
+        if node.name in frontier or any(i in tainted for i in node.input):
+            excluded.append(node.name)
+            tainted.update(node.output)
+    return excluded
+
+
+class FolderCalibrationReader:
+    """Кадры из папки → входы сети для калибровки (по одному, rect-letterbox)."""
+
+    def __init__(self, images: Sequence[Path], input_name: str, imgsz: int) -> None:
+        self._images = list(images)
+        self._input = input_name
+        self._imgsz = imgsz
+        self._it: Iterator[dict[str, np.ndarray]] | None = None
+
+    def _feeds(self) -> Iterator[dict[str, np.ndarray]]:
+        for path in self._images:
+            image = cv2.imread(str(path))
+            if image is None:
+                _log.warning("Skipping unreadable calibration image %s", path)
+                continue
+            frame = np.asarray(image, dtype=np.uint8)
+            h, w = frame.shape[:2]
+            size = letterbox_shape([(h, w)], self._imgsz)
+            yield {self._input: to_tensor([letterbox(frame, size)[0]])}
+
+    def get_next(self) -> dict[str, np.ndarray] | None:
+        if self._it is None:
+            self._it = self._feeds()
+        return next(self._it, None)
+
+    def rewind(self) -> None:
+        self._it = None
+
+
+def quantize_int8(
+    model_path: str | Path,
+    calibration_images: Sequence[Path],
+    *,
+    imgsz: int = 640,
+    method: str = "minmax",
+    per_channel: bool = True,
+    output: str | Path | None = None,
+) -> Path:
+    """
+    Статическое INT8 (QDQ: веса int8 по каналам, активации uint8) по кадрам калибровки.
+    `model_path` — веса `.pt` (экспортируются в ONNX) или готовый `.onnx`.
+    """
+    if onnx is None or quant is None:  # pragma: no cover
+        raise RuntimeError("Install `onnx` and `onnxruntime` to quantize the detector")
+    if method not in CALIBRATION_METHODS:
+        raise ValueError(f"Unknown calibration method: {method!r} (expected {CALIBRATION_METHODS})")
+    if not calibration_images:
+        raise ValueError("Calibration set is empty")
+    src = Path(model_path)
+    fp32 = src if src.suffix == ".onnx" else export_onnx(src, imgsz)
+    target = Path(output) if output else quantized_path(src)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepared = Path(tmp) / "prepared.onnx"
+        try:
+            quant.quant_pre_process(str(fp32), str(prepared), skip_symbolic_shape=True)
+        except Exception as exc:  # noqa: BLE001 — предобработка лишь улучшает квантование
+            _log.warning("ONNX pre-processing failed (%s), quantizing the raw export", exc)
+            prepared = fp32
+        model = onnx.load(str(prepared))
+        excluded = head_nodes(model)
+        reader = FolderCalibrationReader(calibration_images, model.graph.input[0].name, imgsz)
+        _log.info(
+            "Quantizing %s: %d calibration images, method=%s, %d head nodes kept in FP32",
+            fp32,
+            len(calibration_images),
+            method,
+            len(excluded),
+        )
+        target.parent.mkdir(parents=True, exist_ok=True)
+        quant.quantize_static(
+            str(prepared),
+            str(target),
+            reader,
+            quant_format=quant.QuantFormat.QDQ,
+            activation_type=quant.QuantType.QUInt8,
+            weight_type=quant.QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method={
+                "minmax": quant.CalibrationMethod.MinMax,
+                "entropy": quant.CalibrationMethod.Entropy,
+                "percentile": quant.CalibrationMethod.Percentile,
+            }[method],
+            nodes_to_exclude=excluded,
+        )
+    return target
+
+
+__all__ = [
+    "CALIBRATION_METHODS",
+    "FolderCalibrationReader",
+    "head_nodes",
+    "quantize_int8",
+    "quantized_path",
+]
@@ -0,0 +1,128 @@
+"""
+Нарезанный (sliced) инференс для кадров высокого разрешения.
+
+Целиком 4K-кадр сжимается до входа сети (640 по длинной стороне — в 6 раз), и
+дальние люди и ранние дымовые шлейфы пропадают. Кадр режется на тайлы
+`detect_tile_size` с перекрытием `detect_tile_overlap`, тайлы всех кадров идут
+в модель пачками по `detect_tile_batch`, боксы переводятся в координаты кадра
+и склеиваются класс-зависимым NMS по пересечению с меньшим боксом (IoS): объект,
+разрезанный краем тайла, целиком лежит в соседнем тайле, и обрезанный бокс
+внутри целого подавляется. Опционально добавляется проход по всему кадру —
+для крупных объектов, которые не помещаются в тайл.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fire_uav.module_core.detect.nms import nms
+from fire_uav.module_core.interfaces.detector import RawDetections
+
+Predict = Callable[[Sequence[NDArray[np.uint8]]], List[RawDetections]]
+
+_EDGE_PX = 2.0  # бокс ближе к внутренней границе тайла считается обрезанным
+_MAX_DET = 300
+
+
+class _Tile(NamedTuple):
+    frame: int
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+
+
+def _starts(length: int, tile: int, overlap: float) -> NDArray[np.int64]:
+    """Начала тайлов по оси: от 0 до length - tile, шаг не больше tile·(1 - overlap)."""
+    if length <= tile:
+        return np.zeros(1, dtype=np.int64)
+    step = max(1.0, tile * (1.0 - overlap))
+    n = int(np.ceil((length - tile) / step)) + 1
+    starts: NDArray[np.int64] = np.round(np.linspace(0, length - tile, n)).astype(np.int64)
+    return starts
+
+
+def tile_grid(shape: Tuple[int, int], tile: int, overlap: float = 0.2) -> NDArray[np.int64]:
+    """Тайлы (K, 4) x0, y0, x1, y1, покрывающие кадр (h, w); крайние прижаты к краю кадра."""
+    h, w = shape
+    xs, ys = _starts(w, tile, overlap), _starts(h, tile, overlap)
+    x0, y0 = (a.ravel() for a in np.meshgrid(xs, ys))
+    return np.stack([x0, y0, np.minimum(x0 + tile, w), np.minimum(y0 + tile, h)], axis=1)
+
+
+def merge_tiles(
+    parts: Sequence[RawDetections],
+    tiles: Sequence[_Tile],
+    shape: Tuple[int, int],
+    threshold: float,
+) -> RawDetections:
+    """
+    Боксы тайлов одного кадра → координаты кадра → класс-зависимый NMS по IoS.
+    Боксы, упёршиеся во внутреннюю границу тайла (объект разрезан), идут в NMS
+    после целых, чтобы при совпадении выживал целый бокс, а не обрезок.
+    """
+    if not parts:
+        return RawDetections(
+            np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int64)
+        )
+    h, w = shape
+    offsets = np.concatenate(
+        [np.repeat([[t.x0, t.y0, t.x0, t.y0]], len(p.scores), axis=0) for p, t in zip(parts, tiles)]
+    ).astype(np.float32)
+    limits = np.concatenate(
+        [np.repeat([[t.x0, t.y0, t.x1, t.y1]], len(p.scores), axis=0) for p, t in zip(parts, tiles)]
+    ).reshape(-1, 4)
+    boxes = np.concatenate([p.boxes for p in parts]).astype(np.float32).reshape(-1, 4) + offsets
+    scores = np.concatenate([p.scores for p in parts]).astype(np.float32)
+    classes = np.concatenate([p.classes for p in parts]).astype(np.int64)
+
+    inner = np.array([0, 0, w, h])
+    cut = (np.abs(boxes - limits) <= _EDGE_PX) & (limits != inner)
+    keep = nms(
+        boxes,
+        scores - cut.any(axis=1),  # score ≤ 1: обрезанные уходят в конец очереди
+        threshold,
+        classes,
+        max_det=_MAX_DET,
+        metric="ios",
+    )
+    return RawDetections(boxes=boxes[keep], scores=scores[keep], classes=classes[keep])
+
+
+def predict_tiled(
+    predict: Predict,
+    frames: Sequence[NDArray[np.uint8]],
+    *,
+    tile: int,
+    overlap: float = 0.2,
+    full_frame: bool = True,
+    merge_threshold: float = 0.6,
+    batch: int = 8,
+) -> List[RawDetections]:
+    """Нарезанный инференс пачки кадров: тайлы всех кадров идут в `predict` пачками по batch."""
+    jobs: List[_Tile] = []
+    for i, frame in enumerate(frames):
+        h, w = frame.shape[:2]
+        grid = tile_grid((h, w), tile, overlap)
+        jobs.extend(_Tile(i, *map(int, t)) for t in grid)
+        if full_frame and len(grid) > 1:
+            jobs.append(_Tile(i, 0, 0, w, h))
+
+    results: List[RawDetections] = []
+    step = max(1, int(batch))
+    for k in range(0, len(jobs), step):
+        chunk = jobs[k : k + step]
+        results.extend(predict([frames[t.frame][t.y0 : t.y1, t.x0 : t.x1] for t in chunk]))
+
+    out = []
+    for i, frame in enumerate(frames):
+        h, w = frame.shape[:2]
+        mine = [(r, t) for r, t in zip(results, jobs) if t.frame == i]
+        out.append(merge_tiles([r for r, _ in mine], [t for _, t in mine], (h, w), merge_threshold))
+    return out
+
+
+__all__ = ["merge_tiles", "predict_tiled", "tile_grid"]
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from collections import deque
+import heapq
+import itertools
+import math
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Deque, List, Sequence
+from typing import Deque, Dict, Iterable, List, Sequence, Tuple
 
-from fire_uav.module_core.geometry import haversine_m
+from fire_uav.module_core.geometry import EARTH_RADIUS_M, haversine_m
 from fire_uav.module_core.schema import GeoDetection, WorldCoord
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectionEvent:
     class_id: int
     confidence: float
@@ -19,27 +22,144 @@ class DetectionEvent:
     track_id: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class _Cluster:
+    """Окно событий кластера; суммы и счётчик кадров обновляются на append/popleft."""
+
     class_id: int
     events: Deque[DetectionEvent] = field(default_factory=deque)
     last_reported: datetime | None = None
+    seq: int = 0  # порядок создания: при равных расстояниях побеждает более ранний
+    cell: Tuple[int, int, int] | None = None
+    deadline: datetime | None = None  # время последнего события + ttl
+    sum_lat: float = 0.0
+    sum_lon: float = 0.0
+    sum_conf: float = 0.0
+    frame_counts: Counter[str] = field(default_factory=Counter)  # мультимножество frame_id
 
     def add(self, event: DetectionEvent, maxlen: int) -> None:
         self.events.append(event)
+        self.sum_lat += event.location.lat
+        self.sum_lon += event.location.lon
+        self.sum_conf += event.confidence
+        self.frame_counts[event.frame_id] += 1
         while len(self.events) > maxlen:
-            self.events.popleft()
+            old = self.events.popleft()
+            self.sum_lat -= old.location.lat
+            self.sum_lon -= old.location.lon
+            self.sum_conf -= old.confidence
+            left = self.frame_counts[old.frame_id] - 1
+            if left:
+                self.frame_counts[old.frame_id] = left
+            else:
+                del self.frame_counts[old.frame_id]
+
+    def clear(self) -> None:
+        self.events.clear()
+        self.frame_counts.clear()
+        # обнуляем, чтобы не копить ошибку округления между окнами
+        self.sum_lat = self.sum_lon = self.sum_conf = 0.0
 
     def centroid(self) -> WorldCoord:
-        lat = sum(ev.location.lat for ev in self.events) / len(self.events)
-        lon = sum(ev.location.lon for ev in self.events) / len(self.events)
-        return WorldCoord(lat=lat, lon=lon)
+        n = len(self.events)
+        return WorldCoord(lat=self.sum_lat / n, lon=self.sum_lon / n)
 
     def votes(self) -> int:
-        return len({ev.frame_id for ev in self.events})
+        return len(self.frame_counts)
 
     def avg_conf(self) -> float:
-        return sum(ev.confidence for ev in self.events) / len(self.events)
+        return self.sum_conf / len(self.events)
+
+
+CellKey = Tuple[int, int, int]  # class_id, ячейка по lat, ячейка по lon
+
+#: больше ячеек по долготе не перебираем — дешевле пройти все кластеры класса
+_MAX_LON_CELLS = 64
+
+
+class _ClusterIndex:
+    """
+    Сетка кластеров по (class_id, ячейка lat, ячейка lon) по позиции последнего события.
+
+    Ячейка по широте равна радиусу поиска, по долготе — тому же размеру в метрах
+    на широте первой точки. Диапазон ячеек для запроса берётся из точной оценки
+    |Δlon| для haversine, поэтому кандидаты — надмножество кластеров в радиусе.
+    """
+
+    def __init__(self, radius_m: float) -> None:
+        self.radius_m = radius_m
+        self._dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+        self._dlon: float | None = None
+        self._cells: Dict[CellKey, Dict[int, _Cluster]] = {}
+        self._by_class: Dict[int, Dict[int, _Cluster]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self._by_class.values())
+
+    def __contains__(self, cluster: _Cluster) -> bool:
+        return self._by_class.get(cluster.class_id, {}).get(cluster.seq) is cluster
+
+    def _key(self, class_id: int, lat: float, lon: float) -> CellKey:
+        if self._dlon is None:
+            self._dlon = self._dlat / max(math.cos(math.radians(lat)), 1e-6)
+        return class_id, math.floor(lat / self._dlat), math.floor(lon / self._dlon)
+
+    def place(self, cluster: _Cluster, location: WorldCoord) -> None:
+        """Добавляет кластер или переносит его в ячейку новой точки."""
+        key = self._key(cluster.class_id, location.lat, location.lon)
+        if key == cluster.cell:
+            return
+        self._discard_cell(cluster)
+        self._cells.setdefault(key, {})[cluster.seq] = cluster
+        self._by_class.setdefault(cluster.class_id, {})[cluster.seq] = cluster
+        cluster.cell = key
+
+    def remove(self, cluster: _Cluster) -> None:
+        self._discard_cell(cluster)
+        group = self._by_class.get(cluster.class_id)
+        if group is not None:
+            group.pop(cluster.seq, None)
+            if not group:
+                del self._by_class[cluster.class_id]
+
+    def _discard_cell(self, cluster: _Cluster) -> None:
+        if cluster.cell is None:
+            return
+        bucket = self._cells.get(cluster.cell)
+        if bucket is not None:
+            bucket.pop(cluster.seq, None)
+            if not bucket:
+                del self._cells[cluster.cell]
+        cluster.cell = None
+
+    def candidates(self, class_id: int, lat: float, lon: float) -> Iterable[_Cluster]:
+        """Кластеры класса, которые могут оказаться ближе radius_m к (lat, lon)."""
+        everything = self._by_class.get(class_id, {}).values()
+        if self._dlon is None:
+            return everything
+        # haversine: sin²(d/2R) ≥ cosφ1·cosφ2·sin²(Δλ/2), а |φ2| ≤ |φ1| + d/R
+        ang = self.radius_m / EARTH_RADIUS_M
+        far_lat = math.radians(abs(lat)) + ang
+        if far_lat >= math.pi / 2:
+            return everything
+        bound = math.sin(ang / 2) / math.sqrt(math.cos(math.radians(lat)) * math.cos(far_lat))
+        if bound >= 1.0:
+            return everything
+        dlon = math.degrees(2 * math.asin(bound)) * (1 + 1e-9)
+        dlat = self._dlat * (1 + 1e-9)
+        if lon - dlon < -180.0 or lon + dlon > 180.0:
+            return everything  # переход через антимеридиан
+        x0, x1 = math.floor((lon - dlon) / self._dlon), math.floor((lon + dlon) / self._dlon)
+        if x1 - x0 >= _MAX_LON_CELLS:
+            return everything
+        y0, y1 = math.floor((lat - dlat) / self._dlat), math.floor((lat + dlat) / self._dlat)
+        out: List[_Cluster] = []
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                bucket = self._cells.get((class_id, y, x))
+                if bucket:
+                    out.extend(bucket.values())
+        return out
 
 
 class DetectionAggregator:
@@ -59,25 +179,38 @@ class DetectionAggregator:
         self.min_confidence = min_confidence
         self.max_distance_m = max(1.0, max_distance_m)
         self.ttl = timedelta(seconds=max(1.0, ttl_seconds))
-        self._clusters: List[_Cluster] = []
+        self._index = _ClusterIndex(self.max_distance_m)
+        # min-heap (deadline, n, cluster) с ленивым удалением устаревших записей
+        self._expiry: List[Tuple[datetime, int, _Cluster]] = []
+        self._push_counter = itertools.count()
+        self._cluster_seq = itertools.count()
 
     def add_event(self, event: DetectionEvent) -> GeoDetection | None:
         cluster = self._find_cluster(event)
         cluster.add(event, self.window)
+        self._index.place(cluster, event.location)
         detection: GeoDetection | None = None
-        if cluster.votes() >= self.votes_required and cluster.avg_conf() >= self.min_confidence:
+        avg_conf = cluster.avg_conf()
+        if cluster.votes() >= self.votes_required and avg_conf >= self.min_confidence:
             centroid = cluster.centroid()
             detection = GeoDetection(
                 track_id=event.track_id,
                 lat=centroid.lat,
                 lon=centroid.lon,
                 class_id=event.class_id,
-                confidence=cluster.avg_conf(),
+                confidence=avg_conf,
                 timestamp=event.timestamp,
                 frame_id=event.frame_id,
             )
             cluster.last_reported = event.timestamp
-            cluster.events.clear()
+            cluster.clear()
+            # пустой кластер больше ни с чем не сопоставляется
+            self._index.remove(cluster)
+        else:
+            deadline = event.timestamp + self.ttl
+            if deadline != cluster.deadline:
+                cluster.deadline = deadline
+                heapq.heappush(self._expiry, (deadline, next(self._push_counter), cluster))
 
         self._cleanup(event.timestamp)
         return detection
@@ -93,28 +226,21 @@ class DetectionAggregator:
     # ------------------------------------------------------------------ #
     def _find_cluster(self, event: DetectionEvent) -> _Cluster:
         closest: _Cluster | None = None
-        closest_dist = float("inf")
-        for cluster in self._clusters:
-            if cluster.class_id != event.class_id or not cluster.events:
-                continue
-            dist = haversine_m(
-                (cluster.events[-1].location.lat, cluster.events[-1].location.lon),
-                (event.location.lat, event.location.lon),
-            )
-            if dist <= self.max_distance_m and dist < closest_dist:
+        closest_key = (float("inf"), 0)
+        point = (event.location.lat, event.location.lon)
+        for cluster in self._index.candidates(event.class_id, *point):
+            last = cluster.events[-1].location
+            dist = haversine_m((last.lat, last.lon), point)
+            if dist <= self.max_distance_m and (dist, cluster.seq) < closest_key:
                 closest = cluster
-                closest_dist = dist
+                closest_key = (dist, cluster.seq)
 
         if closest is None:
-            closest = _Cluster(class_id=event.class_id)
-            self._clusters.append(closest)
+            closest = _Cluster(class_id=event.class_id, seq=next(self._cluster_seq))
         return closest
 
     def _cleanup(self, now: datetime) -> None:
-        for cluster in list(self._clusters):
-            if not cluster.events:
-                if cluster.last_reported and now - cluster.last_reported > self.ttl:
-                    self._clusters.remove(cluster)
-                continue
-            if now - cluster.events[-1].timestamp > self.ttl:
-                self._clusters.remove(cluster)
+        while self._expiry and self._expiry[0][0] < now:
+            deadline, _, cluster = heapq.heappop(self._expiry)
+            if cluster.deadline == deadline and cluster in self._index:
+                self._index.remove(cluster)
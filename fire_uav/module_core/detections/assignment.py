@@ -0,0 +1,126 @@
+"""
+Задача о назначениях (LSAP) для трекера детекций.
+
+Если установлен scipy — используется `scipy.optimize.linear_sum_assignment`.
+Иначе работает та же схема (кратчайший увеличивающий путь, Crouse 2016) на
+NumPy; её C++-копия живёт в `cpp/native_core` (`BBoxTracker`, режим hungarian),
+поэтому Python- и native-бэкенды дают одинаковые назначения.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    from scipy.optimize import linear_sum_assignment as _scipy_lsa
+except ImportError:  # pragma: no cover
+    _scipy_lsa = None
+
+Assignment = Tuple[NDArray[np.intp], NDArray[np.intp]]
+
+#: стоимость пары, не прошедшей гейтинг; больше любой суммы score (score ∈ [0, 1])
+GATED_COST: float = 1e6
+
+
+def _shortest_augmenting_path(cost: NDArray[np.float64]) -> Assignment:
+    """Минимизирующее LSAP для прямоугольной матрицы; повторяет порядок выбора scipy."""
+    transpose = cost.shape[1] < cost.shape[0]
+    if transpose:
+        cost = cost.T
+    nr, nc = cost.shape
+
+    u = np.zeros(nr, dtype=np.float64)
+    v = np.zeros(nc, dtype=np.float64)
+    path = np.full(nc, -1, dtype=np.intp)
+    col4row = np.full(nr, -1, dtype=np.intp)
+    row4col = np.full(nc, -1, dtype=np.intp)
+
+    for cur_row in range(nr):
+        # обратный порядок: для константной матрицы получаем единичное назначение
+        remaining = np.arange(nc - 1, -1, -1, dtype=np.intp)
+        num_remaining = nc
+        shortest = np.full(nc, np.inf, dtype=np.float64)
+        sr = np.zeros(nr, dtype=bool)
+        sc = np.zeros(nc, dtype=bool)
+        min_val = 0.0
+        i = cur_row
+        sink = -1
+        while sink == -1:
+            sr[i] = True
+            rem = remaining[:num_remaining]
+            r = min_val + cost[i, rem] - u[i] - v[rem]
+            better = r < shortest[rem]
+            path[rem[better]] = i
+            shortest[rem[better]] = r[better]
+
+            cand = shortest[rem]
+            lowest = cand.min()
+            if lowest == np.inf:
+                raise ValueError("cost matrix is infeasible")
+            # при равенстве предпочитаем свободный столбец (последний из таких)
+            free = np.flatnonzero((cand == lowest) & (row4col[rem] == -1))
+            index = int(free[-1]) if len(free) else int(np.flatnonzero(cand == lowest)[0])
+
+            min_val = float(lowest)
+            j = int(remaining[index])
+            if row4col[j] == -1:
+                sink = j
+            else:
+                i = int(row4col[j])
+            sc[j] = True
+            num_remaining -= 1
+            remaining[index] = remaining[num_remaining]
+
+        u[cur_row] += min_val
+        others = sr.copy()
+        others[cur_row] = False
+        u[others] += min_val - shortest[col4row[others]]
+        v[sc] -= min_val - shortest[sc]
+
+        j = sink
+        while True:
+            i = int(path[j])
+            row4col[j] = i
+            col4row[i], j = j, int(col4row[i])
+            if i == cur_row:
+                break
+
+    if transpose:
+        order = np.argsort(col4row)
+        return col4row[order], order.astype(np.intp)
+    return np.arange(nr, dtype=np.intp), col4row
+
+
+def linear_sum_assignment(cost: NDArray[np.float64]) -> Assignment:
+    """Назначение минимальной стоимости: (rows, cols), строки по возрастанию."""
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.size == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    if _scipy_lsa is not None:
+        rows, cols = _scipy_lsa(cost)
+        return rows.astype(np.intp), cols.astype(np.intp)
+    return _shortest_augmenting_path(cost)
+
+
+def assign_max_score(scores: NDArray[np.float64]) -> Assignment:
+    """
+    Оптимальное сопоставление по матрице score (-inf = пара отсечена гейтингом).
+
+    Сначала максимизируется число допустимых пар, затем их суммарный score;
+    отсечённые пары из результата выбрасываются.
+    """
+    valid = np.isfinite(scores)
+    if not valid.any():
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    cost = np.where(valid, -scores, GATED_COST)
+    rows, cols = linear_sum_assignment(cost)
+    keep = valid[rows, cols]
+    return rows[keep], cols[keep]
+
+
+__all__ = ["GATED_COST", "linear_sum_assignment", "assign_max_score"]
@@ -0,0 +1,139 @@
+"""
+Модель движения треков: фильтр Калмана с постоянной скоростью.
+
+Состояние трека — [cx, cy, w, h, vcx, vcy, vw, vh] (пиксели, пиксели/с);
+все операции пакетные, по всем трекам сразу: mean (N, 8), cov (N, 8, 8).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+Mean = NDArray[np.float64]  # (N, 8)
+Cov = NDArray[np.float64]  # (N, 8, 8)
+
+_NDIM = 4
+
+
+def boxes_to_cxcywh(boxes: NDArray[np.float64]) -> NDArray[np.float64]:
+    """(N, 4) x1, y1, x2, y2 → (N, 4) cx, cy, w, h."""
+    out = np.empty_like(boxes, dtype=np.float64)
+    out[:, 0] = (boxes[:, 0] + boxes[:, 2]) / 2.0
+    out[:, 1] = (boxes[:, 1] + boxes[:, 3]) / 2.0
+    out[:, 2] = boxes[:, 2] - boxes[:, 0]
+    out[:, 3] = boxes[:, 3] - boxes[:, 1]
+    return out
+
+
+def cxcywh_to_boxes(cxcywh: NDArray[np.float64]) -> NDArray[np.float64]:
+    """(N, 4) cx, cy, w, h → (N, 4) x1, y1, x2, y2."""
+    half_w = cxcywh[:, 2] / 2.0
+    half_h = cxcywh[:, 3] / 2.0
+    return np.stack(
+        [
+            cxcywh[:, 0] - half_w,
+            cxcywh[:, 1] - half_h,
+            cxcywh[:, 0] + half_w,
+            cxcywh[:, 1] + half_h,
+        ],
+        axis=1,
+    )
+
+
+class ConstantVelocityKalman:
+    """
+    Пакетный фильтр Калмана для боксов.
+
+    Шумы задаются относительно размера бокса (как в DeepSORT), но в секундах,
+    а не в кадрах: кадры с БПЛА приходят с неравномерной частотой.
+    """
+
+    def __init__(
+        self,
+        pos_std: float = 1.0 / 20.0,
+        vel_std: float = 1.0 / 6.0,
+        meas_std: float = 1.0 / 20.0,
+    ) -> None:
+        self.pos_std = pos_std
+        self.vel_std = vel_std
+        self.meas_std = meas_std
+
+    @staticmethod
+    def _scale(mean: Mean) -> NDArray[np.float64]:
+        """Масштаб шума по каждой координате: ширина для x/w, высота для y/h."""
+        w = np.maximum(np.abs(mean[:, 2]), 1.0)
+        h = np.maximum(np.abs(mean[:, 3]), 1.0)
+        return np.stack([w, h, w, h], axis=1)
+
+    # ------------------------------------------------------------------ #
+    def initiate(self, boxes: NDArray[np.float64]) -> Tuple[Mean, Cov]:
+        """Новые треки: скорость 0, большая неопределённость скорости."""
+        meas = boxes_to_cxcywh(boxes)
+        mean = np.concatenate([meas, np.zeros_like(meas)], axis=1)
+        scale = self._scale(mean)
+        std = np.concatenate([2.0 * self.pos_std * scale, 10.0 * self.vel_std * scale], axis=1)
+        cov = np.zeros((len(boxes), 2 * _NDIM, 2 * _NDIM), dtype=np.float64)
+        idx = np.arange(2 * _NDIM)
+        cov[:, idx, idx] = std**2
+        return mean, cov
+
+    def predict(self, mean: Mean, cov: Cov, dt: NDArray[np.float64]) -> Tuple[Mean, Cov]:
+        """Прогноз на dt секунд вперёд (dt — своё для каждого трека)."""
+        dt = np.maximum(dt, 0.0)
+        n = len(mean)
+        motion = np.broadcast_to(np.eye(2 * _NDIM), (n, 2 * _NDIM, 2 * _NDIM)).copy()
+        idx = np.arange(_NDIM)
+        motion[:, idx, idx + _NDIM] = dt[:, None]
+
+        new_mean = mean.copy()
+        new_mean[:, :_NDIM] += dt[:, None] * mean[:, _NDIM:]
+
+        scale = self._scale(mean)
+        q = np.concatenate([(self.pos_std * scale) ** 2, (self.vel_std * scale) ** 2], axis=1)
+        new_cov = motion @ cov @ motion.transpose(0, 2, 1)
+        diag = np.arange(2 * _NDIM)
+        new_cov[:, diag, diag] += q * dt[:, None]
+        return new_mean, new_cov
+
+    def update(self, mean: Mean, cov: Cov, boxes: NDArray[np.float64]) -> Tuple[Mean, Cov]:
+        """Коррекция по измеренным боксам (N, 4) для тех же N треков."""
+        meas = boxes_to_cxcywh(boxes)
+        r = (self.meas_std * self._scale(mean)) ** 2
+        innov_cov = cov[:, :_NDIM, :_NDIM].copy()
+        idx = np.arange(_NDIM)
+        innov_cov[:, idx, idx] += r
+        # K = P Hᵀ S⁻¹; S симметрична → решаем S Kᵀ = H P
+        gain = np.linalg.solve(innov_cov, cov[:, :_NDIM, :]).transpose(0, 2, 1)
+        innov = meas - mean[:, :_NDIM]
+        new_mean = mean + (gain @ innov[:, :, None])[:, :, 0]
+        new_cov = cov - gain @ innov_cov @ gain.transpose(0, 2, 1)
+        return new_mean, new_cov
+
+    @staticmethod
+    def rotate(
+        mean: Mean, cov: Cov, angle_rad: float, center: Tuple[float, float]
+    ) -> Tuple[Mean, Cov]:
+        """
+        Поворот картинки вокруг `center` на angle_rad (визуально против часовой,
+        ось Y вниз): так сдвигается земля в кадре надирной камеры при рыскании БПЛА.
+        """
+        c, s = math.cos(angle_rad), math.sin(angle_rad)
+        rot = np.array([[c, s], [-s, c]])
+        jac = np.eye(2 * _NDIM)
+        jac[0:2, 0:2] = rot
+        jac[4:6, 4:6] = rot
+
+        cx, cy = center
+        new_mean = mean.copy()
+        offset = mean[:, 0:2] - (cx, cy)
+        new_mean[:, 0:2] = offset @ rot.T + (cx, cy)
+        new_mean[:, 4:6] = mean[:, 4:6] @ rot.T
+        new_cov = jac @ cov @ jac.T
+        return new_mean, new_cov
+
+
+__all__ = ["ConstantVelocityKalman", "boxes_to_cxcywh", "cxcywh_to_boxes"]
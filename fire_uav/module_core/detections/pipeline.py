@@ -7,6 +7,7 @@ from pathlib import Path
 from threading import Lock
 from typing import List, Sequence, Tuple
 
+import numpy as np
 from pydantic import BaseModel, ConfigDict, Field
 
 from fire_uav.config import settings
@@ -88,14 +89,19 @@ class DetectionPipeline:
             return []
 
         events: List[DetectionEvent] = []
-        smoothed = self._smoother.assign_and_smooth(payload.detections)
-        for det, smoothed_bbox, track_id in smoothed:
-            lat, lon = self.projector.project_bbox_to_ground(
-                payload.telemetry,
-                smoothed_bbox,
-                payload.frame_width,
-                payload.frame_height,
-            )
+        smoothed = self._smoother.assign_and_smooth(
+            payload.detections,
+            telemetry=payload.telemetry,
+            frame_size=(payload.frame_width, payload.frame_height),
+        )
+        # одна телеметрия на кадр: проецируем все боксы одним вызовом
+        coords = self.projector.project_many(
+            payload.telemetry,
+            np.array([bbox for _, bbox, _ in smoothed], dtype=np.float64).reshape(-1, 4),
+            payload.frame_width,
+            payload.frame_height,
+        )
+        for (det, _, track_id), (lat, lon) in zip(smoothed, coords.tolist()):
             coord = WorldCoord(lat=lat, lon=lon)
             events.append(
                 DetectionEvent(
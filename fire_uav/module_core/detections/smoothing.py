@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import logging
+import math
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, TYPE_CHECKING
+from typing import Dict, List, TYPE_CHECKING, TypeAlias
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fire_uav.module_core.detections.assignment import assign_max_score
+from fire_uav.module_core.detections.motion import ConstantVelocityKalman, cxcywh_to_boxes
 
 if TYPE_CHECKING:
     from fire_uav.module_core.detections.pipeline import RawDetectionPayload
+    from fire_uav.module_core.schema import TelemetrySample
+
+log = logging.getLogger(__name__)
+
 try:
     import native_core as _native_core
 
@@ -25,9 +37,108 @@ class TrackState:
     last_seen: datetime
 
 
+BBoxArray: TypeAlias = NDArray[np.float64]  # (N, 4): x1, y1, x2, y2
+
+#: режимы сопоставления треков и детекций (settings.track_assignment)
+TRACK_ASSIGNMENT_MODES = ("greedy", "hungarian")
+#: модели движения треков (settings.track_motion_model)
+TRACK_MOTION_MODELS = ("none", "kalman")
+
+
+def iou_matrix(a: BBoxArray, b: BBoxArray) -> NDArray[np.float64]:
+    """Попарный IoU между боксами `a` (N, 4) и `b` (M, 4) → матрица (N, M)."""
+    ax1, ay1, ax2, ay2 = (a[:, i, None] for i in range(4))
+    bx1, by1, bx2, by2 = (b[None, :, i] for i in range(4))
+    inter_w = np.maximum(0.0, np.minimum(ax2, bx2) - np.maximum(ax1, bx1))
+    inter_h = np.maximum(0.0, np.minimum(ay2, by2) - np.maximum(ay1, by1))
+    inter = inter_w * inter_h
+    area_a = np.maximum(0.0, ax2 - ax1) * np.maximum(0.0, ay2 - ay1)
+    area_b = np.maximum(0.0, bx2 - bx1) * np.maximum(0.0, by2 - by1)
+    union = area_a + area_b - inter
+    out = np.zeros(inter.shape, dtype=np.float64)
+    np.divide(inter, union, out=out, where=(inter > 0) & (union != 0))
+    return out
+
+
+def center_similarity_matrix(
+    a: BBoxArray, b: BBoxArray, max_center_distance_px: float
+) -> NDArray[np.float64]:
+    """1 - dist/max_dist для центров боксов (0 за пределами радиуса) → матрица (N, M)."""
+    if max_center_distance_px <= 0:
+        return np.zeros((len(a), len(b)), dtype=np.float64)
+    acx = (a[:, 0] + a[:, 2]) / 2.0
+    acy = (a[:, 1] + a[:, 3]) / 2.0
+    bcx = (b[:, 0] + b[:, 2]) / 2.0
+    bcy = (b[:, 1] + b[:, 3]) / 2.0
+    dist = np.sqrt((acx[:, None] - bcx[None, :]) ** 2 + (acy[:, None] - bcy[None, :]) ** 2)
+    sim = 1.0 - dist / max_center_distance_px
+    sim[dist > max_center_distance_px] = 0.0
+    return np.maximum(0.0, sim)
+
+
+class _TrackTable:
+    """Состояние треков в непрерывных массивах (строка = трек, порядок = порядок создания)."""
+
+    __slots__ = (
+        "ids", "class_ids", "boxes", "scores", "hits", "missed", "last_seen", "mean", "cov",
+    )
+
+    def __init__(self, *, motion: bool = False) -> None:
+        self.ids: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        self.class_ids: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        self.boxes: BBoxArray = np.empty((0, 4), dtype=np.float64)
+        self.scores: NDArray[np.float64] = np.empty(0, dtype=np.float64)
+        self.hits: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        self.missed: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        self.last_seen: NDArray[np.float64] = np.empty(0, dtype=np.float64)  # epoch seconds
+        # апостериорное состояние фильтра Калмана на момент last_seen (если включён)
+        self.mean: NDArray[np.float64] | None = np.empty((0, 8)) if motion else None
+        self.cov: NDArray[np.float64] | None = np.empty((0, 8, 8)) if motion else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(
+        self,
+        ids: NDArray[np.int64],
+        class_ids: NDArray[np.int64],
+        boxes: BBoxArray,
+        scores: NDArray[np.float64],
+        last_seen: NDArray[np.float64],
+        mean: NDArray[np.float64] | None = None,
+        cov: NDArray[np.float64] | None = None,
+    ) -> None:
+        n = len(ids)
+        self.ids = np.concatenate([self.ids, ids])
+        self.class_ids = np.concatenate([self.class_ids, class_ids])
+        self.boxes = np.concatenate([self.boxes, boxes])
+        self.scores = np.concatenate([self.scores, scores])
+        self.hits = np.concatenate([self.hits, np.ones(n, dtype=np.int64)])
+        self.missed = np.concatenate([self.missed, np.zeros(n, dtype=np.int64)])
+        self.last_seen = np.concatenate([self.last_seen, last_seen])
+        if self.mean is not None and self.cov is not None:
+            self.mean = np.concatenate([self.mean, mean])
+            self.cov = np.concatenate([self.cov, cov])
+
+    def keep(self, mask: NDArray[np.bool_]) -> None:
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                setattr(self, name, value[mask])
+
+
 class BBoxSmoother:
     """
     Лёгкий IoU-трекер: сопоставление по IoU/центру, сглаживание боксов и время жизни трека.
+
+    Состояние треков хранится в NumPy-массивах, матрицы IoU/близости центров
+    считаются одним вызовом на класс. Сопоставление: жадное по убыванию score
+    (`greedy`) либо оптимальное по сумме score (`hungarian`).
+
+    С `motion_model="kalman"` гейтинг идёт по прогнозу фильтра Калмана
+    (постоянная скорость), а вместо EMA (`alpha`) возвращается оценка фильтра.
+    Если в `assign_and_smooth` передана телеметрия и размер кадра, изменение
+    yaw между кадрами компенсируется поворотом треков вокруг центра кадра.
     """
 
     def __init__(
@@ -38,7 +149,17 @@ class BBoxSmoother:
         max_age_seconds: float = 2.0,
         min_hits: int = 2,
         max_missed: int = 10,
+        assignment: str = "greedy",
+        motion_model: str = "none",
+        yaw_compensation: bool = True,
     ) -> None:
+        if assignment not in TRACK_ASSIGNMENT_MODES:
+            raise ValueError(f"Unknown track assignment mode: {assignment!r}")
+        if motion_model not in TRACK_MOTION_MODELS:
+            raise ValueError(f"Unknown track motion model: {motion_model!r}")
+        self.assignment = assignment
+        self.motion_model = motion_model
+        self.yaw_compensation = yaw_compensation
         self.alpha = alpha
         self.max_center_distance_px = max_center_distance_px
         self.iou_threshold = iou_threshold
@@ -46,149 +167,241 @@ class BBoxSmoother:
         self.min_hits = min_hits
         self.max_missed = max_missed
 
-        self._tracks: Dict[int, TrackState] = {}
+        self._kalman = ConstantVelocityKalman() if motion_model == "kalman" else None
+        self._table = _TrackTable(motion=self._kalman is not None)
         self._next_track_id: int = 0
+        self._last_yaw_deg: float | None = None
 
     # ------------------------------------------------------------------ #
-    @staticmethod
-    def _center(bbox: tuple[float, float, float, float]) -> tuple[float, float]:
-        x_min, y_min, x_max, y_max = bbox
-        return (x_min + x_max) / 2.0, (y_min + y_max) / 2.0
-
-    def _center_similarity(self, a: tuple[float, float, float, float], b: tuple[float, float, float, float]) -> float:
-        if self.max_center_distance_px <= 0:
-            return 0.0
-        ax, ay = self._center(a)
-        bx, by = self._center(b)
-        dist = ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5
-        if dist > self.max_center_distance_px:
-            return 0.0
-        return max(0.0, 1.0 - dist / self.max_center_distance_px)
+    @property
+    def tracks(self) -> Dict[int, TrackState]:
+        """Снимок текущих треков (track_id → TrackState)."""
+        t = self._table
+        return {
+            int(t.ids[i]): TrackState(
+                bbox=tuple(float(v) for v in t.boxes[i]),  # type: ignore[arg-type]
+                class_id=int(t.class_ids[i]),
+                score=float(t.scores[i]),
+                hits=int(t.hits[i]),
+                missed=int(t.missed[i]),
+                last_seen=datetime.fromtimestamp(float(t.last_seen[i])),
+            )
+            for i in range(len(t))
+        }
 
     @staticmethod
-    def _iou(box_a: tuple[float, float, float, float], box_b: tuple[float, float, float, float]) -> float:
-        ax1, ay1, ax2, ay2 = box_a
-        bx1, by1, bx2, by2 = box_b
-        inter_x1 = max(ax1, bx1)
-        inter_y1 = max(ay1, by1)
-        inter_x2 = min(ax2, bx2)
-        inter_y2 = min(ay2, by2)
-        inter_w = max(0.0, inter_x2 - inter_x1)
-        inter_h = max(0.0, inter_y2 - inter_y1)
-        inter_area = inter_w * inter_h
-        if inter_area <= 0:
-            return 0.0
-        area_a = max(0.0, ax2 - ax1) * max(0.0, ay2 - ay1)
-        area_b = max(0.0, bx2 - bx1) * max(0.0, by2 - by1)
-        union = area_a + area_b - inter_area
-        return inter_area / union if union else 0.0
+    def _ts(det: "RawDetectionPayload") -> float:
+        dt = getattr(det, "timestamp", None) or datetime.utcnow()
+        return dt.timestamp()
 
-    @staticmethod
-    def _ts(det: "RawDetectionPayload") -> datetime:
-        return getattr(det, "timestamp", None) or datetime.utcnow()
+    def score_matrix(self, track_boxes: BBoxArray, det_boxes: BBoxArray) -> NDArray[np.float64]:
+        """
+        Матрица score (треки × детекции); -inf там, где пара не проходит гейтинг.
+        score: IoU, либо небольшой вес по центру, если IoU низкий, но объекты рядом.
+        """
+        iou = iou_matrix(det_boxes, track_boxes).T
+        center_sim = center_similarity_matrix(det_boxes, track_boxes, self.max_center_distance_px).T
+        strong = iou >= self.iou_threshold
+        scores = np.where(strong, iou, 0.001 + 0.2 * center_sim)
+        scores[~strong & (center_sim <= 0.0)] = -np.inf
+        return scores
 
     # ------------------------------------------------------------------ #
-    def _smooth_bbox(
-        self, prev: tuple[float, float, float, float], bbox: tuple[float, float, float, float]
-    ) -> tuple[float, float, float, float]:
-        px1, py1, px2, py2 = prev
-        x1, y1, x2, y2 = bbox
-        return (
-            self.alpha * x1 + (1 - self.alpha) * px1,
-            self.alpha * y1 + (1 - self.alpha) * py1,
-            self.alpha * x2 + (1 - self.alpha) * px2,
-            self.alpha * y2 + (1 - self.alpha) * py2,
-        )
-
-    def _prune_stale(self, now: datetime) -> None:
-        to_drop = []
-        for track_id, state in self._tracks.items():
-            age = (now - state.last_seen).total_seconds()
-            max_missed = self.max_missed if state.hits >= self.min_hits else min(2, self.max_missed)
-            if age > self.max_age_seconds or state.missed > max_missed:
-                to_drop.append(track_id)
-        for track_id in to_drop:
-            self._tracks.pop(track_id, None)
+    def _prune_stale(self, now: float) -> None:
+        t = self._table
+        if not len(t):
+            return
+        max_missed = np.where(t.hits >= self.min_hits, self.max_missed, min(2, self.max_missed))
+        stale = (now - t.last_seen > self.max_age_seconds) | (t.missed > max_missed)
+        if stale.any():
+            t.keep(~stale)
 
     def _match_candidates(
-        self, detections: List["RawDetectionPayload"]
-    ) -> List[tuple[float, int, int]]:
+        self, track_boxes: BBoxArray, det_boxes: BBoxArray, det_classes: NDArray[np.int64]
+    ) -> tuple[NDArray[np.float64], NDArray[np.intp], NDArray[np.intp]]:
         """
-        Возвращает кандидаты (score, track_id, det_idx), отсортированные по убыванию score.
-        score: IoU, либо небольшой вес по центру, если IoU низкий, но объекты рядом.
+        Возвращает кандидаты (scores, track_rows, det_idx), отсортированные по убыванию score.
+        Матрицы считаются поблочно для каждого класса; при равных score порядок
+        «трек, затем детекция» сохраняется (стабильная сортировка).
         """
-        candidates: list[tuple[float, int, int]] = []
-        for track_id, state in self._tracks.items():
-            for det_idx, det in enumerate(detections):
-                if det.class_id != state.class_id:
-                    continue
-                bbox = tuple(float(v) for v in det.bbox)
-                iou = self._iou(bbox, state.bbox)
-                center_sim = self._center_similarity(bbox, state.bbox)
-                if iou < self.iou_threshold and center_sim <= 0.0:
-                    continue
-                score = iou if iou >= self.iou_threshold else 0.001 + 0.2 * center_sim
-                candidates.append((score, track_id, det_idx))
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        return candidates
+        t = self._table
+        scores: list[NDArray[np.float64]] = []
+        rows: list[NDArray[np.intp]] = []
+        cols: list[NDArray[np.intp]] = []
+        for class_id in np.unique(det_classes):
+            track_rows = np.flatnonzero(t.class_ids == class_id)
+            if not len(track_rows):
+                continue
+            det_cols = np.flatnonzero(det_classes == class_id)
+            block = self.score_matrix(track_boxes[track_rows], det_boxes[det_cols])
+            r, c = np.nonzero(np.isfinite(block))
+            scores.append(block[r, c])
+            rows.append(track_rows[r])
+            cols.append(det_cols[c])
+        if not scores:
+            empty = np.empty(0, dtype=np.intp)
+            return np.empty(0, dtype=np.float64), empty, empty
+
+        all_scores = np.concatenate(scores)
+        all_rows = np.concatenate(rows)
+        all_cols = np.concatenate(cols)
+        # трек-мажорный порядок, как при обходе треков в порядке создания
+        order = np.lexsort((all_cols, all_rows))
+        all_scores, all_rows, all_cols = all_scores[order], all_rows[order], all_cols[order]
+        order = np.argsort(-all_scores, kind="stable")
+        return all_scores[order], all_rows[order], all_cols[order]
+
+    def _greedy_assign(
+        self, track_boxes: BBoxArray, det_boxes: BBoxArray, det_classes: NDArray[np.int64]
+    ) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+        _, cand_rows, cand_cols = self._match_candidates(track_boxes, det_boxes, det_classes)
+        used_rows: set[int] = set()
+        used_cols: set[int] = set()
+        rows: list[int] = []
+        cols: list[int] = []
+        limit = min(len(track_boxes), len(det_boxes))
+        for row, col in zip(cand_rows.tolist(), cand_cols.tolist()):
+            if row in used_rows or col in used_cols:
+                continue
+            used_rows.add(row)
+            used_cols.add(col)
+            rows.append(row)
+            cols.append(col)
+            if len(rows) == limit:
+                break
+        return np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+
+    def _optimal_assign(
+        self, track_boxes: BBoxArray, det_boxes: BBoxArray, det_classes: NDArray[np.int64]
+    ) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+        """Линейное назначение по гейтированной матрице score, отдельно для каждого класса."""
+        t = self._table
+        rows: list[NDArray[np.intp]] = []
+        cols: list[NDArray[np.intp]] = []
+        for class_id in np.unique(det_classes):
+            track_rows = np.flatnonzero(t.class_ids == class_id)
+            if not len(track_rows):
+                continue
+            det_cols = np.flatnonzero(det_classes == class_id)
+            r, c = assign_max_score(self.score_matrix(track_boxes[track_rows], det_boxes[det_cols]))
+            rows.append(track_rows[r])
+            cols.append(det_cols[c])
+        if not rows:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        return np.concatenate(rows), np.concatenate(cols)
+
+    def _compensate_yaw(
+        self, telemetry: "TelemetrySample | None", frame_size: tuple[int, int] | None
+    ) -> None:
+        """Поворачивает состояние треков на изменение yaw с прошлого кадра."""
+        if telemetry is None:
+            return
+        prev, self._last_yaw_deg = self._last_yaw_deg, float(telemetry.yaw)
+        t = self._table
+        if (
+            not self.yaw_compensation
+            or prev is None
+            or frame_size is None
+            or t.mean is None
+            or t.cov is None
+            or not len(t)
+        ):
+            return
+        delta = (telemetry.yaw - prev + 180.0) % 360.0 - 180.0
+        if delta == 0.0:
+            return
+        center = (frame_size[0] / 2.0, frame_size[1] / 2.0)
+        t.mean, t.cov = ConstantVelocityKalman.rotate(t.mean, t.cov, math.radians(delta), center)
+        t.boxes = cxcywh_to_boxes(t.mean[:, :4])
 
     # ------------------------------------------------------------------ #
     def assign_and_smooth(
-        self, detections: List["RawDetectionPayload"]
+        self,
+        detections: List["RawDetectionPayload"],
+        *,
+        telemetry: "TelemetrySample | None" = None,
+        frame_size: tuple[int, int] | None = None,
     ) -> List[tuple["RawDetectionPayload", tuple[float, float, float, float], int]]:
+        """
+        Сопоставляет детекции кадра с треками и возвращает (det, bbox, track_id)
+        в исходном порядке. telemetry/frame_size (ширина, высота) нужны только
+        для компенсации yaw при motion_model="kalman".
+        """
+        if self._kalman is not None:
+            self._compensate_yaw(telemetry, frame_size)
         if not detections:
-            self._prune_stale(datetime.utcnow())
+            self._prune_stale(datetime.utcnow().timestamp())
             return []
 
-        now = max(self._ts(det) for det in detections)
+        det_ts = np.array([self._ts(det) for det in detections], dtype=np.float64)
+        now = float(det_ts.max())
         self._prune_stale(now)
 
-        assignments: Dict[int, tuple["RawDetectionPayload", tuple[float, float, float, float], int]] = {}
-        used_tracks: set[int] = set()
-        used_dets: set[int] = set()
-
-        for score, track_id, det_idx in self._match_candidates(detections):
-            if track_id in used_tracks or det_idx in used_dets:
-                continue
-            det = detections[det_idx]
-            bbox = tuple(float(v) for v in det.bbox)
-            track = self._tracks[track_id]
-            smoothed_bbox = self._smooth_bbox(track.bbox, bbox)
-            track.bbox = smoothed_bbox
-            track.score = float(det.confidence)
-            track.hits += 1
-            track.missed = 0
-            track.last_seen = self._ts(det)
-            det.track_id = track_id
-            assignments[det_idx] = (det, smoothed_bbox, track_id)
-            used_tracks.add(track_id)
-            used_dets.add(det_idx)
-
-        for det_idx, det in enumerate(detections):
-            if det_idx in used_dets:
-                continue
-            bbox = tuple(float(v) for v in det.bbox)
-            track_id = self._next_track_id
-            self._next_track_id += 1
-            ts = self._ts(det)
-            self._tracks[track_id] = TrackState(
-                bbox=bbox,
-                class_id=det.class_id,
-                score=float(det.confidence),
-                hits=1,
-                missed=0,
-                last_seen=ts,
+        det_boxes = np.array([det.bbox for det in detections], dtype=np.float64).reshape(-1, 4)
+        det_classes = np.array([det.class_id for det in detections], dtype=np.int64)
+        det_conf = np.array([det.confidence for det in detections], dtype=np.float64)
+
+        t = self._table
+        n_old = len(t)
+        track_boxes = t.boxes
+        if self._kalman is not None and t.mean is not None and t.cov is not None and n_old:
+            pred_mean, pred_cov = self._kalman.predict(t.mean, t.cov, now - t.last_seen)
+            track_boxes = cxcywh_to_boxes(pred_mean[:, :4])
+
+        if self.assignment == "hungarian":
+            rows, cols = self._optimal_assign(track_boxes, det_boxes, det_classes)
+        else:
+            rows, cols = self._greedy_assign(track_boxes, det_boxes, det_classes)
+
+        track_used = np.zeros(n_old, dtype=bool)
+        track_used[rows] = True
+        if len(rows):
+            if self._kalman is not None and t.mean is not None and t.cov is not None:
+                t.mean[rows], t.cov[rows] = self._kalman.update(
+                    pred_mean[rows], pred_cov[rows], det_boxes[cols]
+                )
+                t.boxes[rows] = cxcywh_to_boxes(t.mean[rows, :4])
+            else:
+                t.boxes[rows] = self.alpha * det_boxes[cols] + (1 - self.alpha) * t.boxes[rows]
+            t.scores[rows] = det_conf[cols]
+            t.hits[rows] += 1
+            t.missed[rows] = 0
+            t.last_seen[rows] = det_ts[cols]
+
+        det_rows = np.full(len(detections), -1, dtype=np.intp)
+        det_rows[cols] = rows
+        new_cols = np.flatnonzero(det_rows < 0)
+        if len(new_cols):
+            new_ids = np.arange(
+                self._next_track_id, self._next_track_id + len(new_cols), dtype=np.int64
             )
-            det.track_id = track_id
-            assignments[det_idx] = (det, bbox, track_id)
-            used_tracks.add(track_id)
+            self._next_track_id += len(new_cols)
+            mean = cov = None
+            if self._kalman is not None:
+                mean, cov = self._kalman.initiate(det_boxes[new_cols])
+            t.append(
+                new_ids,
+                det_classes[new_cols],
+                det_boxes[new_cols],
+                det_conf[new_cols],
+                det_ts[new_cols],
+                mean,
+                cov,
+            )
+            det_rows[new_cols] = np.arange(n_old, n_old + len(new_cols))
+
+        t.missed[:n_old][~track_used] += 1
 
-        for track_id, state in self._tracks.items():
-            if track_id not in used_tracks:
-                state.missed += 1
+        out_boxes = t.boxes[det_rows].tolist()
+        out_ids = t.ids[det_rows].tolist()
         self._prune_stale(now)
 
-        return [assignments[idx] for idx in sorted(assignments.keys())]
+        out: List[tuple["RawDetectionPayload", tuple[float, float, float, float], int]] = []
+        for det, bbox, track_id in zip(detections, out_boxes, out_ids):
+            det.track_id = track_id
+            out.append((det, tuple(bbox), track_id))  # type: ignore[arg-type]
+        return out
 
 
 class NativeBBoxSmoother:
@@ -205,9 +418,12 @@ class NativeBBoxSmoother:
         max_age_seconds: float = 2.0,
         min_hits: int = 2,
         max_missed: int = 10,
+        assignment: str = "greedy",
     ) -> None:
         if not _NATIVE_TRACKER_AVAILABLE:
             raise RuntimeError("native_core.BBoxTracker is not available")
+        if assignment not in TRACK_ASSIGNMENT_MODES:
+            raise ValueError(f"Unknown track assignment mode: {assignment!r}")
         self._tracker = _native_core.BBoxTracker(
             alpha,
             max_center_distance_px,
@@ -215,6 +431,7 @@ class NativeBBoxSmoother:
             max_age_seconds,
             min_hits,
             max_missed,
+            assignment,
         )
 
     @staticmethod
@@ -225,7 +442,11 @@ class NativeBBoxSmoother:
         return datetime.utcnow().timestamp()
 
     def assign_and_smooth(
-        self, detections: List["RawDetectionPayload"]
+        self,
+        detections: List["RawDetectionPayload"],
+        *,
+        telemetry: "TelemetrySample | None" = None,  # noqa: ARG002 - motion model is Python-only
+        frame_size: tuple[int, int] | None = None,  # noqa: ARG002
     ) -> List[tuple["RawDetectionPayload", tuple[float, float, float, float], int]]:
         if not detections:
             # Прогоняем пустой список для очистки треков по возрасту
@@ -258,10 +479,27 @@ def build_smoother(settings) -> BBoxSmoother | NativeBBoxSmoother:  # noqa: ANN0
         max_age_seconds=getattr(settings, "track_max_age_seconds", 2.0),
         min_hits=getattr(settings, "track_min_hits", 2),
         max_missed=getattr(settings, "track_max_missed", 10),
+        assignment=getattr(settings, "track_assignment", "greedy"),
     )
+    motion_model = getattr(settings, "track_motion_model", "none")
     if getattr(settings, "use_native_core", False) and _NATIVE_TRACKER_AVAILABLE:
-        return NativeBBoxSmoother(**params)
-    return BBoxSmoother(**params)
+        if motion_model == "none":
+            return NativeBBoxSmoother(**params)
+        log.info("Track motion model %r is Python-only; using BBoxSmoother.", motion_model)
+    return BBoxSmoother(
+        **params,
+        motion_model=motion_model,
+        yaw_compensation=getattr(settings, "track_yaw_compensation", True),
+    )
 
 
-__all__ = ["BBoxSmoother", "TrackState", "NativeBBoxSmoother", "build_smoother"]
+__all__ = [
+    "BBoxSmoother",
+    "TrackState",
+    "NativeBBoxSmoother",
+    "build_smoother",
+    "TRACK_ASSIGNMENT_MODES",
+    "TRACK_MOTION_MODELS",
+    "iou_matrix",
+    "center_similarity_matrix",
+]
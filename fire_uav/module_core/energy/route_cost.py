@@ -0,0 +1,212 @@
+"""
+Энергия маршрута и деление на миссии по ёмкости батареи.
+
+Одна модель для `route.energy.EnergyModel`, `PythonEnergyModel` и native
+`route_energy_cost`: крейсерский полёт по горизонтальной дистанции, набор
+высоты (m·g·Δh / КПД, снижение бесплатно) и разворот в точке (доля
+`turn_time_s` на крейсерской мощности, пропорциональная углу поворота).
+
+Стоимости отрезков считаются один раз NumPy и хранятся префиксными суммами,
+поэтому энергия любого куска маршрута — O(1), а точка разреза миссии ищется
+двоичным поиском, с учётом перелёта от дома и возврата домой.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import List, Protocol, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from fire_uav.module_core.geometry import EARTH_RADIUS_M
+
+log = logging.getLogger(__name__)
+
+G_MPS2 = 9.80665
+_WH = 3600.0
+
+
+class EnergyParams(Protocol):
+    """Параметры модели; их несут `EnergyModel` и `PythonEnergyModel`."""
+
+    cruise_speed_mps: float
+    power_cruise_w: float
+    battery_wh: float
+    turn_time_s: float
+    mass_kg: float
+    climb_efficiency: float
+    reserve_fraction: float
+
+
+def distance_m(
+    lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike
+) -> NDArray[np.float64]:
+    """Векторный haversine (как `geometry.haversine_m`), метры."""
+    phi1, lam1, phi2, lam2 = (
+        np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2)
+    )
+    a = (
+        np.sin((phi2 - phi1) / 2) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin((lam2 - lam1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def leg_lengths_m(lat: ArrayLike, lon: ArrayLike) -> NDArray[np.float64]:
+    """Длины (N - 1) отрезков между соседними точками, метры."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    return distance_m(lat[:-1], lon[:-1], lat[1:], lon[1:])
+
+
+def _leg_wh(
+    dist_m: NDArray[np.float64], climb_m: NDArray[np.float64], p: EnergyParams
+) -> NDArray[np.float64]:
+    if p.cruise_speed_mps <= 0:
+        return np.full_like(dist_m, np.inf)
+    cruise = dist_m / p.cruise_speed_mps * p.power_cruise_w / _WH
+    climb = np.maximum(climb_m, 0.0) * p.mass_kg * G_MPS2 / p.climb_efficiency / _WH
+    return cruise + climb
+
+
+def _turn_angles(lat: NDArray[np.float64], lon: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Угол поворота (рад) в каждой точке; у концов и вырожденных отрезков — 0."""
+    out = np.zeros(len(lat))
+    if len(lat) < 3:
+        return out
+    # локальные векторы отрезков (равнопромежуточная проекция достаточна для углов)
+    dx = np.diff(lon) * np.cos(np.radians((lat[1:] + lat[:-1]) / 2))
+    dy = np.diff(lat)
+    cross = dx[:-1] * dy[1:] - dy[:-1] * dx[1:]
+    dot = dx[:-1] * dx[1:] + dy[:-1] * dy[1:]
+    out[1:-1] = np.abs(np.arctan2(cross, dot))
+    return out
+
+
+@dataclass(slots=True, frozen=True)
+class EnergyProfile:
+    """
+    Префиксные суммы энергии (Wh) маршрута из N точек.
+
+    `legs[i]` — отрезки 0 … i - 1 (от точки 0 до точки i), `turns[k]` — развороты
+    в точках 0 … k - 1. Кусок a … b летится за `cost_wh(a, b)`.
+    """
+
+    legs: NDArray[np.float64]
+    turns: NDArray[np.float64]
+
+    def __len__(self) -> int:
+        return len(self.legs)
+
+    @property
+    def total_wh(self) -> float:
+        return self.cost_wh(0, len(self) - 1) if len(self) else 0.0
+
+    def cost_wh(self, a: int, b: int) -> float:
+        """Энергия пролёта точек a … b включительно (развороты только внутри куска)."""
+        if b <= a:
+            return 0.0
+        return float(self.legs[b] - self.legs[a] + self.turns[b] - self.turns[a + 1])
+
+
+def energy_profile(
+    lat: ArrayLike, lon: ArrayLike, alt: ArrayLike, p: EnergyParams
+) -> EnergyProfile:
+    """Стоимости всех отрезков и разворотов маршрута одним проходом NumPy."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    alt = np.asarray(alt, dtype=np.float64)
+    if not (len(lat) == len(lon) == len(alt)):
+        raise ValueError("energy_profile: lat/lon/alt sizes must match")
+    legs = _leg_wh(leg_lengths_m(lat, lon), np.diff(alt), p)
+    turn = _turn_angles(lat, lon) / np.pi * p.turn_time_s * p.power_cruise_w / _WH
+    return EnergyProfile(
+        legs=np.concatenate([[0.0], np.cumsum(legs)]),
+        turns=np.concatenate([[0.0], np.cumsum(turn)]),
+    )
+
+
+def route_energy_wh(lat: ArrayLike, lon: ArrayLike, alt: ArrayLike, p: EnergyParams) -> float:
+    """Энергия всего маршрута, Wh."""
+    return energy_profile(lat, lon, alt, p).total_wh
+
+
+def _home_legs_wh(
+    lat: NDArray[np.float64],
+    lon: NDArray[np.float64],
+    alt: NDArray[np.float64],
+    home: Sequence[float] | None,
+    p: EnergyParams,
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Энергия перелёта дом → точка i и точка i → дом (нули, если дом не задан)."""
+    if home is None:
+        return np.zeros(len(lat)), np.zeros(len(lat))
+    h_lat, h_lon = float(home[0]), float(home[1])
+    h_alt = float(home[2]) if len(home) > 2 else 0.0
+    dist = distance_m(h_lat, h_lon, lat, lon)
+    return _leg_wh(dist, alt - h_alt, p), _leg_wh(dist, h_alt - alt, p)
+
+
+def split_by_energy(
+    lat: ArrayLike,
+    lon: ArrayLike,
+    alt: ArrayLike,
+    p: EnergyParams,
+    home: Sequence[float] | None = None,
+) -> List[Tuple[int, int]]:
+    """
+    Делит маршрут на миссии: список полуинтервалов [start, stop) индексов точек.
+
+    Миссия — перелёт от `home` (lat, lon[, alt]) к первой точке, пролёт куска и
+    возврат домой; всё вместе не больше `battery_wh · (1 - reserve_fraction)`.
+    Без `home` учитывается только кусок маршрута. Самая дальняя допустимая точка
+    ищется двоичным поиском по монотонной префиксной сумме, затем среди
+    кандидатов проверяется возврат домой.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    alt = np.asarray(alt, dtype=np.float64)
+    n = len(lat)
+    if n == 0:
+        return []
+    prof = energy_profile(lat, lon, alt, p)
+    out_wh, back_wh = _home_legs_wh(lat, lon, alt, home, p)
+    budget = p.battery_wh * (1.0 - p.reserve_fraction)
+    # cost(a, b) = cum[b] - (legs[a] + turns[a + 1]); cum не убывает
+    cum = prof.legs + prof.turns[:n]
+
+    missions: list[tuple[int, int]] = []
+    too_far = 0
+    a = 0
+    while a < n:
+        if a == n - 1:
+            missions.append((a, n))
+            break
+        base = prof.legs[a] + prof.turns[a + 1] - out_wh[a]
+        b_max = int(np.searchsorted(cum, budget + base, side="right")) - 1
+        b_max = min(max(b_max, a), n - 1)
+        cand = np.arange(a + 1, b_max + 1)
+        ok = cum[cand] - base + back_wh[cand] <= budget
+        if ok.any():
+            b = int(cand[np.flatnonzero(ok)[-1]])
+        else:
+            b = a + 1
+            too_far += 1
+        missions.append((a, b + 1))
+        a = b + 1
+    if too_far:
+        log.warning("%d legs do not fit into one battery, kept as separate missions", too_far)
+    return missions
+
+
+__all__ = [
+    "EnergyParams",
+    "EnergyProfile",
+    "distance_m",
+    "energy_profile",
+    "leg_lengths_m",
+    "route_energy_wh",
+    "split_by_energy",
+]
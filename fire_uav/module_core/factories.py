@@ -4,16 +4,29 @@ import logging
 
 from fire_uav.module_core.energy.python_energy_model import PythonEnergyModel
 from fire_uav.module_core.fusion.python_projector import PythonGeoProjector
+from fire_uav.module_core.fusion.terrain_projector import TerrainGeoProjector
 from fire_uav.module_core.interfaces.energy import IEnergyModel
 from fire_uav.module_core.interfaces.geo import IGeoProjector
 from fire_uav.module_core.native import NATIVE_AVAILABLE
 from fire_uav.module_core.native.energy import NativeEnergyModel
 from fire_uav.module_core.native.geo import NativeGeoProjector
+from fire_uav.module_core.terrain.dem import DEMTileStore
 
 log = logging.getLogger(__name__)
 
 
 def get_geo_projector(settings) -> IGeoProjector:  # noqa: ANN001
+    if getattr(settings, "geo_projector", "flat") == "dem":
+        dem = DEMTileStore(
+            getattr(settings, "dem_dir", "data/dem"),
+            max_open_tiles=getattr(settings, "dem_max_open_tiles", 16),
+        )
+        if len(dem):
+            log.info("Using TerrainGeoProjector (%d DEM tiles).", len(dem))
+            return TerrainGeoProjector(
+                dem, home_elevation_m=getattr(settings, "dem_home_elevation_m", None)
+            )
+        log.warning("DEM projector requested but no tiles found, falling back to flat projection.")
     if getattr(settings, "use_native_core", False) and NATIVE_AVAILABLE:
         log.info("Native core enabled for geo.")
         return NativeGeoProjector()
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import math
 from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
+
 from fire_uav.domain.video.camera import CameraParams
-from fire_uav.module_core.geometry import haversine_m, offset_latlon
+from fire_uav.module_core.geometry import EARTH_RADIUS_M, haversine_m, offset_latlon
 from fire_uav.module_core.interfaces.geo import IGeoProjector
 from fire_uav.module_core.schema import TelemetrySample, WorldCoord
 
@@ -43,6 +47,26 @@ class PythonGeoProjector(IGeoProjector):
         lat, lon = offset_latlon(telemetry.lat, telemetry.lon, offset_x_m, offset_y_m)
         return lat, lon
 
+    def project_many(
+        self,
+        telemetry: TelemetrySample,
+        bboxes: NDArray[np.float64],
+        image_width: int,
+        image_height: int,
+    ) -> NDArray[np.float64]:
+        boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        gsd_m = self._camera.gsd_cm_per_px(max(telemetry.alt, 1.0)) / 100.0
+        # GSD и масштаб ENU → градусы одни на весь кадр
+        m_to_deg_lat = math.degrees(1.0 / EARTH_RADIUS_M)
+        m_to_deg_lon = math.degrees(1.0 / (EARTH_RADIUS_M * math.cos(math.radians(telemetry.lat))))
+
+        offset_x_m = ((boxes[:, 0] + boxes[:, 2]) / 2.0 - image_width / 2.0) * gsd_m
+        offset_y_m = (image_height / 2.0 - (boxes[:, 1] + boxes[:, 3]) / 2.0) * gsd_m
+        out = np.empty((len(boxes), 2), dtype=np.float64)
+        out[:, 0] = telemetry.lat + offset_y_m * m_to_deg_lat
+        out[:, 1] = telemetry.lon + offset_x_m * m_to_deg_lon
+        return out
+
     # Legacy helper used by existing call sites
     def project(
         self, bbox: Tuple[int, int, int, int], frame_size: Tuple[int, int], telemetry: TelemetrySample
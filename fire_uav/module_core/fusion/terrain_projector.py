@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fire_uav.domain.video.camera import CameraParams
+from fire_uav.module_core.geometry import EARTH_RADIUS_M, haversine_m
+from fire_uav.module_core.interfaces.geo import IGeoProjector
+from fire_uav.module_core.schema import TelemetrySample
+from fire_uav.module_core.terrain.dem import DEMTileStore
+
+# Камера смотрит в надир: ось X кадра → восток, Y (вниз по кадру) → юг, оптическая ось → вниз.
+_NADIR_TO_ENU = np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.0, 0.0, -1.0]])
+
+
+def _attitude_enu(yaw_deg: float, pitch_deg: float, roll_deg: float) -> NDArray[np.float64]:
+    """Поворот корпуса в ENU: yaw по часовой от севера, pitch — нос вверх, roll — крен вправо."""
+    yaw, pitch, roll = map(math.radians, (yaw_deg, pitch_deg, roll_deg))
+    cy, sy = math.cos(-yaw), math.sin(-yaw)
+    cp, sp = math.cos(pitch), math.sin(pitch)
+    cr, sr = math.cos(roll), math.sin(roll)
+    rz = np.array([[cy, -sy, 0.0], [sy, cy, 0.0], [0.0, 0.0, 1.0]])
+    rx = np.array([[1.0, 0.0, 0.0], [0.0, cp, -sp], [0.0, sp, cp]])
+    ry = np.array([[cr, 0.0, sr], [0.0, 1.0, 0.0], [-sr, 0.0, cr]])
+    return rz @ rx @ ry
+
+
+class TerrainGeoProjector(IGeoProjector):
+    """
+    Проекция центра bbox на рельеф: луч камеры маршируется по сетке высот DEM.
+
+    Высота телеметрии считается над точкой взлёта (`home_elevation_m`); если она
+    не задана — над рельефом под БПЛА. Луч без пересечения (вне DEM, выше
+    горизонта, дальше `max_range_m`) проецируется на плоскость этой высоты.
+    """
+
+    def __init__(
+        self,
+        dem: DEMTileStore,
+        camera: CameraParams | None = None,
+        *,
+        step_m: float = 10.0,
+        max_range_m: float = 3000.0,
+        home_elevation_m: float | None = None,
+    ) -> None:
+        self._dem = dem
+        self._camera = camera or CameraParams()
+        self.step_m = max(1.0, step_m)
+        self.max_range_m = max(self.step_m, max_range_m)
+        self.home_elevation_m = home_elevation_m
+
+    def compute_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        return haversine_m((lat1, lon1), (lat2, lon2))
+
+    def project_bbox_to_ground(
+        self,
+        telemetry: TelemetrySample,
+        bbox: tuple[float, float, float, float],
+        image_width: int,
+        image_height: int,
+    ) -> tuple[float, float]:
+        lat, lon = self.project_many(telemetry, np.array([bbox]), image_width, image_height)[0]
+        return float(lat), float(lon)
+
+    def project_many(
+        self,
+        telemetry: TelemetrySample,
+        bboxes: NDArray[np.float64],
+        image_width: int,
+        image_height: int,
+    ) -> NDArray[np.float64]:
+        boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        out = np.empty((len(boxes), 2), dtype=np.float64)
+        if not len(boxes):
+            return out
+
+        # лучи в ENU: фокус в пикселях по фактической ширине кадра
+        f_px = self._camera.focal_length_mm / self._camera.sensor_width_mm * image_width
+        dirs_cam = np.stack(
+            [
+                ((boxes[:, 0] + boxes[:, 2]) / 2.0 - image_width / 2.0) / f_px,
+                ((boxes[:, 1] + boxes[:, 3]) / 2.0 - image_height / 2.0) / f_px,
+                np.ones(len(boxes)),
+            ],
+            axis=1,
+        )
+        rot = _attitude_enu(telemetry.yaw, telemetry.pitch, telemetry.roll) @ _NADIR_TO_ENU
+        dirs = dirs_cam @ rot.T
+        dirs /= np.linalg.norm(dirs, axis=1, keepdims=True)
+
+        ground_below = self._dem.elevation_at(telemetry.lat, telemetry.lon)
+        base = self.home_elevation_m
+        if base is None:
+            base = ground_below if math.isfinite(ground_below) else 0.0
+        cam_z = base + telemetry.alt
+
+        m_to_deg_lat = math.degrees(1.0 / EARTH_RADIUS_M)
+        m_to_deg_lon = math.degrees(1.0 / (EARTH_RADIUS_M * math.cos(math.radians(telemetry.lat))))
+
+        # (N, K) отсчётов вдоль лучей; t = 0 — сама камера
+        t = np.arange(0, self.max_range_m + self.step_m, self.step_m)
+        east = dirs[:, 0, None] * t
+        north = dirs[:, 1, None] * t
+        ray_z = cam_z + dirs[:, 2, None] * t
+        terrain = self._dem.elevation(
+            telemetry.lat + north * m_to_deg_lat, telemetry.lon + east * m_to_deg_lon
+        )
+        clearance = ray_z - terrain
+        below = clearance <= 0.0  # NaN (нет данных) даёт False
+        below[:, 0] = False
+        hit = below.any(axis=1)
+        k = np.argmax(below, axis=1)
+
+        # уточняем пересечение линейно между последним отсчётом над рельефом и первым под ним
+        rows = np.flatnonzero(hit)
+        hit_t = np.empty(len(rows))
+        if len(rows):
+            k1 = k[rows]
+            c0 = clearance[rows, k1 - 1]
+            c1 = clearance[rows, k1]
+            frac = np.ones(len(rows))  # над пустотой DEM берём первый отсчёт под рельефом
+            above = np.isfinite(c0) & (c0 > 0.0)
+            frac[above] = c0[above] / (c0[above] - c1[above])
+            frac[np.isfinite(c0) & ~above] = 0.0
+            hit_t = t[k1 - 1] + frac * (t[k1] - t[k1 - 1])
+
+        # остальным — плоскость высоты base, как в плоской модели
+        flat_t = np.where(dirs[:, 2] < -1e-6, (base - cam_z) / np.minimum(dirs[:, 2], -1e-6), 0.0)
+        ray_t = flat_t
+        ray_t[rows] = hit_t
+        out[:, 0] = telemetry.lat + dirs[:, 1] * ray_t * m_to_deg_lat
+        out[:, 1] = telemetry.lon + dirs[:, 0] * ray_t * m_to_deg_lon
+        return out
+
+
+__all__ = ["TerrainGeoProjector"]
@@ -1,5 +1,6 @@
+from fire_uav.module_core.interfaces.detector import IInferenceBackend, RawDetections
 from fire_uav.module_core.interfaces.energy import IEnergyModel
 from fire_uav.module_core.interfaces.geo import IGeoProjector
 from fire_uav.module_core.interfaces.route_planner import IRoutePlanner
 
-__all__ = ["IGeoProjector", "IEnergyModel", "IRoutePlanner"]
+__all__ = ["IGeoProjector", "IEnergyModel", "IInferenceBackend", "IRoutePlanner", "RawDetections"]
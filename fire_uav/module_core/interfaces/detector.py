@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class RawDetections(NamedTuple):
+    """Model output for one frame in frame pixels: (N, 4) xyxy boxes, (N,) scores and classes."""
+
+    boxes: NDArray[np.float32]
+    scores: NDArray[np.float32]
+    classes: NDArray[np.int64]
+
+
+class IInferenceBackend(ABC):
+    """Abstract interface for running the detector model on BGR frames."""
+
+    name: str = "backend"
+
+    @abstractmethod
+    def predict(self, frames_bgr: Sequence[NDArray[np.uint8]]) -> List[RawDetections]:
+        """Run the model once on a batch of frames; one result per frame, same order."""
+
+
+__all__ = ["IInferenceBackend", "RawDetections"]
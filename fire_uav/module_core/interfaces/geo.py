@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
+import numpy as np
+from numpy.typing import NDArray
+
 from fire_uav.module_core.schema import GeoDetection, TelemetrySample
 
 
@@ -22,3 +25,23 @@ class IGeoProjector(ABC):
     ) -> tuple[float, float]:
         """Project a bounding-box center from image space to ground lat/lon."""
 
+    def project_many(
+        self,
+        telemetry: TelemetrySample,
+        bboxes: NDArray[np.float64],
+        image_width: int,
+        image_height: int,
+    ) -> NDArray[np.float64]:
+        """
+        Project (N, 4) bounding boxes sharing one telemetry sample to an (N, 2) lat/lon array.
+
+        The default loops over `project_bbox_to_ground`; implementations override it to
+        compute the pose-dependent terms once per frame.
+        """
+        boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        out = np.empty((len(boxes), 2), dtype=np.float64)
+        for i, (x1, y1, x2, y2) in enumerate(boxes.tolist()):
+            out[i] = self.project_bbox_to_ground(
+                telemetry, (x1, y1, x2, y2), image_width, image_height
+            )
+        return out
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 from fire_uav.module_core.schema import Route, TelemetrySample, Waypoint
 
@@ -12,6 +13,15 @@ class IRoutePlanner(ABC):
     def plan_route(self, geom_wkt: str, gsd_cm: int | float = 0) -> Route:
         """Plan a base route (signature mirrors existing planner)."""
 
+    @abstractmethod
+    def plan_fleet(
+        self,
+        geom_wkt: str,
+        launch_points: Sequence[tuple[float, float]],
+        gsd_cm: int | float = 0,
+    ) -> list[list[Route]]:
+        """Split the AOI between several UAVs (launch points as (lat, lon)); missions per UAV."""
+
     @abstractmethod
     def plan_maneuver(
         self,
@@ -1,4 +1,4 @@
-from prometheus_client import REGISTRY, Gauge, Histogram
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
 
 # Camera / detector
 fps_gauge = Gauge("camera_fps", "Frames per second from camera")
@@ -8,6 +8,25 @@ detect_latency = Histogram(
     buckets=(0.01, 0.05, 0.1, 0.2, 0.5, 1, 2),
 )
 queue_size = Gauge("detector_queue_size", "Items in detection queue")
+detect_batch_size = Histogram(
+    "detector_batch_size",
+    "Frames per DetectionEngine call",
+    buckets=(1, 2, 4, 8, 16, 32),
+)
+detect_queue_wait = Histogram(
+    "detector_queue_wait_seconds",
+    "Time a frame waits in DetectThread for its batch to start",
+    buckets=(0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2),
+)
+frames_dropped = Counter(
+    "detector_frames_dropped",
+    "Frames overwritten in the detector mailbox before the detector took them",
+)
+frames_skipped = Counter(
+    "detector_frames_skipped",
+    "Frames skipped by the adaptive scheduler (only every k-th frame is detected)",
+)
+frame_stride = Gauge("detector_frame_stride", "Current k: every k-th camera frame is detected")
 
 # Planner
 coverage_percent = Gauge("coverage_percent", "Planner coverage %")
@@ -16,6 +35,11 @@ __all__ = [
     "fps_gauge",
     "detect_latency",
     "queue_size",
+    "detect_batch_size",
+    "detect_queue_wait",
+    "frames_dropped",
+    "frames_skipped",
+    "frame_stride",
     "coverage_percent",
     "REGISTRY",
 ]
@@ -15,13 +15,38 @@ BATTERY_WH_PLACEHOLDER = 100.0  # TODO: pull from platform config or UAV telemet
 if NATIVE_AVAILABLE:
 
     class NativeEnergyModel(IEnergyModel):
-        """Native-backed energy estimator."""
+        """Native-backed energy estimator (same model as `PythonEnergyModel`)."""
+
+        def __init__(
+            self,
+            cruise_speed_mps: float = 12.0,
+            power_cruise_w: float = 45.0,
+            turn_time_s: float = 4.0,
+            mass_kg: float = 1.2,
+            climb_efficiency: float = 0.5,
+        ) -> None:
+            self.cruise_speed_mps = cruise_speed_mps
+            self.power_cruise_w = power_cruise_w
+            self.turn_time_s = turn_time_s
+            self.mass_kg = mass_kg
+            self.climb_efficiency = climb_efficiency
 
         def energy_cost(self, route: Route) -> float:
             lats = [wp.lat for wp in route.waypoints]
             lons = [wp.lon for wp in route.waypoints]
             alts = [wp.alt for wp in route.waypoints]
-            return float(_native_core.route_energy_cost(lats, lons, alts, 1.0, 1.0))
+            return float(
+                _native_core.route_energy_cost(
+                    lats,
+                    lons,
+                    alts,
+                    self.mass_kg,
+                    self.power_cruise_w,
+                    self.cruise_speed_mps,
+                    self.turn_time_s,
+                    self.climb_efficiency,
+                )
+            )
 
         def remaining_energy(self, telemetry: TelemetrySample) -> float:
             remaining = telemetry.battery * BATTERY_WH_PLACEHOLDER
@@ -4,6 +4,9 @@ import logging
 import math
 from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
+
 from fire_uav.module_core.interfaces.geo import IGeoProjector
 from fire_uav.module_core.native import NATIVE_AVAILABLE, _native_core
 from fire_uav.module_core.schema import TelemetrySample
@@ -49,6 +52,30 @@ if NATIVE_AVAILABLE:
             )
             return float(lat), float(lon)
 
+        def project_many(
+            self,
+            telemetry: TelemetrySample,
+            bboxes: NDArray[np.float64],
+            image_width: int,
+            image_height: int,
+        ) -> NDArray[np.float64]:
+            # Буфер (N, 4) float64 передаётся в C++ без поэлементной конвертации.
+            boxes = np.ascontiguousarray(bboxes, dtype=np.float64).reshape(-1, 4)
+            fx = fy = 1.0
+            return _native_core.geo_project_bboxes_to_ground(
+                telemetry.lat,
+                telemetry.lon,
+                telemetry.alt,
+                math.radians(telemetry.yaw),
+                math.radians(telemetry.pitch),
+                math.radians(telemetry.roll),
+                fx,
+                fy,
+                image_width / 2.0,
+                image_height / 2.0,
+                boxes,
+            )
+
 else:
 
     class NativeGeoProjector(IGeoProjector):  # type: ignore[misc]
@@ -67,6 +94,15 @@ else:
         ) -> Tuple[float, float]:
             raise RuntimeError("Native core is not available.")
 
+        def project_many(
+            self,
+            telemetry: TelemetrySample,
+            bboxes: NDArray[np.float64],
+            image_width: int,
+            image_height: int,
+        ) -> NDArray[np.float64]:
+            raise RuntimeError("Native core is not available.")
+
 
 __all__ = ["NativeGeoProjector"]
 
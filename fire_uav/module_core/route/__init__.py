@@ -1,6 +1,13 @@
 from fire_uav.module_core.route.energy import EnergyModel
 from fire_uav.module_core.route.maneuvers import build_approach, build_maneuver, build_orbit, build_rejoin
-from fire_uav.module_core.route.planner import CameraSpec, FlightPlanner, GridParams, Waypoint, build_route
+from fire_uav.module_core.route.planner import (
+    CameraSpec,
+    FlightPlanner,
+    GridParams,
+    Waypoint,
+    build_fleet_routes,
+    build_route,
+)
 from fire_uav.module_core.route.python_planner import PythonRoutePlanner
 
 __all__ = [
@@ -9,6 +16,7 @@ __all__ = [
     "GridParams",
     "Waypoint",
     "build_route",
+    "build_fleet_routes",
     "build_approach",
     "build_orbit",
     "build_rejoin",
@@ -0,0 +1,277 @@
+"""
+Обход запретных зон для манёвров: граф видимости + A*.
+
+Зоны расширяются на `margin_m` в локальной метрической плоскости и сливаются.
+Узлы графа — выпуклые вершины расширенных контуров, рёбра — касательные к контурам
+отрезки, не заходящие внутрь ни одного контура: кратчайший обход многоугольников
+ломается только в таких вершинах и идёт по таким отрезкам, поэтому A* по графу
+даёт кратчайший путь (с точностью до скругления отступа). Проверка касания
+дешёвая и векторная, дорогая проверка пересечений остаётся для ~2 вершин на контур.
+
+Контуры строятся один раз на набор зон (`no_fly.load_zones` отдаёт один объект,
+пока файл не менялся) и отступ, строки графа — лениво: видимость вершины
+считается одним векторным запросом к STRtree, когда A* впервые её раскрывает,
+и запоминается. Поиск ограничен эллипсом вокруг отрезка (расширяется, если
+обхода внутри нет), так что манёвр в полёте стоит единицы миллисекунд, а
+повторные манёвры в том же районе идут по уже посчитанному графу.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import shapely
+from numpy.typing import ArrayLike, NDArray
+
+from fire_uav.module_core.route.local_frame import LocalFrame
+from fire_uav.module_core.route.no_fly import NoFlyZones, load_zones
+
+LatLon = Tuple[float, float]
+
+_AVOIDER_CACHE_SIZE = 4
+_QUAD_SEGS = 3  # вершин на четверть скругления отступа
+# хорды скругления не ближе отступа к зоне: радиус скругления чуть больше
+_CHORD = 1.0 / math.cos(math.pi / (4 * _QUAD_SEGS))
+_SIMPLIFY = 0.25  # допуск упрощения контуров, доля отступа (компенсируется расширением)
+_SLACK_M = 0.5  # обход строится по контурам шире отступа: вершины не касаются его границы
+_NUDGE_M = 1e-3  # вынос точки с границы контура наружу
+_CORRIDOR = 1.5  # начальный эллипс поиска: сумма расстояний до концов ≤ 1.5·|ab| + 4·отступ
+
+
+def _convex_vertices(polys: NDArray[np.object_]) -> NDArray[np.float64]:
+    """
+    Выпуклые вершины внешних контуров (только на них может ломаться кратчайший обход):
+    массив (N, 3, 2) — вершина, предыдущая и следующая по кольцу.
+    """
+    rings = shapely.get_exterior_ring(shapely.orient_polygons(polys))  # против часовой
+    coords, ring = shapely.get_coordinates(rings, return_index=True)
+    closing = np.append(ring[1:] != ring[:-1], True)  # последняя точка кольца = первая
+    pts, ring = coords[~closing], ring[~closing]
+    # соседи по кольцу с переходом через его начало
+    first = np.flatnonzero(np.append(True, ring[1:] != ring[:-1]))
+    last = np.append(first[1:], len(pts)) - 1
+    pos = np.arange(len(pts))
+    start = np.repeat(first, last - first + 1)
+    end = np.repeat(last, last - first + 1)
+    prev = np.where(pos == start, end, pos - 1)
+    nxt = np.where(pos == end, start, pos + 1)
+    e1, e2 = pts - pts[prev], pts[nxt] - pts
+    convex = _cross(e1, e2) > 0
+    corners: NDArray[np.float64] = np.stack([pts, pts[prev], pts[nxt]], axis=1)[convex]
+    return corners
+
+
+def _cross(u: NDArray[np.float64], v: NDArray[np.float64]) -> NDArray[np.float64]:
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def _tangent(d: NDArray[np.float64], ring: NDArray[np.float64]) -> NDArray[np.bool_]:
+    """Прямая с направлением d через вершину ring[:, 0] оставляет её соседей по одну сторону."""
+    return _cross(d, ring[:, 1] - ring[:, 0]) * _cross(d, ring[:, 2] - ring[:, 0]) >= 0
+
+
+class _Obstacles:
+    """Расширенные и слитые зоны в локальной плоскости + лениво заполняемый граф видимости."""
+
+    def __init__(self, zones: NoFlyZones, margin_m: float) -> None:
+        self.frame = LocalFrame.around(zones.union)
+        local = self.frame.geom_to_local(zones.geoms)
+        # упрощение срезает не больше допуска — на столько контуры и расширяются;
+        # окружность радиуса R остаётся с ~π·sqrt(R / 2·допуск) вершинами вместо сотен
+        tol = margin_m * _SIMPLIFY
+        grown = shapely.buffer(local, margin_m * _CHORD + tol, quad_segs=_QUAD_SEGS)
+        merged = shapely.simplify(shapely.union_all(grown), tol, preserve_topology=True)
+        self.polys = shapely.get_parts(merged)
+        shapely.prepare(self.polys)
+        self.tree = shapely.STRtree(self.polys)
+        self.rings = _convex_vertices(self.polys)
+        self.verts = self.rings[:, 0]
+        # строки графа: расстояние до вершины, inf — не видна, nan — ещё не считали
+        self._rows: Dict[int, NDArray[np.float64]] = {}
+
+    def blocked(self, a: NDArray[np.float64], b: NDArray[np.float64]) -> NDArray[np.bool_]:
+        """Отрезки a → b, заходящие внутрь контура (идти по границе можно)."""
+        out = np.zeros(len(a), dtype=bool)
+        if not len(a):
+            return out
+        lines = shapely.linestrings(np.stack([a, b], axis=1))
+        seg, poly = self.tree.query(lines, predicate="intersects")
+        # внутренности пересекаются: отрезок пересекает контур или лежит в нём целиком
+        # (оба предиката — по подготовленным контурам)
+        polys = self.polys[poly]
+        inner = shapely.crosses(polys, lines[seg]) | shapely.contains(polys, lines[seg])
+        out[seg[inner]] = True
+        return out
+
+    def _visible(
+        self, p: NDArray[np.float64], idx: NDArray[np.intp], src: int | None = None
+    ) -> NDArray[np.float64]:
+        """
+        Длины касательных рёбер от точки p (или вершины `src`) до вершин idx;
+        inf — не касательное или не видно.
+        """
+        dst = self.verts[idx]
+        d = np.full(len(idx), np.inf)
+        step = dst - p
+        ok = _tangent(step, self.rings[idx])
+        if src is not None:
+            ok &= _tangent(step, np.broadcast_to(self.rings[src], (len(idx), 3, 2)))
+        ok[ok] = ~self.blocked(np.broadcast_to(p, dst[ok].shape), dst[ok])
+        d[ok] = np.hypot(*step[ok].T)
+        return d
+
+    def row(self, u: int, mask: NDArray[np.bool_]) -> NDArray[np.float64]:
+        """Рёбра вершины u к вершинам `mask`; недостающие считаются и запоминаются."""
+        d = self._rows.get(u)
+        if d is None:
+            d = self._rows[u] = np.full(len(self.verts), np.nan)
+            d[u] = np.inf
+        todo = np.flatnonzero(mask & np.isnan(d))
+        if len(todo):
+            d[todo] = self._visible(self.verts[u], todo, src=u)
+        return np.where(mask, d, np.inf)
+
+    def outside(self, p: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Точка внутри контура → ближайшая точка снаружи, у самой границы."""
+        pt = shapely.points(p)
+        hit = self.tree.query(pt, predicate="within")
+        if not len(hit):
+            return p
+        ring = self.polys[hit[0]].exterior
+        q = np.asarray(ring.interpolate(ring.project(pt)).coords[0])
+        out: NDArray[np.float64] = q + (q - p) / np.hypot(*(q - p)) * _NUDGE_M
+        return out
+
+    def route(
+        self, a: NDArray[np.float64], b: NDArray[np.float64], mask: NDArray[np.bool_]
+    ) -> List[NDArray[np.float64]] | None:
+        """Кратчайший путь a → b (A*) через вершины `mask`, точки в метрах; None — пути нет."""
+        n = len(self.verts)
+        idx = np.flatnonzero(mask)
+        from_a = np.full(n, np.inf)
+        to_b = np.full(n, np.inf)
+        from_a[idx] = self._visible(a, idx)
+        to_b[idx] = self._visible(b, idx)
+        direct = np.inf if self.blocked(a[None], b[None])[0] else float(np.hypot(*(b - a)))
+
+        start, goal = n, n + 1
+        pts = np.vstack([self.verts, a, b])
+        h = np.hypot(*(pts - b).T)
+        best = np.full(n + 2, np.inf)
+        prev = np.full(n + 2, -1)
+        best[start] = 0.0
+        nbr = np.arange(n + 1)
+        nbr[n] = goal
+        heap = [(float(h[start]), start)]
+        while heap:
+            f, u = heapq.heappop(heap)
+            if u == goal:
+                break
+            if f > best[u] + h[u]:
+                continue  # устаревшая запись очереди
+            if u == start:
+                edges = np.append(from_a, direct)
+            else:
+                edges = np.append(self.row(u, mask), to_b[u])
+            cand = best[u] + edges
+            better = cand < best[nbr]
+            for v, g in zip(nbr[better].tolist(), cand[better].tolist()):
+                best[v] = g
+                prev[v] = u
+                heapq.heappush(heap, (g + h[v], v))
+        if not math.isfinite(best[goal]):
+            return None
+
+        path = []
+        u = goal
+        while u >= 0:
+            path.append(pts[u])
+            u = int(prev[u])
+        return path[::-1]
+
+
+class NfzAvoider:
+    """Пути в обход запретных зон с отступом `margin_m`; точки — (lat, lon)."""
+
+    def __init__(self, zones: NoFlyZones, margin_m: float = 20.0) -> None:
+        self.zones = zones
+        self.margin_m = float(margin_m)
+        self._obs: Dict[float, _Obstacles] = {}
+
+    def _obstacles(self, slack_m: float = 0.0) -> _Obstacles:
+        obs = self._obs.get(slack_m)
+        if obs is None:
+            obs = self._obs[slack_m] = _Obstacles(self.zones, self.margin_m + slack_m)
+        return obs
+
+    def _violates(self, lat: Sequence[float], lon: Sequence[float]) -> bool:
+        """Ломаная задевает сами зоны (без отступа)."""
+        return bool(self.zones.segments_violate(lat[:-1], lon[:-1], lat[1:], lon[1:]).any())
+
+    def is_clear(self, lat: ArrayLike, lon: ArrayLike) -> bool:
+        """Ломаная (lat, lon) не заходит ни в зоны, ни в их отступ."""
+        obs = self._obstacles()
+        xy = np.column_stack(obs.frame.to_local(lon, lat))
+        return not obs.blocked(xy[:-1], xy[1:]).any()
+
+    def path(self, start: LatLon, end: LatLon) -> List[LatLon] | None:
+        """
+        Путь start → end в обход зон, оба конца включены; прямой отрезок, если он
+        свободен. Конец внутри отступа соединяется с ближайшей точкой снаружи.
+        None — обхода нет (например, `end` внутри запретной зоны).
+        """
+        obs = self._obstacles(_SLACK_M)
+        a = np.array(obs.frame.to_local(start[1], start[0]))
+        b = np.array(obs.frame.to_local(end[1], end[0]))
+        a_out, b_out = obs.outside(a), obs.outside(b)
+        route: List[NDArray[np.float64]] = [a_out, b_out]
+        if obs.blocked(a_out[None], b_out[None])[0]:
+            # эллипс поиска с фокусами в концах; без обхода внутри — вдвое больше
+            reach = np.hypot(*(obs.verts - a_out).T) + np.hypot(*(obs.verts - b_out).T)
+            limit = _CORRIDOR * float(np.hypot(*(b_out - a_out))) + 4 * self.margin_m
+            while True:
+                mask = reach <= limit
+                found = obs.route(a_out, b_out, mask)
+                if found is not None or mask.all():
+                    break
+                limit *= 2
+            if found is None:
+                return None
+            route = found
+        # концы внутри отступа: короткий первый/последний отрезок идёт по отступу
+        xy = np.array([a] * (a_out is not a) + route + [b] * (b_out is not b))
+        lon, lat = obs.frame.to_geo(xy[:, 0], xy[:, 1])
+        lat, lon = lat.tolist(), lon.tolist()
+        lat[0], lon[0], lat[-1], lon[-1] = start[0], start[1], end[0], end[1]
+        if self._violates(lat, lon):
+            return None
+        return list(zip(lat, lon))
+
+
+_avoiders: OrderedDict[Tuple[int, float], NfzAvoider] = OrderedDict()
+
+
+def nfz_avoider(zones: NoFlyZones | str | Path | None, margin_m: float = 20.0) -> NfzAvoider | None:
+    """Обходчик для набора зон (или файла NFZ); None — зон нет. Кэш на набор и отступ."""
+    if not isinstance(zones, NoFlyZones):
+        zones = load_zones(zones) if zones else None
+    if zones is None or not len(zones):
+        return None
+    key = (id(zones), float(margin_m))
+    avoider = _avoiders.get(key)
+    if avoider is None or avoider.zones is not zones:
+        avoider = NfzAvoider(zones, margin_m)
+        _avoiders[key] = avoider
+        while len(_avoiders) > _AVOIDER_CACHE_SIZE:
+            _avoiders.popitem(last=False)
+    else:
+        _avoiders.move_to_end(key)
+    return avoider
+
+
+__all__ = ["NfzAvoider", "nfz_avoider"]
@@ -1,24 +1,109 @@
 # mypy: ignore-errors
-"""Заглушка-пример для профиля высот (добавлены только типы)."""
+"""
+Профиль высот маршрута.
+
+Высоты берутся из локальных плиток DEM (`terrain.DEMTileStore`: .hgt/GeoTIFF
+через memory-map, пакетная билинейная интерполяция, LRU открытых плиток).
+HTTP-сервис в формате opentopodata — только необязательный запасной вариант
+для точек вне покрытия; его можно направить на локальную заглушку.
+"""
 
 from __future__ import annotations
 
+import logging
 import math
+from pathlib import Path
 from typing import List, Sequence
 
+import numpy as np
 import requests
+from numpy.typing import ArrayLike, NDArray
 
 from fire_uav.module_core.schema import Waypoint
+from fire_uav.module_core.terrain.dem import DEMTileStore
+
+log = logging.getLogger(__name__)
 
-_API_URL = "https://api.opentopodata.org/v1/test-dataset"
 _EARTH_R = 6_371_000  # м
+_HTTP_BATCH = 100  # предел точек на запрос у opentopodata
+
+
+class ElevationService:
+    """Пакетные запросы высот: сначала DEM, затем (если задан) HTTP для пропусков."""
+
+    def __init__(
+        self,
+        dem: DEMTileStore | None = None,
+        *,
+        http_url: str | None = None,
+        timeout: float = 10.0,
+    ) -> None:
+        self.dem = dem
+        self.http_url = http_url
+        self.timeout = timeout
+
+    def lookup(self, lats: ArrayLike, lons: ArrayLike) -> NDArray[np.float64]:
+        """Высоты (м) для точек; NaN — нет ни плитки, ни ответа HTTP."""
+        lat_arr = np.asarray(lats, dtype=np.float64).ravel()
+        lon_arr = np.asarray(lons, dtype=np.float64).ravel()
+        if self.dem is not None and len(self.dem):
+            out = self.dem.elevation(lat_arr, lon_arr)
+        else:
+            out = np.full(lat_arr.shape, np.nan)
+        missing = np.flatnonzero(np.isnan(out))
+        if len(missing) and self.http_url:
+            out[missing] = self._http_lookup(lat_arr[missing], lon_arr[missing])
+        return out
+
+    def _http_lookup(
+        self, lats: NDArray[np.float64], lons: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        out = np.full(lats.shape, np.nan)
+        for start in range(0, len(lats), _HTTP_BATCH):
+            chunk = slice(start, start + _HTTP_BATCH)
+            coords = "|".join(f"{lat},{lon}" for lat, lon in zip(lats[chunk], lons[chunk]))
+            try:
+                r = requests.get(self.http_url, params={"locations": coords}, timeout=self.timeout)
+                r.raise_for_status()
+                out[chunk] = [
+                    np.nan if item.get("elevation") is None else item["elevation"]
+                    for item in r.json()["results"]
+                ]
+            except (requests.RequestException, KeyError, ValueError) as exc:
+                log.warning("Elevation HTTP fallback failed: %s", exc)
+                break
+        return out
 
 
-def profile(route: Sequence[Waypoint]) -> List[float]:
-    coords = "|".join(f"{wp.lat},{wp.lon}" for wp in route)
-    r = requests.get(_API_URL, params={"locations": coords}, timeout=10)
-    r.raise_for_status()
-    return [item["elevation"] for item in r.json()["results"]]
+_default_service: ElevationService | None = None
+
+
+def default_service() -> ElevationService:
+    """Сервис по настройкам (`dem_dir`, `dem_max_open_tiles`, `elevation_http_url`)."""
+    global _default_service
+    if _default_service is None:
+        from fire_uav.config import settings
+
+        _default_service = ElevationService(
+            DEMTileStore(
+                Path(getattr(settings, "dem_dir", "data/dem")),
+                max_open_tiles=getattr(settings, "dem_max_open_tiles", 16),
+            ),
+            http_url=getattr(settings, "elevation_http_url", None),
+        )
+    return _default_service
+
+
+def profile(route: Sequence[Waypoint], service: ElevationService | None = None) -> List[float]:
+    """Высоты рельефа под точками маршрута (NaN там, где данных нет)."""
+    if not route:
+        return []
+    service = service or default_service()
+    elev = service.lookup([wp.lat for wp in route], [wp.lon for wp in route])
+    missing = int(np.isnan(elev).sum())
+    if missing:
+        log.warning("No elevation data for %d of %d route points", missing, len(route))
+    return elev.tolist()
 
 
 def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -28,3 +113,6 @@ def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
     )
     return 2 * _EARTH_R * math.asin(math.sqrt(a))
+
+
+__all__ = ["ElevationService", "default_service", "profile"]
@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from numpy.typing import ArrayLike
+
+from fire_uav.module_core.energy.route_cost import route_energy_wh, split_by_energy
 
 
 @dataclass(slots=True)
@@ -10,12 +15,33 @@ class EnergyModel:
     cruise_speed_mps: float = 12.0
     power_cruise_w: float = 45.0
     battery_wh: float = 27.0
+    turn_time_s: float = 4.0  # торможение, разворот и разгон на конце галса
+    mass_kg: float = 1.2
+    climb_efficiency: float = 0.5  # доля мощности, уходящая в набор высоты
+    reserve_fraction: float = 0.1  # неприкосновенный остаток батареи
 
     def cruise_time_s(self, distance_m: float) -> float:
         return distance_m / self.cruise_speed_mps
 
+    def flight_time_s(self, distance_m: float, turns: int = 0) -> float:
+        return self.cruise_time_s(distance_m) + turns * self.turn_time_s
+
     def energy_used_wh(self, distance_m: float) -> float:
         return self.cruise_time_s(distance_m) / 3600 * self.power_cruise_w
 
+    def route_energy_wh(self, lat: ArrayLike, lon: ArrayLike, alt: ArrayLike) -> float:
+        """Энергия маршрута с набором высоты и разворотами (`energy.route_cost`)."""
+        return route_energy_wh(lat, lon, alt, self)
+
+    def split_points(
+        self,
+        lat: ArrayLike,
+        lon: ArrayLike,
+        alt: ArrayLike,
+        home: Sequence[float] | None = None,
+    ) -> List[Tuple[int, int]]:
+        """Границы миссий [start, stop) по ёмкости батареи (`energy.route_cost`)."""
+        return split_by_energy(lat, lon, alt, self, home)
+
 
 __all__ = ["EnergyModel"]
@@ -0,0 +1,65 @@
+"""
+Локальная метрическая система координат (ENU, касательная плоскость) для планировщика.
+
+AOI проецируется в метры один раз, сетка и точки съёмки строятся в метрах,
+обратно в lon/lat всё переводится одним векторным проходом. Для участков
+в десятки километров ошибка масштаба — доли процента.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Tuple, TypeVar
+
+import numpy as np
+import shapely
+from numpy.typing import ArrayLike, NDArray
+from shapely.geometry.base import BaseGeometry
+
+from fire_uav.module_core.geometry import EARTH_RADIUS_M
+
+G = TypeVar("G", bound=BaseGeometry)
+XY = Tuple[NDArray[np.float64], NDArray[np.float64]]
+
+
+@dataclass(slots=True, frozen=True)
+class LocalFrame:
+    """ENU-плоскость с началом в (lat0, lon0): x — на восток, y — на север, метры."""
+
+    lat0: float
+    lon0: float
+
+    @classmethod
+    def around(cls, geom: BaseGeometry) -> "LocalFrame":
+        """Начало координат — в центре охватывающего прямоугольника (x = lon, y = lat)."""
+        minx, miny, maxx, maxy = geom.bounds
+        return cls(lat0=(miny + maxy) / 2.0, lon0=(minx + maxx) / 2.0)
+
+    @property
+    def _m_per_deg(self) -> Tuple[float, float]:
+        m_lat = EARTH_RADIUS_M * math.pi / 180.0
+        return m_lat * math.cos(math.radians(self.lat0)), m_lat
+
+    def to_local(self, lon: ArrayLike, lat: ArrayLike) -> XY:
+        m_lon, m_lat = self._m_per_deg
+        x = (np.asarray(lon, dtype=np.float64) - self.lon0) * m_lon
+        y = (np.asarray(lat, dtype=np.float64) - self.lat0) * m_lat
+        return x, y
+
+    def to_geo(self, x: ArrayLike, y: ArrayLike) -> XY:
+        """Обратное преобразование: (lon, lat)."""
+        m_lon, m_lat = self._m_per_deg
+        lon = self.lon0 + np.asarray(x, dtype=np.float64) / m_lon
+        lat = self.lat0 + np.asarray(y, dtype=np.float64) / m_lat
+        return lon, lat
+
+    # shapely.transform принимает и массив геометрий: все координаты — одним вызовом
+    def geom_to_local(self, geom: G) -> G:
+        return shapely.transform(geom, lambda c: np.column_stack(self.to_local(c[:, 0], c[:, 1])))
+
+    def geom_to_geo(self, geom: G) -> G:
+        return shapely.transform(geom, lambda c: np.column_stack(self.to_geo(c[:, 0], c[:, 1])))
+
+
+__all__ = ["LocalFrame"]
@@ -0,0 +1,252 @@
+"""
+Оптимизатор маршрута на чистом NumPy: ближайший сосед + 2-opt / Or-opt.
+
+Не требует OR-Tools (лёгкие бортовые сборки) и служит быстрым тёплым стартом
+для OR-Tools. Ходы ищутся только среди k ближайших соседей узла: выигрыши всех
+кандидатов одного прохода считаются одной векторной операцией, затем
+применяются непересекающиеся улучшающие ходы. Работа ограничена бюджетом времени.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+try:
+    from scipy.spatial import cKDTree as _cKDTree
+except ImportError:  # pragma: no cover
+    _cKDTree = None
+
+_CHUNK_ROWS = 512
+_EPS = 1e-9
+_OR_OPT_NEIGHBORS = 8  # Or-opt перебирает 4 точки вставки на соседа — хватает ближайших
+
+
+def nearest_neighbors(xy: NDArray[np.float64], k: int) -> NDArray[np.intp]:
+    """(N, k) индексы k ближайших точек для каждой (без самой точки), ближние — первыми."""
+    n = len(xy)
+    k = max(1, min(k, n - 1))
+    if _cKDTree is not None:
+        idx: NDArray[np.intp] = _cKDTree(xy).query(xy, k + 1)[1][:, 1:].astype(np.intp)
+        return idx
+    x, y = xy[:, 0], xy[:, 1]
+    out = np.empty((n, k), dtype=np.intp)
+    for lo in range(0, n, _CHUNK_ROWS):
+        rows = slice(lo, lo + _CHUNK_ROWS)
+        d2 = x[rows, None] - x
+        dy = y[rows, None] - y
+        d2 *= d2
+        dy *= dy
+        d2 += dy
+        r = np.arange(len(d2))
+        d2[r, r + lo] = np.inf
+        part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        out[rows] = np.take_along_axis(
+            part, np.argsort(np.take_along_axis(d2, part, axis=1), axis=1), axis=1
+        )
+    return out
+
+
+def nearest_neighbor_tour(
+    xy: NDArray[np.float64], start: int = 0, nbr: NDArray[np.intp] | None = None
+) -> NDArray[np.intp]:
+    """Жадный обход «в ближайшую непосещённую точку»; `nbr` ускоряет поиск соседа."""
+    n = len(xy)
+    tour = np.empty(n, dtype=np.intp)
+    free = np.ones(n, dtype=bool)
+    nbr_rows = nbr.tolist() if nbr is not None else None
+    cur = start
+    for i in range(n):
+        tour[i] = cur
+        free[cur] = False
+        if i == n - 1:
+            break
+        nxt = -1
+        if nbr_rows is not None:
+            nxt = next((j for j in nbr_rows[cur] if free[j]), -1)
+        if nxt < 0:
+            cand = np.flatnonzero(free)
+            d = xy[cand] - xy[cur]
+            nxt = int(cand[np.argmin(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1])])
+        cur = nxt
+    return tour
+
+
+def tour_length(xy: NDArray[np.float64], tour: NDArray[np.intp], *, closed: bool = True) -> float:
+    pts = xy[np.append(tour, tour[0])] if closed else xy[tour]
+    return float(np.hypot(*np.diff(pts, axis=0).T).sum())
+
+
+class _Tour:
+    """Текущий обход и векторные выигрыши ходов; позиция 0 (старт) неподвижна."""
+
+    def __init__(self, xy: NDArray[np.float64], tour: NDArray[np.intp], closed: bool) -> None:
+        self.xy = xy
+        self.t = tour.copy()
+        self.n = len(tour)
+        self.closed = closed
+
+    def _coords(self) -> None:
+        """Координаты по позициям; строка n — замыкание на старт (или «нет узла»)."""
+        tail = self.xy[self.t[:1]] if self.closed else np.full((1, 2), np.nan)
+        self._p = np.vstack([self.xy[self.t], tail])
+
+    def _dist(self, a: NDArray[np.intp], b: NDArray[np.intp]) -> NDArray[np.float64]:
+        """Расстояния между узлами в позициях a и b; у открытого пути позиция n даёт 0."""
+        d: NDArray[np.float64] = np.hypot(*(self._p[a] - self._p[b]).T)
+        if not self.closed:
+            d[np.isnan(d)] = 0.0
+        return d
+
+    def positions(self) -> NDArray[np.intp]:
+        pos = np.empty(self.n, dtype=np.intp)
+        pos[self.t] = np.arange(self.n)
+        return pos
+
+    # ───── 2-opt: разворот t[lo + 1 … hi] ───── #
+    def two_opt_pass(self, nbr: NDArray[np.intp], deadline: float) -> bool:
+        pos = self.positions()
+        self._coords()
+        i = np.repeat(np.arange(self.n), nbr.shape[1])
+        j = pos[nbr[self.t].ravel()]
+        lo, hi = np.minimum(i, j), np.maximum(i, j)
+        ok = hi - lo >= 2
+        lo, hi = lo[ok], hi[ok]
+        gain = (
+            self._dist(lo, lo + 1)
+            + self._dist(hi, hi + 1)
+            - self._dist(lo, hi)
+            - self._dist(lo + 1, hi + 1)
+        )
+        return self._apply(
+            gain, lo, hi + 1, lambda k: self._reverse(int(lo[k]), int(hi[k])), deadline
+        )
+
+    def _reverse(self, lo: int, hi: int) -> None:
+        self.t[lo + 1 : hi + 1] = self.t[lo + 1 : hi + 1][::-1].copy()
+
+    # ───── Or-opt: перенос цепочки t[s … s + L - 1] между q и q + 1 ───── #
+    def or_opt_pass(self, nbr: NDArray[np.intp], deadline: float, max_len: int = 3) -> bool:
+        pos = self.positions()
+        self._coords()
+        nbr = nbr[:, :_OR_OPT_NEIGHBORS]
+        n, k = self.n, nbr.shape[1]
+        s_all, e_all, q_all, g_all, rev_all = [], [], [], [], []
+        for length in range(1, max_len + 1):
+            s = np.arange(1, n - length + 1)
+            e = s + length - 1
+            if not len(s):
+                break
+            removal = self._dist(s - 1, s) + self._dist(e, e + 1) - self._dist(s - 1, e + 1)
+            # точки вставки: после соседа или перед ним, для обоих концов цепочки
+            cand = np.concatenate([nbr[self.t[s]], nbr[self.t[e]]], axis=1)
+            q = np.concatenate([pos[cand], pos[cand] - 1], axis=1)
+            ss = np.repeat(s, 4 * k)
+            ee = np.repeat(e, 4 * k)
+            q = q.ravel()
+            rem = np.repeat(removal, 4 * k)
+            ok = (q >= 0) & ((q < ss - 1) | (q > ee))
+            if not self.closed:
+                ok &= q < n
+            ss, ee, q, rem = ss[ok], ee[ok], q[ok], rem[ok]
+            base = self._dist(q, q + 1)
+            fwd = self._dist(q, ss) + self._dist(ee, q + 1) - base
+            bwd = self._dist(q, ee) + self._dist(ss, q + 1) - base
+            s_all.append(ss)
+            e_all.append(ee)
+            q_all.append(q)
+            g_all.append(rem - np.minimum(fwd, bwd))
+            rev_all.append(bwd < fwd)
+        if not s_all:
+            return False
+        s, e, q = np.concatenate(s_all), np.concatenate(e_all), np.concatenate(q_all)
+        gain, rev = np.concatenate(g_all), np.concatenate(rev_all)
+        lo = np.minimum(s - 1, q)
+        hi = np.maximum(e + 1, q + 1)
+        return self._apply(
+            gain,
+            lo,
+            hi,
+            lambda m: self._move(int(s[m]), int(e[m]), int(q[m]), bool(rev[m])),
+            deadline,
+        )
+
+    def _move(self, s: int, e: int, q: int, rev: bool) -> None:
+        seg = self.t[s : e + 1].copy()
+        if rev:
+            seg = seg[::-1]
+        if q > e:
+            self.t[s : q - (e - s)] = self.t[e + 1 : q + 1].copy()
+            self.t[q - (e - s) : q + 1] = seg
+        else:
+            self.t[q + 1 + len(seg) : e + 1] = self.t[q + 1 : s].copy()
+            self.t[q + 1 : q + 1 + len(seg)] = seg
+
+    # ───── применение непересекающихся ходов ───── #
+    def _apply(
+        self,
+        gain: NDArray[np.float64],
+        lo: NDArray[np.intp],
+        hi: NDArray[np.intp],
+        apply_move: Callable[[int], None],
+        deadline: float,
+    ) -> bool:
+        """
+        Ходы с выигрышем по убыванию; ход берётся, если его окно [lo, hi] ещё не тронуто.
+        `apply_move` получает номер хода в массивах прохода.
+        """
+        good = np.flatnonzero(gain > _EPS)
+        if not len(good):
+            return False
+        used = np.zeros(self.n + 2, dtype=bool)
+        improved = False
+        order: list[int] = good[np.argsort(-gain[good], kind="stable")].tolist()
+        for m in order:
+            a, b = int(lo[m]), int(hi[m])
+            if used[a : b + 1].any():
+                continue
+            used[a : b + 1] = True
+            apply_move(m)
+            improved = True
+            if time.perf_counter() > deadline:
+                break
+        return improved
+
+
+def improve_tour(
+    xy: ArrayLike,
+    tour: ArrayLike | None = None,
+    *,
+    start: int = 0,
+    closed: bool = True,
+    time_budget_s: float = 1.0,
+    neighbors: int = 16,
+) -> NDArray[np.intp]:
+    """
+    Порядок обхода точек (N, 2) в метрах: ближайший сосед (если `tour` не задан),
+    затем чередование проходов 2-opt и Or-opt до локального минимума или бюджета.
+    Первая точка обхода — `start` (или `tour[0]`).
+    """
+    pts = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    deadline = time.perf_counter() + time_budget_s
+    if len(pts) <= 3:
+        return np.asarray(tour if tour is not None else np.roll(np.arange(len(pts)), -start))
+    nbr = nearest_neighbors(pts, neighbors)
+    if tour is None:
+        tour = nearest_neighbor_tour(pts, start, nbr)
+    tour = np.asarray(tour, dtype=np.intp)
+    state = _Tour(pts, tour, closed)
+    while time.perf_counter() < deadline:
+        improved = state.two_opt_pass(nbr, deadline)
+        if time.perf_counter() >= deadline:
+            break
+        improved |= state.or_opt_pass(nbr, deadline)
+        if not improved:
+            break
+    return state.t
+
+
+__all__ = ["improve_tour", "nearest_neighbor_tour", "nearest_neighbors", "tour_length"]
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import math
-from typing import List
+from typing import List, Sequence
 
 from fire_uav.module_core.geometry import haversine_m, offset_latlon
 from fire_uav.module_core.interfaces.energy import IEnergyModel
+from fire_uav.module_core.route.avoidance import NfzAvoider, nfz_avoider
 from fire_uav.module_core.schema import Route, TelemetrySample, Waypoint
 
 
@@ -36,14 +37,59 @@ def build_orbit(
     return result
 
 
-def build_approach(current_pos: TelemetrySample | Waypoint, entry_wp: Waypoint) -> List[Waypoint]:
+_ORBIT_SHRINK = 0.75  # шаг уменьшения радиуса орбиты, задевающей запретную зону
+_ORBIT_MIN_FRACTION = 0.25  # меньше этой доли от заданного радиуса орбиту не сжимаем
+
+
+def _detour(a: Waypoint, b: Waypoint, avoider: NfzAvoider | None) -> List[Waypoint] | None:
+    """Промежуточные точки обхода запретных зон между a и b (без концов); None — обхода нет."""
+    if avoider is None:
+        return []
+    path = avoider.path((a.lat, a.lon), (b.lat, b.lon))
+    if path is None:
+        return None
+    return [Waypoint(lat=lat, lon=lon, alt=b.alt) for lat, lon in path[1:-1]]
+
+
+def _orbit_path(
+    entry_wp: Waypoint, orbit: Sequence[Waypoint], avoider: NfzAvoider | None
+) -> List[Waypoint] | None:
+    """
+    Облёт от точки входа (цели): выход на окружность, кольцо и возврат в центр.
+    Радиальные участки через центр идут в обход зон внутри радиуса орбиты;
+    None — кольцо задевает зону (с отступом) или обхода нет.
+    """
+    if avoider is None:
+        return list(orbit)
+    ring, centre = orbit[:-1], orbit[-1]
+    if not avoider.is_clear([wp.lat for wp in ring], [wp.lon for wp in ring]):
+        return None
+    leg_in = _detour(entry_wp, ring[0], avoider)
+    leg_out = _detour(ring[-1], centre, avoider)
+    if leg_in is None or leg_out is None:
+        return None
+    return [*leg_in, *ring, *leg_out, centre]
+
+
+def build_approach(
+    current_pos: TelemetrySample | Waypoint,
+    entry_wp: Waypoint,
+    avoider: NfzAvoider | None = None,
+) -> List[Waypoint]:
+    """Подлёт к точке входа; с `avoider` — в обход запретных зон ([] — обхода нет)."""
     start = _as_waypoint(current_pos, alt=entry_wp.alt)
     if haversine_m((start.lat, start.lon), (entry_wp.lat, entry_wp.lon)) < 0.5:
         return [entry_wp]
-    return [start, entry_wp]
+    detour = _detour(start, entry_wp, avoider)
+    if detour is None:
+        return []
+    return [start, *detour, entry_wp]
 
 
-def build_rejoin(exit_wp: Waypoint, base_route: Route) -> List[Waypoint]:
+def build_rejoin(
+    exit_wp: Waypoint, base_route: Route, avoider: NfzAvoider | None = None
+) -> List[Waypoint]:
+    """Возврат к ближайшей точке базового маршрута; с `avoider` — в обход запретных зон."""
     if not base_route.waypoints:
         return []
 
@@ -55,9 +101,11 @@ def build_rejoin(exit_wp: Waypoint, base_route: Route) -> List[Waypoint]:
             closest_dist = dist
             closest_idx = idx
 
-    path = [exit_wp]
-    path.extend(base_route.waypoints[closest_idx:])
-    return path
+    rest = base_route.waypoints[closest_idx:]
+    detour = _detour(exit_wp, rest[0], avoider)
+    if detour is None:
+        return []
+    return [exit_wp, *detour, *rest]
 
 
 def build_maneuver(
@@ -72,14 +120,28 @@ def build_maneuver(
     radius = getattr(settings, "orbit_radius_m", 50.0)
     points_per_circle = getattr(settings, "orbit_points_per_circle", 12)
     loops = getattr(settings, "orbit_loops", 1)
+    avoider = nfz_avoider(
+        getattr(settings, "no_fly_geojson", None), getattr(settings, "nfz_margin_m", 20.0)
+    )
 
     entry_wp = Waypoint(lat=target_lat, lon=target_lon, alt=altitude)
     orbit = build_orbit(target_lat, target_lon, radius, altitude, points_per_circle, loops)
-    approach = build_approach(current_state, entry_wp)
+    # орбита, задевающая зону (с отступом), сжимается к цели
+    r = radius
+    orbit_path = _orbit_path(entry_wp, orbit, avoider)
+    while orbit_path is None:
+        r *= _ORBIT_SHRINK
+        if r < radius * _ORBIT_MIN_FRACTION:
+            return None
+        orbit = build_orbit(target_lat, target_lon, r, altitude, points_per_circle, loops)
+        orbit_path = _orbit_path(entry_wp, orbit, avoider)
+    approach = build_approach(current_state, entry_wp, avoider)
     exit_wp = orbit[-1] if orbit else entry_wp
-    rejoin_path = build_rejoin(exit_wp, base_route)
+    rejoin_path = build_rejoin(exit_wp, base_route, avoider)
+    if not approach or (base_route.waypoints and not rejoin_path):
+        return None  # цель или маршрут недостижимы в обход запретных зон
 
-    waypoints = approach + orbit + rejoin_path
+    waypoints = approach + orbit_path + rejoin_path
     route = Route(
         version=base_route.version if base_route.version is not None else 1,
         waypoints=waypoints,
@@ -99,4 +161,3 @@ __all__ = [
     "build_rejoin",
     "build_maneuver",
 ]
-
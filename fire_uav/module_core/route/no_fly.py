@@ -1,14 +1,29 @@
 """
 Читает GeoJSON с запретными зонами и вычитает их из AOI.
+
+Разобранные зоны кэшируются по (путь, mtime, размер) и индексируются STRtree:
+из AOI вычитается объединение только тех зон, что его пересекают, а проверка
+отрезка маршрута (`segment_violates_nfz`) смотрит лишь кандидатов из индекса.
+Координаты — lon/lat, как в GeoJSON; точки в API — (lat, lon), как у Waypoint.
 """
 
-import json
+from __future__ import annotations
+
+from collections import OrderedDict
 from pathlib import Path
+from typing import Sequence, Tuple
 
-from shapely.geometry import MultiPolygon, Polygon, shape
+import numpy as np
+import shapely
+from numpy.typing import ArrayLike, NDArray
+from shapely.geometry import MultiPolygon, Polygon
+from shapely.geometry.base import BaseGeometry
 
+_CACHE_SIZE = 4  # разных файлов NFZ в памяти
 
-def load_no_fly(path: str | Path) -> Polygon | MultiPolygon | None:
+
+def resolve_no_fly_path(path: str | Path) -> Path | None:
+    """Путь к GeoJSON как есть или относительно корня репозитория; None — файла нет."""
     p = Path(path)
     candidates = [p]
     if not p.is_absolute():
@@ -20,12 +35,118 @@ def load_no_fly(path: str | Path) -> Polygon | MultiPolygon | None:
         except Exception:
             candidates.append(Path(__file__).resolve().parents[3] / p)
 
-    target = next((c for c in candidates if c.exists()), None)
+    return next((c for c in candidates if c.is_file()), None)
+
+
+class NoFlyZones:
+    """Набор запретных зон с пространственным индексом."""
+
+    def __init__(self, geoms: Sequence[BaseGeometry]) -> None:
+        self.geoms: NDArray[np.object_] = np.array(
+            [g for g in geoms if not g.is_empty], dtype=object
+        )
+        shapely.prepare(self.geoms)
+        self.tree = shapely.STRtree(self.geoms)
+        self._union: BaseGeometry | None = None
+
+    def __len__(self) -> int:
+        return len(self.geoms)
+
+    @property
+    def union(self) -> BaseGeometry:
+        """Объединение всех зон (строится один раз, по требованию)."""
+        if self._union is None:
+            self._union = shapely.union_all(self.geoms)
+        return self._union
+
+    def intersecting(self, geom: BaseGeometry) -> NDArray[np.object_]:
+        """Зоны, пересекающие `geom`."""
+        return self.geoms[self.tree.query(geom, predicate="intersects")]
+
+    def subtract(self, geom: BaseGeometry) -> BaseGeometry:
+        """`geom` без запретных зон; объединяются только зоны, задевающие `geom`."""
+        hit = self.intersecting(geom)
+        if not len(hit):
+            return geom
+        return geom.difference(shapely.union_all(hit))
+
+    def segments_violate(
+        self, lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike
+    ) -> NDArray[np.bool_]:
+        """Для каждого отрезка (lat1, lon1) → (lat2, lon2): задевает ли он какую-либо зону."""
+        coords = np.stack(
+            [
+                np.column_stack([np.ravel(lon1), np.ravel(lat1)]),
+                np.column_stack([np.ravel(lon2), np.ravel(lat2)]),
+            ],
+            axis=1,
+        )
+        out = np.zeros(len(coords), dtype=bool)
+        if not len(coords) or not len(self):
+            return out
+        lines = shapely.linestrings(coords)
+        seg, _ = self.tree.query(lines, predicate="intersects")
+        out[seg] = True
+        return out
+
+
+_zones_cache: OrderedDict[Tuple[str, int, int], NoFlyZones] = OrderedDict()
+
+
+def load_zones(path: str | Path) -> NoFlyZones | None:
+    """Зоны из GeoJSON (FeatureCollection или «голый» Polygon); кэш по пути и mtime."""
+    target = resolve_no_fly_path(path) if path else None
     if target is None:
         return None
+    st = target.stat()
+    key = (str(target.resolve()), st.st_mtime_ns, st.st_size)
+    zones = _zones_cache.get(key)
+    if zones is not None:
+        _zones_cache.move_to_end(key)
+        return zones
+
+    # GEOS читает GeoJSON сам (FeatureCollection или «голый» Polygon) — в разы быстрее
+    # json + shape() на каждую зону
+    parsed = shapely.from_geojson(target.read_text(encoding="utf-8"))
+    zones = NoFlyZones(shapely.get_parts(parsed))
+    _zones_cache[key] = zones
+    while len(_zones_cache) > _CACHE_SIZE:
+        _zones_cache.popitem(last=False)
+    return zones
+
+
+def load_no_fly(path: str | Path) -> Polygon | MultiPolygon | None:
+    """Объединение всех зон файла (None — файла нет или он пуст)."""
+    zones = load_zones(path)
+    if zones is None or not len(zones):
+        return None
+    return zones.union
+
+
+def subtract_no_fly(aoi: BaseGeometry, path: str | Path) -> BaseGeometry:
+    """AOI за вычетом запретных зон из файла `path`."""
+    zones = load_zones(path)
+    return zones.subtract(aoi) if zones is not None else aoi
+
+
+def segment_violates_nfz(
+    start: Tuple[float, float],
+    end: Tuple[float, float],
+    zones: NoFlyZones | str | Path | None,
+) -> bool:
+    """Задевает ли прямой отрезок start → end ((lat, lon)) запретную зону."""
+    if not isinstance(zones, NoFlyZones):
+        zones = load_zones(zones) if zones else None
+    if zones is None:
+        return False
+    return bool(zones.segments_violate(start[0], start[1], end[0], end[1])[0])
+
 
-    gjs = json.load(target.open())
-    if gjs["type"] == "FeatureCollection":
-        geoms = [shape(f["geometry"]) for f in gjs["features"]]
-        return geoms[0].union(*geoms[1:]) if geoms else None
-    return shape(gjs)  # допустим «голый» Polygon
+__all__ = [
+    "NoFlyZones",
+    "load_no_fly",
+    "load_zones",
+    "resolve_no_fly_path",
+    "segment_violates_nfz",
+    "subtract_no_fly",
+]
@@ -0,0 +1,133 @@
+"""
+Упорядочивание галсов вместо TSP по всем точкам съёмки.
+
+Задача решается на концах отрезков (2 узла на галс): переход между концами
+одного галса бесплатен, любые другие дуги штрафуются константой больше любой
+возможной экономии, поэтому оптимальный обход проходит каждый галс целиком,
+а решатель выбирает только порядок галсов и направление пролёта. Точки
+съёмки разворачиваются уже после (`Sweep.photo_points`).
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fire_uav.module_core.route.sweep import Sweep
+from fire_uav.module_core.route.tsp import HAVE_ORTOOLS, distance_matrix, solve_path
+
+log = logging.getLogger(__name__)
+
+ROUTE_ORDERINGS = ("segments", "tsp")
+
+
+def path_length(xy: NDArray[np.float64]) -> float:
+    """Длина ломаной (N, 2) в единицах координат."""
+    return float(np.hypot(*np.diff(xy, axis=0).T).sum()) if len(xy) > 1 else 0.0
+
+
+def _greedy_entries(ends: NDArray[np.float64]) -> NDArray[np.intp]:
+    """Без OR-Tools: из конца текущего галса — в ближайший конец свободного галса."""
+    m = len(ends) // 2
+    free = np.ones(2 * m, dtype=bool)
+    entry = np.empty(m, dtype=np.intp)
+    node = 0
+    for i in range(m):
+        entry[i] = node
+        free[[node, node ^ 1]] = False
+        if i == m - 1:
+            break
+        cand = np.flatnonzero(free)
+        d = ends[cand] - ends[node ^ 1]
+        node = int(cand[np.argmin(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1])])
+    return entry
+
+
+def order_segments(sweep: Sweep, *, time_limit_s: float = 1.0) -> Sweep:
+    """
+    Порядок и направление галсов, минимизирующие перелёты между ними.
+
+    Первый галс и его направление сохраняются (точка входа в AOI не меняется).
+    Если решатель не справился, галсы возвращаются в исходном зиг-заге; без
+    OR-Tools порядок строится жадно (ближайший свободный галс).
+    """
+    m = len(sweep)
+    if m <= 1:
+        return sweep
+
+    ends = np.empty((2 * m, 2))
+    ends[0::2] = sweep.start
+    ends[1::2] = sweep.end
+    if not HAVE_ORTOOLS:
+        return _reorder(sweep, _greedy_entries(ends))
+
+    cost = distance_matrix(ends)
+    # штраф > суммы любых m - 1 перелётов: разрыв галса никогда не выгоден
+    cost += int(cost.max()) * m + 1
+    pairs = np.arange(m)
+    cost[2 * pairs, 2 * pairs + 1] = 0
+    cost[2 * pairs + 1, 2 * pairs] = 0
+    np.fill_diagonal(cost, 0)
+
+    order = solve_path(cost, start=0, closed=False, time_limit_s=time_limit_s)
+    if order is None:
+        log.warning("Segment ordering found no solution, keeping zig-zag order")
+        return sweep
+    nodes = np.asarray(order)
+    entry, leave = nodes[0::2], nodes[1::2]
+    if len(nodes) != 2 * m or np.any(leave != (entry ^ 1)):
+        log.warning("Segment ordering split a sweep line, keeping zig-zag order")
+        return sweep
+    return _reorder(sweep, entry)
+
+
+def follow_order(sweep: Sweep, previous: Sweep) -> Sweep | None:
+    """
+    Галсы `sweep` в порядке и направлении галсов прежнего плана `previous`.
+
+    Нужна общая сетка строк (`sweep_polygon(..., anchor=...)`): каждый новый отрезок
+    сопоставляется ближайшему прежнему отрезку той же строки, отрезки одного
+    прежнего галса идут вдоль его направления. None — есть строки, которых в
+    прежнем плане не было (AOI расширен), порядок нужно строить заново.
+    """
+    m = len(sweep)
+    if m == 0:
+        return sweep
+    by_line = np.argsort(previous.line, kind="stable")
+    lines = previous.line[by_line]
+    lo = np.searchsorted(lines, sweep.line, side="left")
+    hi = np.searchsorted(lines, sweep.line, side="right")
+    if np.any(lo == hi):
+        return None
+
+    mid = (sweep.start + sweep.end) / 2
+    rank = np.empty(m, dtype=np.intp)
+    for i, (a, b) in enumerate(zip(lo.tolist(), hi.tolist())):
+        cand = by_line[a:b]
+        # расстояние от середины нового отрезка до прежних отрезков той же строки
+        p, d = previous.start[cand], previous.end[cand] - previous.start[cand]
+        t = np.clip(np.einsum("ij,ij->i", mid[i] - p, d) / np.einsum("ij,ij->i", d, d), 0, 1)
+        gap = np.hypot(*(p + t[:, None] * d - mid[i]).T)
+        rank[i] = cand[np.argmin(gap)]
+
+    direction = previous.end[rank] - previous.start[rank]
+    along = np.einsum("ij,ij->i", mid, direction)
+    flip = (np.einsum("ij,ij->i", sweep.end - sweep.start, direction) < 0)[:, None]
+    start = np.where(flip, sweep.end, sweep.start)
+    end = np.where(flip, sweep.start, sweep.end)
+    order = np.lexsort((along, rank))
+    return Sweep(start[order], end[order], sweep.line[order])
+
+
+def _reorder(sweep: Sweep, entry: NDArray[np.intp]) -> Sweep:
+    """Галсы в порядке узлов входа `entry` (2i — из start, 2i + 1 — из end)."""
+    seg = entry // 2
+    flip = (entry % 2 == 1)[:, None]
+    start = np.where(flip, sweep.end[seg], sweep.start[seg])
+    end = np.where(flip, sweep.start[seg], sweep.end[seg])
+    return Sweep(start, end, sweep.line[seg])
+
+
+__all__ = ["ROUTE_ORDERINGS", "follow_order", "order_segments", "path_length"]
@@ -0,0 +1,111 @@
+"""
+Подбор направления галсов под форму AOI.
+
+Кандидаты — направления сторон минимального повёрнутого прямоугольника AOI
+(галсы вдоль длинной стороны дают меньше разворотов) плюс грубый перебор
+0…180° с шагом `coarse_step_deg`. Для каждого угла векторный `sweep_polygon`
+строит галсы, время полёта оценивается моделью энергии: пролёт галсов и
+перелёты между ними на крейсерской скорости плюс время на каждый разворот.
+Углы оцениваются параллельно в пуле потоков (NumPy отпускает GIL).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import shapely
+from numpy.typing import NDArray
+from shapely.geometry.base import BaseGeometry
+
+from fire_uav.module_core.route.energy import EnergyModel
+from fire_uav.module_core.route.sweep import sweep_polygon
+
+_ANGLE_DECIMALS = 3  # кандидаты ближе 0.001° считаются одним
+
+
+@dataclass(slots=True, frozen=True)
+class OrientationChoice:
+    """Выбранный угол галсов и выигрыш относительно исходного угла."""
+
+    angle_deg: float
+    flight_time_s: float
+    baseline_angle_deg: float
+    baseline_time_s: float
+
+    @property
+    def savings_s(self) -> float:
+        return self.baseline_time_s - self.flight_time_s
+
+    @property
+    def savings_pct(self) -> float:
+        return 100 * self.savings_s / self.baseline_time_s if self.baseline_time_s > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"sweep {self.angle_deg:.1f}° (was {self.baseline_angle_deg:.1f}°): "
+            f"{self.baseline_time_s:.0f} s → {self.flight_time_s:.0f} s (-{self.savings_pct:.1f}%)"
+        )
+
+
+def candidate_angles(geom: BaseGeometry, coarse_step_deg: float = 15.0) -> NDArray[np.float64]:
+    """Углы (°, [0, 180)): стороны минимального повёрнутого прямоугольника + грубая сетка."""
+    angles = list(np.arange(0.0, 180.0, coarse_step_deg)) if coarse_step_deg > 0 else []
+    rect = shapely.minimum_rotated_rectangle(geom)
+    if rect.geom_type == "Polygon":
+        c = np.asarray(rect.exterior.coords)
+        d = np.diff(c[:3], axis=0)  # две соседние стороны
+        angles.extend(np.degrees(np.arctan2(d[:, 1], d[:, 0])))
+    return np.unique(np.round(np.mod(angles, 180.0), _ANGLE_DECIMALS))
+
+
+def estimate_flight_time_s(
+    geom: BaseGeometry, spacing_m: float, angle_deg: float, energy: EnergyModel
+) -> float:
+    """Время пролёта зиг-зага под углом `angle_deg`: галсы, перелёты и развороты."""
+    sweep = sweep_polygon(geom, spacing_m, angle_deg)
+    if not len(sweep):
+        return 0.0
+    transit = np.hypot(*(sweep.start[1:] - sweep.end[:-1]).T).sum()
+    return energy.flight_time_s(float(sweep.lengths().sum() + transit), turns=len(sweep) - 1)
+
+
+def best_orientation(
+    geom: BaseGeometry,
+    spacing_m: float,
+    energy: EnergyModel,
+    *,
+    baseline_deg: float = 0.0,
+    angles: Iterable[float] | None = None,
+    coarse_step_deg: float = 15.0,
+    workers: int | None = None,
+) -> OrientationChoice:
+    """
+    Угол с минимальной оценкой времени полёта среди кандидатов (`candidate_angles`
+    или `angles`); `baseline_deg` — текущий угол, относительно него считается выигрыш.
+    """
+    cand = candidate_angles(geom, coarse_step_deg) if angles is None else np.asarray(angles)
+    cand = np.unique(np.append(np.asarray(cand, dtype=np.float64), baseline_deg))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        times = list(
+            pool.map(lambda a: estimate_flight_time_s(geom, spacing_m, a, energy), cand.tolist())
+        )
+    times_arr = np.asarray(times)
+    best = int(np.argmin(times_arr))
+    base = int(np.flatnonzero(cand == baseline_deg)[0])
+    return OrientationChoice(
+        angle_deg=float(cand[best]),
+        flight_time_s=float(times_arr[best]),
+        baseline_angle_deg=float(baseline_deg),
+        baseline_time_s=float(times_arr[base]),
+    )
+
+
+__all__ = [
+    "OrientationChoice",
+    "best_orientation",
+    "candidate_angles",
+    "estimate_flight_time_s",
+]
@@ -0,0 +1,146 @@
+"""
+Деление AOI между несколькими БПЛА на сбалансированные компактные части.
+
+Части — ячейки взвешенной диаграммы Вороного (power diagram) в локальных метрах:
+точка относится к дрону k с минимальным |x - c_k|² - w_k. Центры c_k сдвигаются
+в центроиды своих частей (компактность, как у k-means), веса w_k подбираются так,
+чтобы нагрузки дронов сравнялись. Нагрузка — длина галсов (площадь / ширина
+захвата) плюс перелёт от точки старта до части и обратно. Итерации идут на
+сетке точек-образцов, итоговые границы — точные прямые (пересечение полуплоскостей),
+поэтому части покрывают AOI без зазоров и наложений.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import List
+
+import numpy as np
+import shapely
+from numpy.typing import ArrayLike, NDArray
+from shapely.geometry import Polygon
+from shapely.geometry.base import BaseGeometry
+
+from fire_uav.module_core.detections.assignment import linear_sum_assignment
+
+_SAMPLES = 4000  # точек-образцов AOI для балансировки
+_KMEANS_ITERS = 10
+_STEP = 0.5  # доля рассогласования нагрузок, переводимая в вес за итерацию
+
+
+def _samples(geom: BaseGeometry, n: int) -> NDArray[np.float64]:
+    """Узлы регулярной сетки внутри AOI (~n штук)."""
+    x0, y0, x1, y1 = geom.bounds
+    h = math.sqrt(geom.area / n)
+    xs = np.arange(x0 + h / 2, x1, h)
+    ys = np.arange(y0 + h / 2, y1, h)
+    gx, gy = (g.ravel() for g in np.meshgrid(xs, ys))
+    inside = shapely.contains_xy(geom, gx, gy)
+    if inside.sum() < n // 4:  # узкий AOI: сгущаем сетку
+        return _samples(geom, 4 * n)
+    return np.column_stack([gx[inside], gy[inside]])
+
+
+def _assign(
+    pts: NDArray[np.float64], c: NDArray[np.float64], w: NDArray[np.float64]
+) -> NDArray[np.intp]:
+    d = (pts[:, None, 0] - c[:, 0]) ** 2 + (pts[:, None, 1] - c[:, 1]) ** 2 - w
+    lab: NDArray[np.intp] = np.argmin(d, axis=1)
+    return lab
+
+
+def _seeds(pts: NDArray[np.float64], k: int, near: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Начальные центры: самые удалённые друг от друга образцы, затем k-means."""
+    idx = [int(np.argmin(np.hypot(*(pts - near).T)))]
+    dist = np.hypot(*(pts - pts[idx[0]]).T)
+    for _ in range(k - 1):
+        idx.append(int(np.argmax(dist)))
+        dist = np.minimum(dist, np.hypot(*(pts - pts[idx[-1]]).T))
+    c = pts[idx].copy()
+    for _ in range(_KMEANS_ITERS):
+        lab = _assign(pts, c, np.zeros(k))
+        for j in range(k):
+            if (lab == j).any():
+                c[j] = pts[lab == j].mean(axis=0)
+    return c
+
+
+def _power_cell(
+    k: int, c: NDArray[np.float64], w: NDArray[np.float64], box: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Ячейка k power diagram внутри выпуклого многоугольника `box` (Сазерленд — Ходжман)."""
+    poly = box
+    for j in range(len(c)):
+        if j == k or not len(poly):
+            continue
+        # 2x·(c_j - c_k) ≤ |c_j|² - |c_k|² - w_j + w_k
+        n = 2 * (c[j] - c[k])
+        b = c[j] @ c[j] - c[k] @ c[k] - w[j] + w[k]
+        s = poly @ n - b
+        nxt = np.roll(poly, -1, axis=0)
+        s_nxt = np.roll(s, -1)
+        out = []
+        for p, q, sp, sq in zip(poly, nxt, s, s_nxt):
+            if sp <= 0:
+                out.append(p)
+            if (sp < 0) != (sq < 0) and sp != sq:
+                out.append(p + (q - p) * (sp / (sp - sq)))
+        poly = np.array(out).reshape(-1, 2)
+    return poly
+
+
+def partition_aoi(
+    geom: BaseGeometry,
+    launch_xy: ArrayLike,
+    *,
+    swath_m: float,
+    iterations: int = 100,
+    tolerance: float = 0.02,
+) -> List[BaseGeometry]:
+    """
+    Части AOI (локальные метры) для дронов со стартами `launch_xy` (K, 2), в том же порядке.
+
+    `swath_m` — расстояние между галсами: переводит площадь в длину пролёта.
+    Балансировка останавливается, когда нагрузки расходятся не больше чем на
+    `tolerance` от средней, или через `iterations` шагов.
+    """
+    launch = np.asarray(launch_xy, dtype=np.float64).reshape(-1, 2)
+    k = len(launch)
+    if k == 0:
+        return []
+    if k == 1 or geom.is_empty:
+        return [geom] + [Polygon()] * (k - 1)
+
+    pts = _samples(geom, _SAMPLES)
+    cell_area = geom.area / len(pts)
+    c = _seeds(pts, k, launch.mean(axis=0))
+    # какой центр кому: минимум суммарного перелёта от стартов
+    _, cols = linear_sum_assignment(np.hypot(*(launch[:, None] - c[None]).transpose(2, 0, 1)))
+    c = c[cols]
+
+    w = np.zeros(k)
+    scale = geom.area / k
+    for _ in range(iterations):
+        lab = _assign(pts, c, w)
+        counts = np.bincount(lab, minlength=k)
+        load = counts * cell_area / swath_m + 2 * np.hypot(*(launch - c).T)
+        err = (load - load.mean()) / load.mean()
+        if np.abs(err).max() <= tolerance:
+            break
+        w -= _STEP * err * scale
+        for j in np.flatnonzero(counts):
+            c[j] = pts[lab == j].mean(axis=0)
+
+    x0, y0, x1, y1 = geom.bounds
+    pad = max(x1 - x0, y1 - y0)
+    box = np.array(
+        [[x0 - pad, y0 - pad], [x1 + pad, y0 - pad], [x1 + pad, y1 + pad], [x0 - pad, y1 + pad]]
+    )
+    parts = []
+    for j in range(k):
+        cell = _power_cell(j, c, w, box)
+        parts.append(geom.intersection(Polygon(cell)) if len(cell) >= 3 else Polygon())
+    return parts
+
+
+__all__ = ["partition_aoi"]
@@ -0,0 +1,122 @@
+"""
+Кэш готовых планов полёта с адресацией по содержимому.
+
+Ключ — SHA-256 от нормализованного WKT AOI, параметров камеры/сетки/энергии,
+настроек упорядочивания и mtime файла запретных зон. Планы лежат в LRU в
+памяти и JSON-файлами `<key>.json` на диске (по умолчанию `data/artifacts/plan_cache`),
+поэтому повторный и переоткрытый план возвращается без пересчёта.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Mapping, Tuple
+
+import shapely
+from shapely import wkt
+from shapely.geometry.base import BaseGeometry
+
+from fire_uav.module_core.route.no_fly import resolve_no_fly_path
+
+log = logging.getLogger(__name__)
+
+WaypointT = Tuple[float, float, float]  # lat, lon, alt
+Missions = List[List[WaypointT]]
+
+_KEY_VERSION = 1  # менять при изменении алгоритма планирования
+_WKT_PRECISION = 9  # знаков после запятой: ~0.1 мм, убирает шум сериализации
+
+
+def normalized_wkt(geom: BaseGeometry | str) -> str:
+    """Каноничный WKT: порядок и направление колец, начальная вершина, округление."""
+    if isinstance(geom, str):
+        geom = wkt.loads(geom)
+    return wkt.dumps(shapely.normalize(geom), rounding_precision=_WKT_PRECISION)
+
+
+def no_fly_stamp(path: str | Path) -> List[Any]:
+    """Путь, mtime и размер файла запретных зон (пустой список — файла нет)."""
+    target = resolve_no_fly_path(path) if path else None
+    if target is None:
+        return []
+    st = target.stat()
+    return [str(target.resolve()), st.st_mtime_ns, st.st_size]
+
+
+def plan_key(geom: BaseGeometry | str, params: Mapping[str, Any], no_fly_path: str | Path) -> str:
+    """Ключ плана: AOI + параметры (JSON-сериализуемые) + состояние файла NFZ."""
+    payload = {
+        "v": _KEY_VERSION,
+        "aoi": normalized_wkt(geom),
+        "params": params,
+        "no_fly": no_fly_stamp(no_fly_path),
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """LRU в памяти поверх каталога JSON-файлов (`root=None` — только память)."""
+
+    def __init__(self, root: str | Path | None = None, *, max_entries: int = 32) -> None:
+        self.root = Path(root) if root is not None else None
+        self.max_entries = max(1, max_entries)
+        self._mem: OrderedDict[str, Missions] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._mem)
+
+    def _file(self, key: str) -> Path | None:
+        return self.root / f"{key}.json" if self.root is not None else None
+
+    def get(self, key: str) -> Missions | None:
+        missions = self._mem.get(key)
+        if missions is not None:
+            self._mem.move_to_end(key)
+            return missions
+        fn = self._file(key)
+        if fn is None or not fn.is_file():
+            return None
+        try:
+            data = json.loads(fn.read_text(encoding="utf-8"))
+            missions = [[tuple(wp) for wp in ms] for ms in data["missions"]]
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            log.warning("Ignoring broken plan cache entry %s: %s", fn, exc)
+            return None
+        self._remember(key, missions)
+        return missions
+
+    def put(self, key: str, missions: Missions) -> None:
+        missions = [[tuple(wp) for wp in ms] for ms in missions]
+        self._remember(key, missions)
+        fn = self._file(key)
+        if fn is None:
+            return
+        try:
+            fn.parent.mkdir(parents=True, exist_ok=True)
+            # запись через временный файл: параллельный читатель не увидит половину JSON
+            fd, tmp = tempfile.mkstemp(dir=fn.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"missions": missions}, fh)
+            os.replace(tmp, fn)
+        except OSError as exc:
+            log.warning("Could not write plan cache entry %s: %s", fn, exc)
+
+    def clear(self) -> None:
+        """Очистить память (файлы на диске остаются)."""
+        self._mem.clear()
+
+    def _remember(self, key: str, missions: Missions) -> None:
+        self._mem[key] = missions
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+
+__all__ = ["Missions", "PlanCache", "WaypointT", "normalized_wkt", "no_fly_stamp", "plan_key"]
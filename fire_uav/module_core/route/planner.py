@@ -6,30 +6,46 @@ from __future__ import annotations
 
 import logging
 import math
-from dataclasses import dataclass
-from typing import List, Tuple
-
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import shapely
+from numpy.typing import NDArray
 from shapely import wkt
-from shapely.affinity import rotate
-from shapely.geometry import GeometryCollection, LineString, MultiLineString, Point, Polygon
+from shapely.geometry import LineString, Polygon
+from shapely.geometry.base import BaseGeometry
 
 from fire_uav.cpp import follow_path
 from fire_uav.module_core.geometry import haversine_m
 from fire_uav.module_core.route.energy import EnergyModel
-from fire_uav.module_core.route.no_fly import load_no_fly
+from fire_uav.module_core.route.local_frame import LocalFrame
+from fire_uav.module_core.route.local_search import improve_tour
+from fire_uav.module_core.route.no_fly import subtract_no_fly
+from fire_uav.module_core.route.orientation import OrientationChoice, best_orientation
+from fire_uav.module_core.route.ordering import ROUTE_ORDERINGS, follow_order, order_segments
+from fire_uav.module_core.route.partition import partition_aoi
+from fire_uav.module_core.route.plan_cache import PlanCache, plan_key
+from fire_uav.module_core.route.sweep import Sweep, sweep_anchor, sweep_polygon
+from fire_uav.module_core.route.tsp import HAVE_ORTOOLS, distance_matrix, solve_path
 from fire_uav.module_core.schema import Waypoint as WaypointModel
 from fire_uav.module_core.settings_loader import load_settings
 
 # ← читаем настройки единожды
 settings = load_settings()
 
-try:
-    from ortools.constraint_solver import pywrapcp, routing_enums_pb2
-except ImportError as e:
-    raise RuntimeError("Install `ortools` to use FlightPlanner") from e
-
 _log = logging.getLogger(__name__)
 
+# ortools — OR-Tools (с тёплым стартом из local_search), local_search — только NumPy
+ROUTE_OPTIMIZERS = ("ortools", "local_search")
+_WARM_START_SHARE = 0.2  # доля лимита времени на NumPy-тёплый старт перед OR-Tools
+_FLOWN_GAP_TOL = 1.01  # пара точек — один галс, если шаг ≤ forward_spacing с запасом
+
 
 # ─────────────────────── dataclasses ──────────────────────── #
 
@@ -54,6 +70,7 @@ class GridParams:
 
 
 Waypoint = WaypointModel
+WaypointT = Tuple[float, float, float]  # lat, lon, alt
 
 
 # ───────────────────────── FlightPlanner ───────────────────── #
@@ -66,22 +83,47 @@ class FlightPlanner:
         cam: CameraSpec | None = None,
         grid: GridParams | None = None,
         energy: EnergyModel | None = None,
+        ordering: str | None = None,
+        optimizer: str | None = None,
     ):
-        # вычитаем запретные зоны
-        nfz = load_no_fly(settings.get("no_fly_geojson", ""))
-        if nfz:
-            aoi = aoi.difference(nfz)
-
+        aoi = self._without_no_fly(aoi)
         self.aoi = aoi
+        # сетка строится в метрах в локальной ENU-плоскости вокруг AOI
+        self.frame = LocalFrame.around(aoi)
+        self.aoi_local = self.frame.geom_to_local(aoi)
         self.cam = cam or CameraSpec()
         self.grid = grid or GridParams()
         self.energy = energy or EnergyModel()
+        # segments — порядок галсов (быстро), tsp — OR-Tools по всем точкам съёмки
+        self.ordering = ordering or settings.get("route_ordering", "segments")
+        if self.ordering not in ROUTE_ORDERINGS:
+            raise ValueError(
+                f"route_ordering must be one of {ROUTE_ORDERINGS}, got {self.ordering!r}"
+            )
+        self.optimizer = optimizer or settings.get("route_optimizer", "ortools")
+        if self.optimizer not in ROUTE_OPTIMIZERS:
+            raise ValueError(
+                f"route_optimizer must be one of {ROUTE_OPTIMIZERS}, got {self.optimizer!r}"
+            )
+        if self.optimizer == "ortools" and not HAVE_ORTOOLS:
+            _log.warning("ortools is not installed, using the NumPy local-search optimizer")
+            self.optimizer = "local_search"
 
         self.altitude_m = self._altitude_for_gsd(self.grid.gsd_target_cm)
         self.line_spacing_m = self._line_spacing()
         self.forward_spacing_m = self._forward_spacing()
 
+        # состояние для перепланирования (`replan`)
+        self.last_sweep: Sweep | None = None  # галсы последнего плана в порядке пролёта
+        self.covered_local: BaseGeometry = Polygon()  # отснятая площадь, метры
+        self._anchor: tuple | None = None  # (orientation_deg, sweep_anchor)
+
     # ───── helpers ───── #
+    @staticmethod
+    def _without_no_fly(aoi: BaseGeometry) -> BaseGeometry:
+        """AOI за вычетом запретных зон (кэш и STRtree — в `route.no_fly`)."""
+        return subtract_no_fly(aoi, settings.get("no_fly_geojson", ""))
+
     def _altitude_for_gsd(self, gsd_cm: float) -> float:
         """Высота (м) для заданного GSD (см/пикс)."""
         return (
@@ -98,133 +140,258 @@ class FlightPlanner:
         return self.cam.swath_m(self.altitude_m) * (1 - self.grid.front_overlap)
 
     # ───── grid ───── #
+    def sweep(self, geom: BaseGeometry | None = None) -> Sweep:
+        """
+        Галсы в метрах локальной плоскости (векторный scan-line, см. `route.sweep`).
+        `geom` — часть AOI (метры): режется той же сеткой строк, что и весь AOI.
+        """
+        return sweep_polygon(
+            self.aoi_local if geom is None else geom,
+            self.line_spacing_m,
+            self.grid.orientation_deg,
+            anchor=self._sweep_anchor(),
+        )
+
+    def _sweep_anchor(self) -> tuple:
+        """Сетка строк фиксируется по исходному AOI при первом построении галсов."""
+        angle = self.grid.orientation_deg
+        if self._anchor is None or self._anchor[0] != angle:
+            self._anchor = (angle, sweep_anchor(self.aoi_local, angle))
+        return self._anchor[1]
+
     def build_grid(self) -> List[LineString]:
         """
-        Генерирует гребёнчатую сетку.
-        Шаг задаётся в метрах, но пересчитывается в градусы.
+        Генерирует гребёнчатую сетку (зиг-заг) как LineString в lon/lat.
+        Галсы строятся в метрах, в lon/lat переводятся одним проходом.
+        """
+        return self.sweep().to_lines(self.frame)
+
+    def optimise_orientation(self) -> OrientationChoice:
+        """
+        Выбирает угол галсов с минимальной оценкой времени полёта (`route.orientation`)
+        и ставит его в `grid.orientation_deg` (переданный `GridParams` не меняется).
         """
-        rot = rotate(
-            self.aoi,
-            -self.grid.orientation_deg,
-            origin="centroid",
-            use_radians=False,
+        choice = best_orientation(
+            self.aoi_local,
+            self.line_spacing_m,
+            self.energy,
+            baseline_deg=self.grid.orientation_deg,
+            coarse_step_deg=float(settings.get("route_orientation_step_deg", 15.0)),
         )
-        minx, miny, maxx, maxy = rot.bounds
-
-        step_deg = self.line_spacing_m / 111_000  # метр → градус
-        lines: list[LineString] = []
-        y = miny
-        while y <= maxy:
-            seg = LineString([(minx, y), (maxx, y)])
-            inter = seg.intersection(rot)
-            if not inter.is_empty:
-                if isinstance(inter, LineString):
-                    lines.append(inter)
-                elif isinstance(inter, MultiLineString):
-                    lines.extend(inter.geoms)
-                elif isinstance(inter, GeometryCollection):
-                    lines.extend(g for g in inter.geoms if isinstance(g, LineString))
-            y += step_deg
-
-        # возвращаем исходный угол
-        lines = [
-            rotate(line, self.grid.orientation_deg, origin="centroid", use_radians=False)
-            for line in lines
-        ]
-        # зиг-заг
-        for i in range(1, len(lines), 2):
-            lines[i] = LineString(list(lines[i].coords)[::-1])
-        return lines
+        self.grid = replace(self.grid, orientation_deg=choice.angle_deg)
+        _log.info("Orientation search: %s", choice.summary())
+        return choice
 
     # ───── lines → waypoints ───── #
     def lines_to_waypoints(self, lines: List[LineString]) -> List[Waypoint]:
         """
-        Превращает линии в точки съёмки.
-        Шаг снова переводится в градусы, чтобы «кадров» стало адекватно.
+        Превращает линии в точки съёмки с шагом `forward_spacing_m` (в метрах).
         """
-        step_deg = self.forward_spacing_m / 111_000  # ≈ град/шаг
-        wps: list[Waypoint] = []
-        for ln in lines:
-            length_deg = ln.length  # длина в °
-            n = max(2, math.ceil(length_deg / step_deg))
-            for i in range(n):
-                pt: Point = ln.interpolate(i / (n - 1), normalized=True)
-                wps.append(Waypoint(lat=pt.y, lon=pt.x, alt=self.altitude_m))
-        return wps
+        if not lines:
+            return []
+        local = self.frame.geom_to_local(np.array(lines, dtype=object))
+        # n точек дают n - 1 промежутков: ни один не длиннее forward_spacing_m
+        counts = np.ceil(shapely.length(local) / self.forward_spacing_m).astype(np.intp) + 1
+        counts = np.maximum(counts, 2)
+        # доли длины 0 … 1 для всех линий сразу
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        frac = (np.arange(counts.sum()) - starts) / np.repeat(counts - 1, counts)
+        pts = shapely.line_interpolate_point(np.repeat(local, counts), frac, normalized=True)
+        return self._to_waypoints(shapely.get_coordinates(pts))
+
+    def _to_waypoints(self, xy: NDArray[np.float64]) -> List[Waypoint]:
+        lons, lats = self.frame.to_geo(xy[:, 0], xy[:, 1])
+        return [
+            Waypoint(lat=lat, lon=lon, alt=self.altitude_m)
+            for lat, lon in zip(lats.tolist(), lons.tolist())
+        ]
 
     # ───── TSP ───── #
     def optimise(self, wps: List[Waypoint]) -> List[Waypoint]:
         """
-        Упорядочивает точки по кратчайшему маршруту (TSP через OR-Tools).
+        Упорядочивает точки по кратчайшему маршруту за `route_tsp_time_limit_s`.
+
+        `local_search` — ближайший сосед + 2-opt/Or-opt на NumPy; `ortools` — тот же
+        обход как тёплый старт, затем OR-Tools по матрице расстояний в локальных метрах.
+        Лимит общий: время на тёплый старт и матрицу вычитается из доли OR-Tools.
+        Больше `route_ortools_max_nodes` точек — только `local_search`: подготовка
+        полной матрицы для OR-Tools растёт как N² и сама не укладывается в лимит.
         """
         n = len(wps)
         if n <= 3:
             return wps
 
-        # матрица расстояний
-        dist = [[0] * n for _ in range(n)]
-        for i in range(n):
-            for j in range(i + 1, n):
-                d = int(haversine_m((wps[i].lat, wps[i].lon), (wps[j].lat, wps[j].lon)))
-                dist[i][j] = dist[j][i] = d
-
-        mgr = pywrapcp.RoutingIndexManager(n, 1, 0)
-        rt = pywrapcp.RoutingModel(mgr)
+        started = time.perf_counter()
+        x, y = self.frame.to_local([wp.lon for wp in wps], [wp.lat for wp in wps])
+        xy = np.column_stack([x, y])
+        limit = float(settings.get("route_tsp_time_limit_s", 5.0))
+        optimizer = self.optimizer
+        max_nodes = int(settings.get("route_ortools_max_nodes", 1000))
+        if optimizer == "ortools" and 0 < max_nodes < n:
+            _log.info("%d waypoints > route_ortools_max_nodes=%d: using local search", n, max_nodes)
+            optimizer = "local_search"
+        if optimizer == "local_search":
+            left = limit - (time.perf_counter() - started)
+            order = improve_tour(xy, start=0, time_budget_s=left).tolist()
+        else:
+            warm = improve_tour(xy, start=0, time_budget_s=limit * _WARM_START_SHARE).tolist()
+            cost = distance_matrix(xy)
+            order = solve_path(
+                cost,
+                start=0,
+                time_limit_s=limit - (time.perf_counter() - started),
+                initial=warm,
+            )
+            if order is None:
+                order = warm
+        return [wps[i] for i in order]
 
-        cb = rt.RegisterTransitCallback(lambda a, b: dist[mgr.IndexToNode(a)][mgr.IndexToNode(b)])
-        rt.SetArcCostEvaluatorOfAllVehicles(cb)
+    # ───── разделение по батареям ───── #
+    def split_missions(
+        self, ordered: List[Waypoint], home: Tuple[float, float] | None = None
+    ) -> List[List[Waypoint]]:
+        """
+        Разбивает длинный маршрут на миссии по ёмкости аккумулятора.
 
-        p = pywrapcp.DefaultRoutingSearchParameters()
-        p.time_limit.seconds = 5
-        p.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        Энергия — общая модель `energy.route_cost` (дистанция, набор высоты,
+        развороты) с резервом `reserve_fraction`; при заданном `home` (lat, lon)
+        в каждую миссию входят перелёт от дома и возврат домой.
+        """
+        if not ordered:
+            return []
+        bounds = self.energy.split_points(
+            [wp.lat for wp in ordered],
+            [wp.lon for wp in ordered],
+            [wp.alt for wp in ordered],
+            home,
+        )
+        return [ordered[a:b] for a, b in bounds]
 
-        sol = rt.SolveWithParameters(p)
-        if not sol:
-            return wps
+    # ───── pipeline ───── #
+    def generate(self, home: Tuple[float, float] | None = None) -> List[List[Waypoint]]:
+        """
+        Полный план AOI. `home` — точка старта (lat, lon): маршрут начинается
+        с ближайшего к ней конца.
+        """
+        sweep = self.sweep()
+        self.covered_local = Polygon()
+        if self.ordering == "segments":
+            sweep = order_segments(sweep)
+            xy, _ = sweep.photo_points(self.forward_spacing_m)
+            ordered = self._to_waypoints(xy)
+        else:
+            xy, _ = sweep.photo_points(self.forward_spacing_m)
+            ordered = self.optimise(self._to_waypoints(xy))
+        if home is not None and len(ordered) > 1:
+            first, last = (ordered[0].lat, ordered[0].lon), (ordered[-1].lat, ordered[-1].lon)
+            if haversine_m(home, last) < haversine_m(home, first):
+                ordered.reverse()
+                sweep = sweep.reversed()
+        self.last_sweep = sweep
+        return self.split_missions(ordered, home)
+
+    # ───── перепланирование ───── #
+    def flown_footprint(self, flown: Sequence[Waypoint | WaypointT] | BaseGeometry) -> BaseGeometry:
+        """
+        Отснятая площадь в локальных метрах.
 
-        route: list[Waypoint] = []
-        idx = rt.Start(0)
-        while not rt.IsEnd(idx):
-            route.append(wps[mgr.IndexToNode(idx)])
-            idx = sol.Value(rt.NextVar(idx))
-        return route
+        `flown` — пройденные точки съёмки (Waypoint или (lat, lon, alt)) в порядке
+        пролёта либо готовый контур покрытия в lon/lat. Для точек покрытием считается
+        полоса шириной `line_spacing_m` вдоль пар соседних точек одного галса
+        (шаг ≤ `forward_spacing_m`, направление вдоль галсов); перелёты между галсами
+        не засчитываются.
+        """
+        if isinstance(flown, BaseGeometry):
+            return self.frame.geom_to_local(flown)
+        if len(flown) < 2:
+            return Polygon()
+        lat = [wp.lat if isinstance(wp, WaypointModel) else wp[0] for wp in flown]
+        lon = [wp.lon if isinstance(wp, WaypointModel) else wp[1] for wp in flown]
+        xy = np.column_stack(self.frame.to_local(lon, lat))
+        d = np.diff(xy, axis=0)
+        a = math.radians(self.grid.orientation_deg)
+        along = np.abs(d @ [math.cos(a), math.sin(a)])
+        across = np.abs(d @ [-math.sin(a), math.cos(a)])
+        same_line = (along <= self.forward_spacing_m * _FLOWN_GAP_TOL) & (
+            across <= 0.01 * self.line_spacing_m
+        )
+        same_line &= along > 0
+        if not same_line.any():
+            return Polygon()
+        # непрерывные серии таких пар — пройденные куски галсов (от первой до последней точки)
+        edge = np.diff(np.concatenate([[0], same_line.astype(np.int8), [0]]))
+        first, last = np.flatnonzero(edge == 1), np.flatnonzero(edge == -1)
+        strips = shapely.buffer(
+            shapely.linestrings(np.stack([xy[first], xy[last]], axis=1)),
+            self.line_spacing_m / 2,
+            cap_style="flat",
+        )
+        return shapely.union_all(strips)
 
-    # ───── разделение по батареям ───── #
-    def split_missions(self, ordered: List[Waypoint]) -> List[List[Waypoint]]:
+    def replan(
+        self,
+        flown: Sequence[Waypoint | WaypointT] | BaseGeometry,
+        aoi: Polygon | None = None,
+    ) -> List[List[Waypoint]]:
         """
-        Разбивает длинный маршрут на миссии по ёмкости аккумулятора.
+        Инкрементальный план: только ещё не отснятая часть AOI.
+
+        Покрытие `flown` (см. `flown_footprint`) копится между вызовами и вычитается
+        из AOI; `aoi` — отредактированный AOI в lon/lat (локальная плоскость и сетка
+        строк остаются прежними). Остаток режется галсами той же ориентации и фазы,
+        что и исходный план, и летится в прежнем порядке (`ordering.follow_order`) —
+        без повторного решения TSP; если появились новые строки, порядок галсов
+        строится заново (`order_segments`).
         """
-        missions: list[list[Waypoint]] = []
-        cur: list[Waypoint] = []
-        dist: float = 0.0
-        prev: Waypoint | None = None
+        if aoi is not None:
+            self._sweep_anchor()  # сетка строк — по исходному AOI
+            self.aoi = self._without_no_fly(aoi)
+            self.aoi_local = self.frame.geom_to_local(self.aoi)
+        self.covered_local = self.covered_local.union(self.flown_footprint(flown))
+        sweep = self.sweep(self.aoi_local.difference(self.covered_local))
+
+        ordered = None
+        if self.last_sweep is not None:
+            ordered = follow_order(sweep, self.last_sweep)
+        if ordered is None:
+            ordered = order_segments(sweep)
+        self.last_sweep = ordered
+        xy, _ = ordered.photo_points(self.forward_spacing_m)
+        return self.split_missions(self._to_waypoints(xy))
 
-        for wp in ordered:
-            if prev:
-                dist += haversine_m((prev.lat, prev.lon), (wp.lat, wp.lon))
-            cur.append(wp)
-            prev = wp
 
-            if self.energy.energy_used_wh(dist) >= self.energy.battery_wh * 0.9:
-                missions.append(cur)
-                cur, dist, prev = [], 0.0, None
+# ───────── API-обёртка для GUI ───────── #
 
-        if cur:
-            missions.append(cur)
-        return missions
 
-    # ───── pipeline ───── #
-    def generate(self) -> List[List[Waypoint]]:
-        grid = self.build_grid()
-        wps = self.lines_to_waypoints(grid)
-        ordered = self.optimise(wps)
-        return self.split_missions(ordered)
+_plan_cache: PlanCache | None = None
 
 
-# ───────── API-обёртка для GUI ───────── #
+def default_plan_cache() -> PlanCache:
+    """Кэш планов по настройкам `plan_cache_dir` (null — только память) и `plan_cache_size`."""
+    global _plan_cache
+    if _plan_cache is None:
+        root = settings.get("plan_cache_dir", "data/artifacts/plan_cache")
+        if root and not Path(root).is_absolute():
+            import fire_uav
 
+            root = Path(fire_uav.__file__).resolve().parent.parent / root
+        _plan_cache = PlanCache(root or None, max_entries=int(settings.get("plan_cache_size", 32)))
+    return _plan_cache
 
-WaypointT = Tuple[float, float, float]  # lat, lon, alt
+
+def _plan_params(cam: CameraSpec, grid: GridParams, energy: EnergyModel) -> dict:
+    """Всё, от чего зависит результат `FlightPlanner.generate`, кроме AOI и NFZ."""
+    return {
+        "camera": asdict(cam),
+        "grid": asdict(grid),
+        "energy": asdict(energy),
+        "ordering": settings.get("route_ordering", "segments"),
+        "optimizer": settings.get("route_optimizer", "ortools"),
+        "tsp_time_limit_s": settings.get("route_tsp_time_limit_s", 5.0),
+        "ortools_max_nodes": settings.get("route_ortools_max_nodes", 1000),
+        "orientation_search": settings.get("route_orientation_search", True),
+        "orientation_step_deg": settings.get("route_orientation_step_deg", 15.0),
+    }
 
 
 def build_route(geom_wkt: str, gsd_cm: int = 0) -> List[List[WaypointT]]:
@@ -233,6 +400,7 @@ def build_route(geom_wkt: str, gsd_cm: int = 0) -> List[List[WaypointT]]:
 
       • LineString → возвращает точный путь (`follow_path`, alt = 120 м)
       • Polygon    → генерирует lawn-mower сетку через `FlightPlanner`
+                     (результат кэшируется, см. `route.plan_cache`)
 
     GUI вызывает именно эту функцию.
     """
@@ -248,9 +416,77 @@ def build_route(geom_wkt: str, gsd_cm: int = 0) -> List[List[WaypointT]]:
             return [[(lat, lon, 120.0) for lat, lon in path_latlon]]
 
     if geom.geom_type == "Polygon":
-        grid = GridParams(gsd_target_cm=gsd_cm) if gsd_cm else None
-        fp = FlightPlanner(geom, grid=grid)
-        missions = fp.generate()  # list[list[Waypoint]]
-        return [[(wp.lat, wp.lon, wp.alt) for wp in ms] for ms in missions]
+        cam = CameraSpec()
+        grid = GridParams(gsd_target_cm=gsd_cm) if gsd_cm else GridParams()
+        energy = EnergyModel()
+        cache = default_plan_cache()
+        key = plan_key(geom, _plan_params(cam, grid, energy), settings.get("no_fly_geojson", ""))
+        missions = cache.get(key)
+        if missions is None:
+            fp = FlightPlanner(geom, cam=cam, grid=grid, energy=energy)
+            if settings.get("route_orientation_search", True):
+                fp.optimise_orientation()
+            missions = [[(wp.lat, wp.lon, wp.alt) for wp in ms] for ms in fp.generate()]
+            cache.put(key, missions)
+        else:
+            _log.debug("Plan cache hit %s", key[:12])
+        return [list(ms) for ms in missions]
 
     raise ValueError("build_route: ожидался LineString или Polygon")
+
+
+# ───────── несколько БПЛА ───────── #
+
+
+def _plan_partition(part_wkt: str, gsd_cm: int, home: Tuple[float, float]) -> List[List[WaypointT]]:
+    """План одной части AOI (выполняется в процессе пула, аргументы — только простые типы)."""
+    part = wkt.loads(part_wkt)
+    if part.is_empty:
+        return []
+    grid = GridParams(gsd_target_cm=gsd_cm) if gsd_cm else GridParams()
+    fp = FlightPlanner(part, grid=grid)
+    if settings.get("route_orientation_search", True):
+        fp.optimise_orientation()
+    return [[(wp.lat, wp.lon, wp.alt) for wp in ms] for ms in fp.generate(home=home)]
+
+
+def build_fleet_routes(
+    geom_wkt: str,
+    launch_points: Sequence[Tuple[float, float]],
+    gsd_cm: int = 0,
+    *,
+    workers: int | None = None,
+) -> List[List[List[WaypointT]]]:
+    """
+    План для нескольких БПЛА: AOI (WKT Polygon) делится на сбалансированные части
+    (`route.partition`) по площади и перелёту от точек старта `launch_points`
+    ((lat, lon), по одной на дрон), каждая часть планируется в отдельном процессе.
+
+    Возвращает список миссий для каждого дрона в порядке `launch_points`.
+    `workers` (по умолчанию `fleet_plan_workers`, 0 — по числу CPU): 1 — без пула.
+    """
+    geom = wkt.loads(geom_wkt)
+    if geom.geom_type not in ("Polygon", "MultiPolygon"):
+        raise ValueError("build_fleet_routes: ожидался Polygon")
+    if not launch_points:
+        return []
+    grid = GridParams(gsd_target_cm=gsd_cm) if gsd_cm else GridParams()
+    fp = FlightPlanner(geom, grid=grid)
+    lats, lons = zip(*launch_points)
+    launch_xy = np.column_stack(fp.frame.to_local(lons, lats))
+    parts = partition_aoi(fp.aoi_local, launch_xy, swath_m=fp.line_spacing_m)
+    jobs = [
+        (fp.frame.geom_to_geo(part).wkt, gsd_cm, (float(home[0]), float(home[1])))
+        for part, home in zip(parts, launch_points)
+    ]
+
+    if workers is None:
+        workers = int(settings.get("fleet_plan_workers", 0))
+    workers = min(len(jobs), workers or os.cpu_count() or 1)
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_plan_partition, *zip(*jobs)))
+        except (OSError, BrokenProcessPool) as exc:
+            _log.warning("Process pool unavailable, planning partitions inline: %s", exc)
+    return [_plan_partition(*job) for job in jobs]
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, List
+from typing import Any, List, Sequence
 
 from fire_uav.config import settings as app_settings
 from fire_uav.module_core.factories import get_energy_model
 from fire_uav.module_core.interfaces.energy import IEnergyModel
 from fire_uav.module_core.interfaces.route_planner import IRoutePlanner
+from fire_uav.module_core.route.avoidance import nfz_avoider
 from fire_uav.module_core.route.maneuvers import build_maneuver, build_rejoin
 from fire_uav.module_core.schema import Route, TelemetrySample, Waypoint
-from fire_uav.module_core.route.planner import build_route
+from fire_uav.module_core.route.planner import build_fleet_routes, build_route
 
 
 class PythonRoutePlanner(IRoutePlanner):
@@ -25,6 +26,25 @@ class PythonRoutePlanner(IRoutePlanner):
         ]
         return Route(version=1, waypoints=wps, active_index=0 if wps else None)
 
+    def plan_fleet(
+        self,
+        geom_wkt: str,
+        launch_points: Sequence[tuple[float, float]],
+        gsd_cm: int | float = 0,
+    ) -> list[list[Route]]:
+        fleet = build_fleet_routes(geom_wkt, launch_points, int(gsd_cm) if gsd_cm else 0)
+        return [
+            [
+                Route(
+                    version=1,
+                    waypoints=[Waypoint(lat=lat, lon=lon, alt=alt) for (lat, lon, alt) in mission],
+                    active_index=0 if mission else None,
+                )
+                for mission in missions
+            ]
+            for missions in fleet
+        ]
+
     def plan_maneuver(
         self,
         current_state: TelemetrySample,
@@ -42,7 +62,11 @@ class PythonRoutePlanner(IRoutePlanner):
         )
 
     def plan_rejoin(self, exit_wp: Waypoint, base_route: Route) -> list[Waypoint]:
-        return build_rejoin(exit_wp, base_route)
+        avoider = nfz_avoider(
+            getattr(self.settings, "no_fly_geojson", None),
+            getattr(self.settings, "nfz_margin_m", 20.0),
+        )
+        return build_rejoin(exit_wp, base_route, avoider)
 
 
 __all__ = ["PythonRoutePlanner"]
@@ -0,0 +1,152 @@
+"""
+Векторная генерация галсов (scan-line / edge table) без цикла пересечений Shapely.
+
+Рёбра всех колец полигона (внешних и дыр) поворачиваются в систему галсов,
+для каждого ребра сразу вычисляется диапазон пересекаемых им строк сканирования,
+точки пересечения сортируются по (строка, x) и склеиваются попарно по правилу
+чёт-нечет. Координаты — метры локальной плоскости (`LocalFrame`).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+import shapely
+from numpy.typing import NDArray
+from shapely.geometry import LineString
+from shapely.geometry.base import BaseGeometry
+
+from fire_uav.module_core.route.local_frame import LocalFrame
+
+_EPS = 1e-9
+
+
+@dataclass(slots=True, frozen=True)
+class Sweep:
+    """Отрезки галсов: (M, 2) начала и концы в метрах, индекс строки сканирования."""
+
+    start: NDArray[np.float64]
+    end: NDArray[np.float64]
+    line: NDArray[np.intp]
+
+    def __len__(self) -> int:
+        return len(self.line)
+
+    def lengths(self) -> NDArray[np.float64]:
+        return np.hypot(*(self.end - self.start).T)
+
+    def photo_points(self, step_m: float) -> Tuple[NDArray[np.float64], NDArray[np.intp]]:
+        """
+        Точки съёмки вдоль отрезков: (N, 2) координаты и индекс отрезка каждой точки.
+        Концы отрезка входят, промежутки не длиннее `step_m`.
+        """
+        counts = np.ceil(self.lengths() / step_m).astype(np.intp) + 1
+        counts = np.maximum(counts, 2)
+        seg = np.repeat(np.arange(len(self)), counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        frac = (np.arange(counts.sum()) - starts) / (counts[seg] - 1)
+        pts = self.start[seg] + frac[:, None] * (self.end[seg] - self.start[seg])
+        return pts, seg
+
+    def reversed(self) -> "Sweep":
+        """Тот же маршрут в обратную сторону."""
+        return Sweep(self.end[::-1].copy(), self.start[::-1].copy(), self.line[::-1].copy())
+
+    def to_lines(self, frame: LocalFrame) -> List[LineString]:
+        """Отрезки как LineString в lon/lat (один векторный перевод координат)."""
+        lines = shapely.linestrings(np.stack([self.start, self.end], axis=1))
+        return list(frame.geom_to_geo(lines))
+
+
+def _rotation(angle_deg: float) -> NDArray[np.float64]:
+    a = math.radians(angle_deg)
+    return np.array([[math.cos(a), -math.sin(a)], [math.sin(a), math.cos(a)]])
+
+
+def _edges(geom: BaseGeometry) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Все рёбра колец (E, 2) → (E, 2): начала и концы."""
+    polys = shapely.get_parts(geom)
+    rings = np.concatenate([shapely.get_rings(p) for p in polys]) if len(polys) else []
+    coords, ring = shapely.get_coordinates(rings, return_index=True)
+    same = ring[:-1] == ring[1:]
+    return coords[:-1][same], coords[1:][same]
+
+
+def sweep_anchor(geom: BaseGeometry, angle_deg: float = 0.0) -> Tuple[Tuple[float, float], float]:
+    """
+    Привязка сетки галсов к полигону: центр поворота (центроид) и координата
+    первой строки (нижний край полигона в повёрнутой системе).
+    """
+    origin = np.array(geom.centroid.coords[0])
+    a, _ = _edges(geom)
+    y = (a - origin) @ _rotation(-angle_deg)[1]
+    return (float(origin[0]), float(origin[1])), float(y.min())
+
+
+def sweep_polygon(
+    geom: BaseGeometry,
+    spacing_m: float,
+    angle_deg: float = 0.0,
+    *,
+    zigzag: bool = True,
+    anchor: Tuple[Tuple[float, float], float] | None = None,
+) -> Sweep:
+    """
+    Галсы через (Multi)Polygon в метрах с шагом `spacing_m`.
+
+    Галсы идут вдоль оси X, повёрнутой на `angle_deg` против часовой вокруг
+    центроида; первая строка проходит по нижнему краю повёрнутого полигона.
+    `anchor` (см. `sweep_anchor`) задаёт сетку строк другого полигона: так остаток
+    AOI при перепланировании режется теми же галсами и с теми же номерами `line`.
+    При `zigzag` каждый нечётный отрезок развёрнут (как в прежнем `build_grid`).
+    """
+    empty = Sweep(np.empty((0, 2)), np.empty((0, 2)), np.empty(0, dtype=np.intp))
+    if geom.is_empty or spacing_m <= 0:
+        return empty
+
+    if anchor is None:
+        anchor = sweep_anchor(geom, angle_deg)
+    origin = np.array(anchor[0])
+    y0 = anchor[1]
+    rot = _rotation(-angle_deg)
+    a, b = _edges(geom)
+    a = (a - origin) @ rot.T
+    b = (b - origin) @ rot.T
+
+    # ребро пересекает строку y, если y ∈ [ymin, ymax): вершины не считаются дважды
+    y_lo = np.minimum(a[:, 1], b[:, 1])
+    y_hi = np.maximum(a[:, 1], b[:, 1])
+    k_lo = np.ceil((y_lo - y0) / spacing_m - _EPS).astype(np.intp)
+    k_hi = np.ceil((y_hi - y0) / spacing_m - _EPS).astype(np.intp)  # не включительно
+    counts = np.maximum(k_hi - k_lo, 0)
+    if not counts.any():
+        return empty
+
+    edge = np.repeat(np.arange(len(a)), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + k_lo[edge]
+    y = y0 + k * spacing_m
+    ax, ay, bx, by = a[edge, 0], a[edge, 1], b[edge, 0], b[edge, 1]
+    x = ax + (y - ay) * (bx - ax) / (by - ay)
+
+    order = np.lexsort((x, k))
+    x, y, k = x[order], y[order], k[order]
+    # на корректном полигоне пересечений на строке чётное число: [x0, x1], [x2, x3], …
+    x0, x1 = x[0::2], x[1::2]
+    ys, line = y[0::2], k[0::2]
+    keep = (k[0::2] == k[1::2]) & (x1 - x0 > _EPS)
+    x0, x1, ys, line = x0[keep], x1[keep], ys[keep], line[keep]
+
+    start = np.column_stack([x0, ys])
+    end = np.column_stack([x1, ys])
+    if zigzag:
+        odd = np.arange(len(line)) % 2 == 1
+        start[odd], end[odd] = end[odd].copy(), start[odd].copy()
+
+    back = _rotation(angle_deg)
+    return Sweep(start @ back.T + origin, end @ back.T + origin, line)
+
+
+__all__ = ["Sweep", "sweep_anchor", "sweep_polygon"]
@@ -46,7 +46,26 @@ def load_settings() -> Settings:
     return data
 
 
+def update_settings(updates: Settings, path: str | Path) -> Path:
+    """
+    Записывает ``updates`` поверх JSON с настройками ``path`` (пользовательского,
+    не встроенного settings_default.json); остальные ключи сохраняются.
+    Новые значения подхватываются при следующем запуске.
+    """
+    cfg_path = Path(path).expanduser()
+    data: Settings = {}
+    if cfg_path.is_file():
+        with cfg_path.open(encoding="utf-8") as fh:
+            data = json.load(fh)
+    data.update(updates)
+    cfg_path.parent.mkdir(parents=True, exist_ok=True)
+    with cfg_path.open("w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False, indent=2)
+        fh.write("\n")
+    return cfg_path
+
+
 # --------------------------------------------------------------------------- #
 #  Экспортируем символы, чтобы IDE / mypy «видели» их из-вне модуля
 # --------------------------------------------------------------------------- #
-__all__: list[str] = ["Settings", "load_settings"]
+__all__: list[str] = ["Settings", "load_settings", "update_settings"]
@@ -0,0 +1,3 @@
+from fire_uav.module_core.terrain.dem import DEMTile, DEMTileStore
+
+__all__ = ["DEMTile", "DEMTileStore"]
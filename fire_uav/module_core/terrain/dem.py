@@ -0,0 +1,255 @@
+"""
+Локальная цифровая модель рельефа (DEM) из плиток SRTM `.hgt` и GeoTIFF.
+
+Плитки открываются через memory-map: в память попадают только страницы,
+которых касаются запросы. Открытые плитки держатся в LRU (`max_open_tiles`),
+поэтому стоимость запроса не растёт с размером каталога плиток.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+tifffile: Any | None
+try:
+    import tifffile as _tifffile
+except ImportError:  # pragma: no cover
+    tifffile = None
+else:
+    tifffile = _tifffile
+
+log = logging.getLogger(__name__)
+
+_HGT_NAME = re.compile(r"^([NS])(\d{2})([EW])(\d{3})\.hgt$", re.IGNORECASE)
+_HGT_VOID = -32768
+
+# GeoTIFF теги и GeoKey
+_TAG_PIXEL_SCALE = 33550
+_TAG_TIEPOINT = 33922
+_TAG_GEOKEYS = 34735
+_TAG_GDAL_NODATA = 42113
+_KEY_MODEL_TYPE = 1024  # 2 = географическая СК
+_KEY_RASTER_TYPE = 1025  # 1 = PixelIsArea, 2 = PixelIsPoint
+
+
+@dataclass(slots=True, frozen=True)
+class DEMTile:
+    """Геопривязка плитки: центр пикселя (0, 0) и шаг сетки в градусах."""
+
+    path: Path
+    kind: str  # "hgt" | "tiff"
+    lat0: float  # широта центра первой (северной) строки
+    lon0: float  # долгота центра первого (западного) столбца
+    dlat: float  # > 0, строки идут на юг
+    dlon: float
+    rows: int
+    cols: int
+    nodata: float | None
+
+    @property
+    def lat_range(self) -> tuple[float, float]:
+        return self.lat0 - (self.rows - 1) * self.dlat, self.lat0
+
+    @property
+    def lon_range(self) -> tuple[float, float]:
+        return self.lon0, self.lon0 + (self.cols - 1) * self.dlon
+
+
+def _hgt_tile(path: Path) -> DEMTile | None:
+    match = _HGT_NAME.match(path.name)
+    if match is None:
+        return None
+    ns, lat, ew, lon = match.groups()
+    lat_sw = int(lat) * (1 if ns.upper() == "N" else -1)
+    lon_sw = int(lon) * (1 if ew.upper() == "E" else -1)
+    samples = math.isqrt(path.stat().st_size // 2)
+    if samples < 2 or samples * samples * 2 != path.stat().st_size:
+        log.warning("Skipping %s: not a square int16 .hgt grid", path)
+        return None
+    step = 1.0 / (samples - 1)
+    # строка 0 — северный край ячейки, отсчёты лежат ровно на её границах
+    return DEMTile(
+        path, "hgt", lat_sw + 1.0, float(lon_sw), step, step, samples, samples, _HGT_VOID
+    )
+
+
+def _tiff_tile(path: Path) -> DEMTile | None:
+    if tifffile is None:
+        log.warning("Skipping %s: install tifffile to read GeoTIFF DEM tiles", path)
+        return None
+    with tifffile.TiffFile(path) as tif:
+        page = tif.pages[0]
+        tags = page.tags
+        if _TAG_PIXEL_SCALE not in tags or _TAG_TIEPOINT not in tags:
+            log.warning("Skipping %s: no ModelPixelScale/ModelTiepoint georeferencing", path)
+            return None
+        scale = tags[_TAG_PIXEL_SCALE].value
+        tie = tags[_TAG_TIEPOINT].value
+        keys = tags[_TAG_GEOKEYS].value if _TAG_GEOKEYS in tags else ()
+        geokeys: Dict[int, int] = {
+            int(keys[i]): int(keys[i + 3]) for i in range(4, len(keys) - 3, 4) if keys[i + 1] == 0
+        }
+        if geokeys.get(_KEY_MODEL_TYPE, 2) != 2:
+            log.warning("Skipping %s: only geographic (lat/lon) GeoTIFFs are supported", path)
+            return None
+        nodata = None
+        if _TAG_GDAL_NODATA in tags:
+            try:
+                nodata = float(str(tags[_TAG_GDAL_NODATA].value).strip("\x00 "))
+            except ValueError:
+                nodata = None
+        rows, cols = page.shape[:2]
+
+    # Тайпоинт привязывает пиксель (I, J) к (lon, lat); для PixelIsArea это угол пикселя.
+    half = 0.5 if geokeys.get(_KEY_RASTER_TYPE, 1) == 1 else 0.0
+    i, j, lon, lat = float(tie[0]), float(tie[1]), float(tie[3]), float(tie[4])
+    dlon, dlat = float(scale[0]), float(scale[1])
+    lon0 = lon + (half - i) * dlon
+    lat0 = lat - (half - j) * dlat
+    return DEMTile(path, "tiff", lat0, lon0, dlat, dlon, rows, cols, nodata)
+
+
+class DEMTileStore:
+    """
+    Каталог плиток высот с пакетной билинейной интерполяцией.
+
+    `.hgt` ищутся по имени (N55E037.hgt → ячейка 1°×1°), GeoTIFF — по
+    своей геопривязке (нужен `tifffile`, поддерживаются плитки в lat/lon).
+    Точки без покрытия или попавшие на void получают NaN.
+    """
+
+    def __init__(self, root: str | Path, *, max_open_tiles: int = 16) -> None:
+        self.root = Path(root)
+        self.max_open_tiles = max(1, max_open_tiles)
+        self._hgt: Dict[tuple[int, int], DEMTile] = {}
+        self._tiff: List[DEMTile] = []
+        self._open: OrderedDict[Path, NDArray] = OrderedDict()
+        if self.root.is_dir():
+            self._scan()
+        else:
+            log.warning("DEM directory %s does not exist", self.root)
+
+    def __len__(self) -> int:
+        return len(self._hgt) + len(self._tiff)
+
+    @property
+    def tiles(self) -> List[DEMTile]:
+        return [*self._hgt.values(), *self._tiff]
+
+    def _scan(self) -> None:
+        for path in sorted(self.root.rglob("*")):
+            suffix = path.suffix.lower()
+            if suffix == ".hgt":
+                tile = _hgt_tile(path)
+                if tile is not None:
+                    sw = (round(tile.lat0 - 1.0), round(tile.lon0))
+                    self._hgt[sw] = tile
+            elif suffix in (".tif", ".tiff"):
+                tile = _tiff_tile(path)
+                if tile is not None:
+                    self._tiff.append(tile)
+        log.info("DEM: %d .hgt, %d GeoTIFF tiles in %s", len(self._hgt), len(self._tiff), self.root)
+
+    # ------------------------------------------------------------------ #
+    def _data(self, tile: DEMTile) -> NDArray:
+        """Memory-mapped массив плитки из LRU (открывает при промахе)."""
+        data = self._open.get(tile.path)
+        if data is not None:
+            self._open.move_to_end(tile.path)
+            return data
+        if tile.kind == "hgt":
+            data = np.memmap(tile.path, dtype=">i2", mode="r", shape=(tile.rows, tile.cols))
+        else:
+            assert tifffile is not None  # GeoTIFF индексируются только при установленном tifffile
+            try:
+                data = tifffile.memmap(tile.path, mode="r")
+            except ValueError:
+                # сжатые/тайловые GeoTIFF не мапятся — декодируем целиком (LRU держит копию)
+                data = tifffile.imread(tile.path)
+            data = data.reshape(tile.rows, tile.cols, -1)[:, :, 0]
+        self._open[tile.path] = data
+        while len(self._open) > self.max_open_tiles:
+            self._open.popitem(last=False)
+        return data
+
+    def _sample(
+        self, tile: DEMTile, lats: NDArray[np.float64], lons: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        data = self._data(tile)
+        row = np.clip((tile.lat0 - lats) / tile.dlat, 0.0, tile.rows - 1)
+        col = np.clip((lons - tile.lon0) / tile.dlon, 0.0, tile.cols - 1)
+        r0 = np.minimum(row.astype(np.intp), max(tile.rows - 2, 0))
+        c0 = np.minimum(col.astype(np.intp), max(tile.cols - 2, 0))
+        r1 = np.minimum(r0 + 1, tile.rows - 1)
+        c1 = np.minimum(c0 + 1, tile.cols - 1)
+        fr = row - r0
+        fc = col - c0
+
+        z = np.stack([data[r0, c0], data[r0, c1], data[r1, c0], data[r1, c1]]).astype(np.float64)
+        if tile.nodata is not None:
+            z[z == tile.nodata] = np.nan
+        top = z[0] * (1 - fc) + z[1] * fc
+        bottom = z[2] * (1 - fc) + z[3] * fc
+        out: NDArray[np.float64] = top * (1 - fr) + bottom * fr
+        return out
+
+    @staticmethod
+    def _contains(
+        tile: DEMTile, lats: NDArray[np.float64], lons: NDArray[np.float64]
+    ) -> NDArray[np.bool_]:
+        lat_lo, lat_hi = tile.lat_range
+        lon_lo, lon_hi = tile.lon_range
+        if tile.kind == "tiff":
+            # крайние полпикселя PixelIsArea тоже покрыты
+            lat_lo, lat_hi = lat_lo - tile.dlat / 2, lat_hi + tile.dlat / 2
+            lon_lo, lon_hi = lon_lo - tile.dlon / 2, lon_hi + tile.dlon / 2
+        return (lats >= lat_lo) & (lats <= lat_hi) & (lons >= lon_lo) & (lons <= lon_hi)
+
+    def elevation(self, lats: ArrayLike, lons: ArrayLike) -> NDArray[np.float64]:
+        """Высоты (м) в точках (lats, lons) той же формы; NaN — нет данных."""
+        lat_arr = np.asarray(lats, dtype=np.float64)
+        lon_arr = np.asarray(lons, dtype=np.float64)
+        shape = np.broadcast(lat_arr, lon_arr).shape
+        lat_flat = np.broadcast_to(lat_arr, shape).ravel()
+        lon_flat = np.broadcast_to(lon_arr, shape).ravel()
+        out = np.full(lat_flat.shape, np.nan, dtype=np.float64)
+        pending = np.isfinite(lat_flat) & np.isfinite(lon_flat)
+
+        if self._hgt and pending.any():
+            idx = np.flatnonzero(pending)
+            # ячейка 1°×1° одним целым: (lat + 90) * 360 + (lon + 180)
+            cells = (np.floor(lat_flat[idx]) + 90) * 360 + (np.floor(lon_flat[idx]) + 180)
+            keys, inverse = np.unique(cells.astype(np.int64), return_inverse=True)
+            for k, key in enumerate(keys.tolist()):
+                lat_cell, lon_cell = divmod(key, 360)
+                tile = self._hgt.get((lat_cell - 90, lon_cell - 180))
+                if tile is None:
+                    continue
+                sel = idx[inverse == k]
+                out[sel] = self._sample(tile, lat_flat[sel], lon_flat[sel])
+                pending[sel] = False
+
+        for tile in self._tiff:
+            if not pending.any():
+                break
+            sel = np.flatnonzero(pending)
+            sel = sel[self._contains(tile, lat_flat[sel], lon_flat[sel])]
+            if len(sel):
+                out[sel] = self._sample(tile, lat_flat[sel], lon_flat[sel])
+                pending[sel] = False
+        return out.reshape(shape)
+
+    def elevation_at(self, lat: float, lon: float) -> float:
+        return float(self.elevation([lat], [lon])[0])
+
+
+__all__ = ["DEMTile", "DEMTileStore"]
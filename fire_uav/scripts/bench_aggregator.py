@@ -0,0 +1,101 @@
+# mypy: ignore-errors
+#!/usr/bin/env python3
+"""
+Микробенчмарк учёта событий в кластере DetectionAggregator: прежний `_Cluster`
+(пересчёт set(frame_id) и сумм по всему окну) против инкрементального.
+На каждое событие выполняются те же проверки, что и в `add_event`.
+
+    python -m fire_uav.scripts.bench_aggregator [--events 20000] [--windows 5 50 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Deque
+
+from fire_uav.module_core.detections.aggregator import DetectionEvent, _Cluster
+from fire_uav.module_core.schema import WorldCoord
+
+
+# ───────────── baseline: прежний _Cluster ───────────── #
+@dataclass
+class _LegacyCluster:
+    class_id: int
+    events: Deque[DetectionEvent] = field(default_factory=deque)
+
+    def add(self, event: DetectionEvent, maxlen: int) -> None:
+        self.events.append(event)
+        while len(self.events) > maxlen:
+            self.events.popleft()
+
+    def centroid(self) -> WorldCoord:
+        lat = sum(ev.location.lat for ev in self.events) / len(self.events)
+        lon = sum(ev.location.lon for ev in self.events) / len(self.events)
+        return WorldCoord(lat=lat, lon=lon)
+
+    def votes(self) -> int:
+        return len({ev.frame_id for ev in self.events})
+
+    def avg_conf(self) -> float:
+        return sum(ev.confidence for ev in self.events) / len(self.events)
+
+
+def make_events(n: int, seed: int = 0) -> list[DetectionEvent]:
+    rng = random.Random(seed)
+    t0 = datetime(2024, 1, 1)
+    return [
+        DetectionEvent(
+            class_id=0,
+            confidence=rng.uniform(0.3, 0.95),
+            location=WorldCoord(lat=55.7 + rng.gauss(0, 1e-4), lon=37.6 + rng.gauss(0, 1e-4)),
+            frame_id=f"f{i // 2}",
+            timestamp=t0 + timedelta(milliseconds=40 * i),
+        )
+        for i in range(n)
+    ]
+
+
+def run_legacy(events: list[DetectionEvent], window: int) -> float:
+    cluster = _LegacyCluster(class_id=0)
+    t = time.perf_counter()
+    for ev in events:
+        cluster.add(ev, window)
+        # как в прежнем add_event: avg_conf() считался дважды
+        if cluster.votes() >= 1 and cluster.avg_conf() >= 0.0:
+            cluster.centroid()
+            cluster.avg_conf()
+    return len(events) / (time.perf_counter() - t)
+
+
+def run_incremental(events: list[DetectionEvent], window: int) -> float:
+    cluster = _Cluster(class_id=0)
+    t = time.perf_counter()
+    for ev in events:
+        cluster.add(ev, window)
+        avg_conf = cluster.avg_conf()
+        if cluster.votes() >= 1 and avg_conf >= 0.0:
+            cluster.centroid()
+    return len(events) / (time.perf_counter() - t)
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--events", type=int, default=20000)
+    ap.add_argument("--windows", type=int, nargs="+", default=[5, 50, 500])
+    args = ap.parse_args(argv)
+
+    events = make_events(args.events)
+    print(f"{'window':>7} {'before ev/s':>12} {'after ev/s':>12} {'speedup':>8}")  # noqa: T201
+    for window in args.windows:
+        before = run_legacy(events, window)
+        after = run_incremental(events, window)
+        print(f"{window:>7} {before:>12.0f} {after:>12.0f} {after / before:>7.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# mypy: ignore-errors
+#!/usr/bin/env python3
+"""
+Бенчмарк бэкендов DetectionEngine: PyTorch (Ultralytics) против ONNX Runtime
+на одних и тех же кадрах — кадры/с и задержка вызова (p50/p95); с `--tiles`
+ещё и нарезанный инференс разными размерами тайла.
+
+    python -m fire_uav.scripts.bench_detector [--model data/models/best_yolo11.pt]
+        [--frames 40] [--batch 1] [--size 1280x720] [--threads 0] [--source video.mp4]
+        [--tiles 0 640 960]
+
+Без `--source` кадры синтетические (шум); первый запуск ONNX экспортирует модель
+рядом с весами, время экспорта в замер не входит. `--source` — видео, картинка
+или папка кадров; если у кадров папки есть разметка YOLO (`labels/*.txt`),
+печатаются ещё recall@0.5 и mAP@0.5 — выбор размера тайла «скорость против полноты».
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from fire_uav.config.settings import settings
+from fire_uav.module_core.detect.detection import DetectionEngine
+from fire_uav.module_core.detect.evaluate import list_images, load_labels, mean_average_precision
+from fire_uav.module_core.interfaces.detector import RawDetections
+
+_WARMUP = 3
+
+
+def load_frames(
+    source: str | None, n: int, size: tuple[int, int]
+) -> tuple[list[np.ndarray], list | None]:
+    """
+    n кадров из видео/картинки/папки или синтетических BGR кадров размера size (w, h)
+    и разметка кадров папки (None, если её нет).
+    """
+    if source and Path(source).is_dir():
+        paths = list_images(source, n)
+        frames = [cv2.imread(str(p)) for p in paths]
+        labels = [load_labels(p, f.shape[:2]) for p, f in zip(paths, frames)]
+        if all(lb is None for lb in labels):
+            return frames, None
+        empty = RawDetections(np.zeros((0, 4)), np.zeros(0), np.zeros(0, np.int64))
+        return frames, [lb if lb is not None else empty for lb in labels]
+    if source:
+        cap = cv2.VideoCapture(source)
+        frames = []
+        while len(frames) < n:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+        if frames:
+            return (frames * (n // len(frames) + 1))[:n], None
+    rng = np.random.default_rng(0)
+    w, h = size
+    return [rng.integers(0, 255, (h, w, 3), dtype=np.uint8) for _ in range(n)], None
+
+
+def run(
+    engine: DetectionEngine, frames: list[np.ndarray], batch: int, labels: list | None = None
+) -> dict[str, float]:
+    chunks = [frames[i : i + batch] for i in range(0, len(frames), batch)]
+    for chunk in chunks[:_WARMUP]:
+        engine.predict(chunk)
+    lat, preds = [], []
+    t0 = time.perf_counter()
+    for chunk in chunks:
+        t = time.perf_counter()
+        preds.extend(engine.predict(chunk))
+        lat.append(time.perf_counter() - t)
+    total = time.perf_counter() - t0
+    ms = np.asarray(lat) * 1e3
+    res = {
+        "fps": len(frames) / total,
+        "p50": float(np.percentile(ms, 50)),
+        "p95": float(np.percentile(ms, 95)),
+    }
+    if labels is not None:
+        res |= mean_average_precision(preds, labels)
+    return res
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--model", default=settings.yolo_model)
+    ap.add_argument("--frames", type=int, default=40)
+    ap.add_argument("--batch", type=int, default=1)
+    ap.add_argument("--size", default="1280x720", help="WxH синтетических кадров")
+    ap.add_argument("--threads", type=int, default=settings.onnx_intra_op_threads)
+    ap.add_argument("--source", default=None, help="видео, картинка или папка вместо шума")
+    ap.add_argument("--backends", nargs="+", default=["torch", "onnx"])
+    ap.add_argument("--tiles", nargs="+", type=int, default=[0], help="размеры тайла, 0 — кадр")
+    args = ap.parse_args(argv)
+
+    w, h = (int(v) for v in args.size.lower().split("x"))
+    frames, labels = load_frames(args.source, args.frames, (w, h))
+    settings.onnx_intra_op_threads = args.threads
+
+    head = f"{'backend':>8} {'tile':>5} {'frames/s':>9} {'p50 ms':>8} {'p95 ms':>8}"
+    print(head + (f" {'recall':>7} {'mAP50':>7}" if labels else ""))  # noqa: T201
+    base = None
+    for name in args.backends:
+        engine = DetectionEngine(args.model, backend=name, device="cpu")
+        for tile in args.tiles:
+            engine.tile_size = tile
+            res = run(engine, frames, args.batch, labels)
+            base = base or res["fps"]
+            line = (
+                f"{name:>8} {tile or '-':>5} {res['fps']:>9.2f} {res['p50']:>8.1f}"
+                f" {res['p95']:>8.1f}"
+            )
+            if labels:
+                line += f" {res['recall50']:>7.3f} {res['map50']:>7.3f}"
+            print(f"{line}  ({res['fps'] / base:.2f}x)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# mypy: ignore-errors
+#!/usr/bin/env python3
+"""
+Бенчмарк FlightPlanner на неправильном многоугольнике с озером заданной площади.
+
+* сетка: прежний цикл (LineString на каждую строку + `intersection` + `interpolate`
+  по точке) против векторного scan-line (`route.sweep`);
+* `--ordering`: порядок обхода `segments` (галсы) против `tsp` по всем точкам
+  съёмки с оптимизатором `ortools` и `local_search` — длина маршрута и время;
+* `--orientation`: подбор угла галсов (`route.orientation`) — угол, оценка времени
+  полёта против `--angle` и время поиска.
+
+    python -m fire_uav.scripts.bench_planner [--areas 1 5 20] [--gsd 2.5] [--ordering]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+import numpy as np
+from shapely.affinity import rotate, scale
+from shapely.geometry import GeometryCollection, LineString, MultiLineString, Point, Polygon
+
+from fire_uav.module_core.route.local_frame import LocalFrame
+from fire_uav.module_core.route.ordering import order_segments, path_length
+from fire_uav.module_core.route.planner import FlightPlanner, GridParams
+
+LAT0, LON0 = 56.0, 37.0
+
+
+def make_aoi(area_km2: float) -> Polygon:
+    """Звёздчатый полигон с дырой, площадь ≈ area_km2, в lon/lat."""
+    rng = np.random.default_rng(1)
+    ang = np.sort(rng.uniform(0, 2 * math.pi, 40))
+    rad = rng.uniform(0.7, 1.0, 40)
+    local = Polygon(np.column_stack([rad * np.cos(ang), rad * np.sin(ang)]))
+    local = local.difference(Point(0.2, 0.1).buffer(0.2))
+    k = math.sqrt(area_km2 * 1e6 / local.area)
+    local = scale(local, k, k, origin=(0, 0))
+    return LocalFrame(LAT0, LON0).geom_to_geo(local)
+
+
+def legacy_grid(fp: FlightPlanner) -> list[tuple[float, float]]:
+    """Прежний алгоритм в метрах: цикл по строкам и по точкам."""
+    rot = rotate(fp.aoi_local, -fp.grid.orientation_deg, origin="centroid")
+    minx, miny, maxx, maxy = rot.bounds
+    lines: list[LineString] = []
+    y = miny
+    while y <= maxy:
+        inter = LineString([(minx, y), (maxx, y)]).intersection(rot)
+        if isinstance(inter, LineString) and not inter.is_empty:
+            lines.append(inter)
+        elif isinstance(inter, (MultiLineString, GeometryCollection)):
+            lines.extend(g for g in inter.geoms if isinstance(g, LineString))
+        y += fp.line_spacing_m
+    lines = [rotate(ln, fp.grid.orientation_deg, origin=rot.centroid) for ln in lines]
+    pts = []
+    for ln in lines:
+        n = max(2, math.ceil(ln.length / fp.forward_spacing_m) + 1)
+        for i in range(n):
+            p = ln.interpolate(i / (n - 1), normalized=True)
+            pts.append(fp.frame.to_geo(p.x, p.y))
+    return pts
+
+
+def vector_grid(fp: FlightPlanner) -> np.ndarray:
+    xy, _ = fp.sweep().photo_points(fp.forward_spacing_m)
+    lon, lat = fp.frame.to_geo(xy[:, 0], xy[:, 1])
+    return np.column_stack([lon, lat])
+
+
+def segment_route(fp: FlightPlanner) -> np.ndarray:
+    return order_segments(fp.sweep()).photo_points(fp.forward_spacing_m)[0]
+
+
+def tsp_route(fp: FlightPlanner, optimizer: str) -> np.ndarray:
+    fp.optimizer = optimizer
+    xy, _ = fp.sweep().photo_points(fp.forward_spacing_m)
+    ordered = fp.optimise(fp._to_waypoints(xy))
+    x, y = fp.frame.to_local([wp.lon for wp in ordered], [wp.lat for wp in ordered])
+    return np.column_stack([x, y])
+
+
+def bench_ordering(areas: list[float], grid: GridParams) -> None:
+    modes = ["ortools", "local_search", "segments"]
+    print(f"{'km²':>6} {'points':>8}" + "".join(f" {m:>20}" for m in modes))  # noqa: T201
+    for area in areas:
+        fp = FlightPlanner(make_aoi(area), grid=grid)
+        row = f"{area:>6.1f}"
+        for mode in modes:
+            if mode == "segments":
+                t, xy = _best(segment_route, fp, repeat=1)
+            else:
+                t, xy = _best(tsp_route, fp, mode, repeat=1)
+            row += f" {path_length(xy) / 1e3:>9.2f} km {t:>6.2f} s"
+        print(f"{row[:6]} {len(xy):>8}{row[6:]}")  # noqa: T201
+
+
+def bench_orientation(areas: list[float], grid: GridParams) -> None:
+    print(f"{'km²':>6} {'search ms':>10}  result")  # noqa: T201
+    for area in areas:
+        fp = FlightPlanner(make_aoi(area), grid=grid)
+        t, choice = _best(fp.optimise_orientation, repeat=1)
+        print(f"{area:>6.1f} {t * 1e3:>10.1f}  {choice.summary()}")  # noqa: T201
+
+
+def _best(fn, *args, repeat: int = 3) -> tuple[float, object]:
+    best, out = math.inf, None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--areas", type=float, nargs="+", default=[1.0, 5.0, 20.0])
+    ap.add_argument("--gsd", type=float, default=2.5, help="GSD, см/пикс")
+    ap.add_argument("--angle", type=float, default=20.0, help="ориентация галсов, °")
+    ap.add_argument("--ordering", action="store_true", help="сравнить segments и tsp")
+    ap.add_argument("--orientation", action="store_true", help="подобрать угол галсов")
+    args = ap.parse_args(argv)
+
+    if args.orientation:
+        bench_orientation(
+            args.areas, GridParams(gsd_target_cm=args.gsd, orientation_deg=args.angle)
+        )
+        return
+
+    if args.ordering:
+        bench_ordering(args.areas, GridParams(gsd_target_cm=args.gsd, orientation_deg=args.angle))
+        return
+
+    print(  # noqa: T201
+        f"{'km²':>6} {'points':>8} {'legacy ms':>10} {'sweep ms':>9} {'speedup':>8}"
+    )
+    for area in args.areas:
+        grid = GridParams(gsd_target_cm=args.gsd, orientation_deg=args.angle)
+        fp = FlightPlanner(make_aoi(area), grid=grid)
+        t_old, _ = _best(legacy_grid, fp)
+        t_new, pts = _best(vector_grid, fp)
+        print(  # noqa: T201
+            f"{area:>6.1f} {len(pts):>8} {t_old * 1e3:>10.1f} {t_new * 1e3:>9.2f}"
+            f" {t_old / t_new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# mypy: ignore-errors
+#!/usr/bin/env python3
+"""
+Бенчмарк сопоставления треков BBoxSmoother: поэлементный Python-матчер
+(прежняя реализация) против векторизованных матриц IoU/центров, плюс время
+оптимального назначения (track_assignment="hungarian") на матрице 100×100.
+
+    python -m fire_uav.scripts.bench_tracker [--frames 50] [--sizes 10 50 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from fire_uav.module_core.detections.assignment import assign_max_score
+from fire_uav.module_core.detections.smoothing import BBoxSmoother
+
+
+# ───────────── baseline: прежний матчер по парам ───────────── #
+def _legacy_iou(a, b) -> float:
+    ax1, ay1, ax2, ay2 = a
+    bx1, by1, bx2, by2 = b
+    inter_w = max(0.0, min(ax2, bx2) - max(ax1, bx1))
+    inter_h = max(0.0, min(ay2, by2) - max(ay1, by1))
+    inter = inter_w * inter_h
+    if inter <= 0:
+        return 0.0
+    area_a = max(0.0, ax2 - ax1) * max(0.0, ay2 - ay1)
+    area_b = max(0.0, bx2 - bx1) * max(0.0, by2 - by1)
+    union = area_a + area_b - inter
+    return inter / union if union else 0.0
+
+
+def _legacy_center_sim(a, b, max_dist: float) -> float:
+    if max_dist <= 0:
+        return 0.0
+    ax, ay = (a[0] + a[2]) / 2.0, (a[1] + a[3]) / 2.0
+    bx, by = (b[0] + b[2]) / 2.0, (b[1] + b[3]) / 2.0
+    dist = ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5
+    if dist > max_dist:
+        return 0.0
+    return max(0.0, 1.0 - dist / max_dist)
+
+
+def legacy_candidates(smoother: BBoxSmoother, detections) -> list[tuple[float, int, int]]:
+    """Кандидаты (score, track_id, det_idx) так, как их считал цикл по парам."""
+    candidates = []
+    for track_id, state in smoother.tracks.items():
+        for det_idx, det in enumerate(detections):
+            if det.class_id != state.class_id:
+                continue
+            bbox = tuple(float(v) for v in det.bbox)
+            iou = _legacy_iou(bbox, state.bbox)
+            center_sim = _legacy_center_sim(bbox, state.bbox, smoother.max_center_distance_px)
+            if iou < smoother.iou_threshold and center_sim <= 0.0:
+                continue
+            score = iou if iou >= smoother.iou_threshold else 0.001 + 0.2 * center_sim
+            candidates.append((score, track_id, det_idx))
+    candidates.sort(key=lambda x: x[0], reverse=True)
+    return candidates
+
+
+def legacy_greedy(candidates) -> dict[int, int]:
+    used_tracks: set[int] = set()
+    out: dict[int, int] = {}
+    for _, track_id, det_idx in candidates:
+        if track_id in used_tracks or det_idx in out:
+            continue
+        used_tracks.add(track_id)
+        out[det_idx] = track_id
+    return out
+
+
+# ───────────── синтетическая сцена ───────────── #
+def make_scene(n_boxes: int, n_frames: int, seed: int = 0):
+    rng = random.Random(seed)
+    t0 = datetime(2024, 1, 1)
+    objs = [
+        [
+            rng.uniform(0, 3800),
+            rng.uniform(0, 2100),
+            rng.uniform(20, 120),
+            rng.uniform(20, 120),
+            rng.randrange(3),
+        ]
+        for _ in range(n_boxes)
+    ]
+    frames = []
+    for f in range(n_frames):
+        dets = []
+        for x, y, w, h, cls in objs:
+            jx, jy = rng.gauss(0, 6), rng.gauss(0, 6)
+            dets.append(
+                SimpleNamespace(
+                    class_id=cls,
+                    confidence=rng.uniform(0.3, 0.95),
+                    bbox=(int(x + jx), int(y + jy), int(x + jx + w), int(y + jy + h)),
+                    timestamp=t0 + timedelta(milliseconds=40 * f),
+                    track_id=None,
+                )
+            )
+        rng.shuffle(dets)
+        frames.append(dets)
+    return frames
+
+
+def bench(n_boxes: int, n_frames: int) -> tuple[float, float]:
+    frames = make_scene(n_boxes, n_frames)
+    smoother = BBoxSmoother()
+    t_legacy = t_vec = 0.0
+    for dets in frames:
+        t = time.perf_counter()
+        expected = legacy_greedy(legacy_candidates(smoother, dets))
+        t_legacy += time.perf_counter() - t
+
+        boxes = np.array([d.bbox for d in dets], dtype=np.float64)
+        classes = np.array([d.class_id for d in dets], dtype=np.int64)
+        t = time.perf_counter()
+        rows, cols = smoother._greedy_assign(smoother._table.boxes, boxes, classes)
+        t_vec += time.perf_counter() - t
+
+        got = dict(zip(cols.tolist(), smoother._table.ids[rows].tolist()))
+        if got != expected:
+            raise AssertionError(f"assignment mismatch at {n_boxes} boxes")
+        smoother.assign_and_smooth(dets)
+    return t_legacy / n_frames * 1e3, t_vec / n_frames * 1e3
+
+
+def bench_hungarian(n: int = 100, repeat: int = 200) -> tuple[float, float]:
+    """Время assign_max_score (мс) на гейтированной и на плотной матрице n×n."""
+    frames = make_scene(n, 2)
+    smoother = BBoxSmoother()
+    smoother.assign_and_smooth(frames[0])
+    boxes = np.array([d.bbox for d in frames[1]], dtype=np.float64)
+    gated = smoother.score_matrix(smoother._table.boxes, boxes)
+    dense = np.random.default_rng(0).random((n, n))
+    out = []
+    for scores in (gated, dense):
+        t = time.perf_counter()
+        for _ in range(repeat):
+            assign_max_score(scores)
+        out.append((time.perf_counter() - t) / repeat * 1e3)
+    return out[0], out[1]
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--frames", type=int, default=50)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    args = ap.parse_args(argv)
+
+    print(f"{'boxes':>6} {'legacy ms':>10} {'numpy ms':>10} {'speedup':>8}")  # noqa: T201
+    for n in args.sizes:
+        legacy_ms, vec_ms = bench(n, args.frames)
+        print(
+            f"{n:>6} {legacy_ms:>10.3f} {vec_ms:>10.3f} {legacy_ms / vec_ms:>7.1f}x"
+        )  # noqa: T201
+
+    gated_ms, dense_ms = bench_hungarian()
+    print(f"hungarian 100x100: gated {gated_ms:.3f} ms, dense {dense_ms:.3f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
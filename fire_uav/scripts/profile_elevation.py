@@ -1,16 +1,17 @@
 # mypy: ignore-errors
 #!/usr/bin/env python3
-"""Печатает профиль высот маршрута из `mission.plan`."""
+"""Печатает профиль высот маршрута из `mission.plan` по локальным плиткам DEM."""
 
 from __future__ import annotations
 
-import sys
+import argparse
 from pathlib import Path
 from typing import List
 
 from fire_uav.domain.route.converter import waypoints_from_plan
-from fire_uav.domain.route.elevation import profile
+from fire_uav.domain.route.elevation import ElevationService, default_service, profile
 from fire_uav.domain.route.planner import Waypoint
+from fire_uav.module_core.terrain.dem import DEMTileStore
 
 
 def _load(plan: Path) -> List[Waypoint]:
@@ -18,12 +19,21 @@ def _load(plan: Path) -> List[Waypoint]:
 
 
 def main(argv: list[str] | None = None) -> None:
-    argv = sys.argv[1:] if argv is None else argv
-    if len(argv) != 1:
-        print("Usage: profile_elevation.py <mission.plan>")
-        sys.exit(1)
-
-    elev = profile(_load(Path(argv[0])))
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("plan", type=Path, help="mission.plan")
+    ap.add_argument("--dem-dir", type=Path, help="плитки .hgt/GeoTIFF (по умолчанию dem_dir)")
+    ap.add_argument("--http-url", help="opentopodata-совместимый сервис для точек вне DEM")
+    args = ap.parse_args(argv)
+
+    if args.dem_dir is None and args.http_url is None:
+        service = default_service()
+    else:
+        service = ElevationService(
+            DEMTileStore(args.dem_dir) if args.dem_dir else default_service().dem,
+            http_url=args.http_url,
+        )
+
+    elev = profile(_load(args.plan), service)
     for idx, h in enumerate(elev, 1):
         print(f"{idx:03d}: {h:.1f} m")  # noqa: T201
 
@@ -0,0 +1,196 @@
+# mypy: ignore-errors
+#!/usr/bin/env python3
+"""
+INT8-квантование детектора: калибровка, проверка просадки mAP и регистрация модели.
+
+    python -m fire_uav.scripts.quantize_detector --calib data/calib --val data/val/images
+        [--model data/models/best_yolo11.pt] [--method minmax] [--max-drop 0.02]
+        [--settings my_settings.json] [--no-register]
+
+`--calib` — папка кадров для калибровки активаций (100–500 типичных кадров с борта),
+`--val` — отложенный набор, не пересекающийся с калибровкой. Разметка YOLO
+(`labels/*.txt`) даёт mAP против разметки; без неё эталон — предсказания FP32,
+и mAP INT8 показывает согласие с ней. Если просадка mAP@0.5 не больше `--max-drop`
+(по умолчанию 0.02 при любом эталоне; ослабить допуск можно только явным
+`--max-drop`), путь INT8-модели пишется в `detect_int8_model` файла `--settings`
+или `$FIRE_UAV_SETTINGS` —
+DetectionEngine загрузит её при следующем запуске, пока `yolo_model` не сменится.
+Встроенный settings_default.json не трогается: без пользовательского файла
+печатается строка, которую нужно добавить в настройки. Отчёт (точность и скорость
+FP32/INT8 рядом) печатается и сохраняется в JSON рядом с моделью.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from fire_uav.config.settings import settings
+from fire_uav.module_core.detect.backends import OnnxBackend, export_onnx
+from fire_uav.module_core.detect.evaluate import list_images, load_labels, mean_average_precision
+from fire_uav.module_core.detect.quantize import (
+    CALIBRATION_METHODS,
+    quantize_int8,
+    quantized_path,
+)
+from fire_uav.module_core.interfaces.detector import RawDetections
+from fire_uav.module_core.settings_loader import update_settings
+
+_EVAL_CONF = 0.001  # mAP считается по всей PR-кривой, как в Ultralytics val
+_MAX_DROP = 0.02  # допуск просадки mAP@0.5; ослабляется только явным --max-drop
+
+
+def predict_folder(
+    backend: OnnxBackend, images: list[Path]
+) -> list[tuple[RawDetections, tuple[int, int], Path]]:
+    out = []
+    for path in images:
+        frame = cv2.imread(str(path))
+        if frame is not None:
+            out.append((backend.predict([frame])[0], frame.shape[:2], path))
+    return out
+
+
+def throughput(backend: OnnxBackend, images: list[Path]) -> dict[str, float]:
+    """Кадры/с и p50 вызова на рабочем пороге уверенности (по одному кадру)."""
+    frames = [f for f in (cv2.imread(str(p)) for p in images) if f is not None]
+    backend.predict(frames[:1])  # прогрев
+    lat = []
+    for frame in frames:
+        t = time.perf_counter()
+        backend.predict([frame])
+        lat.append(time.perf_counter() - t)
+    return {"fps": len(lat) / sum(lat), "p50_ms": float(np.median(lat) * 1e3)}
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--model", default=settings.yolo_model, help="веса .pt или ONNX FP32")
+    ap.add_argument("--calib", required=True, help="папка кадров для калибровки")
+    ap.add_argument("--val", required=True, help="отложенный набор для проверки mAP")
+    ap.add_argument("--max-calib", type=int, default=300)
+    ap.add_argument("--max-val", type=int, default=None)
+    ap.add_argument("--bench-frames", type=int, default=50)
+    ap.add_argument("--method", choices=CALIBRATION_METHODS, default="minmax")
+    ap.add_argument("--no-per-channel", action="store_true")
+    ap.add_argument("--imgsz", type=int, default=settings.detect_imgsz)
+    ap.add_argument("--max-drop", type=float, default=_MAX_DROP, help="допустимая просадка mAP@0.5")
+    ap.add_argument(
+        "--output",
+        default=None,
+        help="путь INT8-модели (по умолчанию рядом; с другим именем не регистрируется)",
+    )
+    ap.add_argument("--settings", default=None, help="куда записать detect_int8_model")
+    ap.add_argument("--no-register", action="store_true")
+    args = ap.parse_args(argv)
+
+    calib = list_images(args.calib, args.max_calib)
+    val = list_images(args.val, args.max_val)
+    if not val:
+        ap.error(f"no images in {args.val}")
+    if {p.resolve() for p in calib} & {p.resolve() for p in val}:
+        ap.error("calibration and validation sets overlap")
+
+    fp32 = Path(args.model) if args.model.endswith(".onnx") else export_onnx(args.model, args.imgsz)
+    int8 = quantize_int8(
+        args.model,
+        calib,
+        imgsz=args.imgsz,
+        method=args.method,
+        per_channel=not args.no_per_channel,
+        output=args.output,
+    )
+
+    results, preds = {}, {}
+    for name, path in (("fp32", fp32), ("int8", int8)):
+        evaluator = OnnxBackend(path, conf=_EVAL_CONF, iou=settings.yolo_iou, imgsz=args.imgsz)
+        preds[name] = predict_folder(evaluator, val)
+        runtime = OnnxBackend(
+            path,
+            conf=settings.yolo_conf,
+            iou=settings.yolo_iou,
+            imgsz=args.imgsz,
+            intra_op_threads=settings.onnx_intra_op_threads,
+            inter_op_threads=settings.onnx_inter_op_threads,
+            providers=settings.onnx_providers,
+        )
+        results[name] = {
+            "path": str(path),
+            "size_mb": path.stat().st_size / 2**20,
+            **throughput(runtime, val[: args.bench_frames]),
+        }
+
+    truths = [load_labels(path, shape) for _, shape, path in preds["fp32"]]
+    reference = "labels" if any(t is not None for t in truths) else "fp32"
+    if reference == "labels":
+        empty = RawDetections(np.zeros((0, 4)), np.zeros(0), np.zeros(0, np.int64))
+        truths = [t if t is not None else empty for t in truths]
+    else:
+        truths = [
+            RawDetections(r.boxes[keep], r.scores[keep], r.classes[keep])
+            for r, keep in ((r, r.scores >= settings.yolo_conf) for r, _, _ in preds["fp32"])
+        ]
+    for name in results:
+        results[name] |= mean_average_precision([r for r, _, _ in preds[name]], truths)
+
+    max_drop = args.max_drop
+    drop = results["fp32"]["map50"] - results["int8"]["map50"]
+    passed = drop <= max_drop
+    report = {
+        "model": str(args.model),
+        "reference": reference,
+        "calibration_images": len(calib),
+        "validation_images": len(truths),
+        "method": args.method,
+        "map50_drop": drop,
+        "max_drop": max_drop,
+        "passed": passed,
+        "speedup": results["int8"]["fps"] / results["fp32"]["fps"],
+        "results": results,
+    }
+    report_path = int8.with_suffix(".json")
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"reference: {reference}, {len(truths)} validation images")  # noqa: T201
+    print(  # noqa: T201
+        f"{'model':>6} {'size MB':>8} {'frames/s':>9} {'p50 ms':>8} {'mAP50':>7} {'mAP50-95':>9}"
+    )
+    for name, r in results.items():
+        print(  # noqa: T201
+            f"{name:>6} {r['size_mb']:>8.1f} {r['fps']:>9.2f} {r['p50_ms']:>8.1f}"
+            f" {r['map50']:>7.3f} {r['map50_95']:>9.3f}"
+        )
+    print(  # noqa: T201
+        f"speedup {report['speedup']:.2f}x, mAP50 drop {drop:+.3f} "
+        f"(limit {max_drop}), report: {report_path}"
+    )
+
+    if not passed:
+        print("INT8 model rejected: mAP drop exceeds the limit")  # noqa: T201
+        raise SystemExit(1)
+    if args.no_register:
+        return
+    if int8.name != quantized_path(settings.yolo_model).name:
+        print(  # noqa: T201
+            f"not registered: {int8} is not built from yolo_model {settings.yolo_model}"
+        )
+        return
+    cfg = args.settings or os.environ.get("FIRE_UAV_SETTINGS")
+    if not cfg:
+        print(  # noqa: T201
+            f'add "detect_int8_model": {json.dumps(str(int8))} to your settings file'
+            " (or pass --settings / set $FIRE_UAV_SETTINGS to register it)"
+        )
+        return
+    cfg = update_settings({"detect_int8_model": str(int8)}, cfg)
+    print(f"registered {int8} as detect_int8_model in {cfg}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ CameraThread с метрикой FPS: каждые 5 с пишет INFO «Camera
 from __future__ import annotations
 
 import logging
+import queue
 import time
 from typing import Final
 
@@ -15,7 +16,7 @@ import numpy as np
 from PySide6.QtCore import QThread, Signal
 
 from fire_uav.services.components.base import ManagedComponent, State
-from fire_uav.services.metrics import fps_gauge
+from fire_uav.services.metrics import fps_gauge, frames_dropped
 
 LOG: Final = logging.getLogger("camera")
 
@@ -51,13 +52,13 @@ class _CameraQtThread(QThread):
                 self.error.emit("Failed to read frame")
                 break
 
-            # отдадим кадр UI и в очередь
+            # отдадим кадр UI и в очередь (FrameMailbox сам вытесняет старые кадры)
             self.frame.emit(frame)
             if self._q is not None:
                 try:
                     self._q.put_nowait(frame)
-                except Exception:
-                    pass
+                except queue.Full:  # обычная ограниченная очередь
+                    frames_dropped.inc()
 
             # ---- Prometheus метрика ----
             fps_gauge.inc()
@@ -6,7 +6,8 @@ from __future__ import annotations
 import logging
 import queue
 import time
-from typing import Final
+from datetime import datetime
+from typing import Final, List, NamedTuple, Tuple
 
 import numpy as np
 from numpy.typing import NDArray
@@ -17,7 +18,13 @@ from fire_uav.domain.detect.detection import DetectionEngine
 from fire_uav.module_core.schema import DetectionsBatch
 from fire_uav.services.bus import Event, bus
 from fire_uav.services.components.base import ManagedComponent, State
-from fire_uav.services.metrics import detect_latency, fps_gauge, queue_size
+from fire_uav.services.metrics import (
+    detect_batch_size,
+    detect_latency,
+    detect_queue_wait,
+    fps_gauge,
+    queue_size,
+)
 
 LOG: Final = logging.getLogger("detect")
 
@@ -26,13 +33,31 @@ _SLEEP = 0.05
 _STAT_EVERY = 1.0  # seconds
 
 
+class _Pending(NamedTuple):
+    camera_id: str
+    frame: Frame
+    taken: float  # perf_counter() при съёме из очереди
+    timestamp: datetime
+
+
 class DetectThread(ManagedComponent):
-    """YOLO detector + latency and queue-size instrumentation."""
+    """
+    YOLO detector + latency and queue-size instrumentation.
+
+    С `detect_batch_size > 1` кадры копятся в пачку — до N штук или не дольше
+    `detect_batch_wait_ms` от первого — и идут в модель одним вызовом
+    (`DetectionEngine.infer_batch`); результат раздаётся по кадрам. Элемент
+    входной очереди — кадр или пара (camera_id, кадр). Если очередь — `FrameMailbox`,
+    ей сообщается задержка инференса для адаптивного пропуска кадров.
+    """
 
     def __init__(
         self,
-        in_q: queue.Queue[Frame | None],
+        in_q: queue.Queue[Frame | Tuple[str, Frame] | None],
         out_q: queue.Queue[DetectionsBatch],
+        *,
+        batch_size: int | None = None,
+        batch_wait_ms: float | None = None,
     ) -> None:
         super().__init__(name="DetectThread")
         self._in_q = in_q
@@ -42,82 +67,139 @@ class DetectThread(ManagedComponent):
             conf_threshold=settings.yolo_conf,
             iou_threshold=settings.yolo_iou,
         )
+        if batch_size is None:
+            batch_size = settings.detect_batch_size
+        if batch_wait_ms is None:
+            batch_wait_ms = settings.detect_batch_wait_ms
+        self._batch_size = max(1, int(batch_size))
+        self._batch_wait_s = max(0.0, float(batch_wait_ms)) / 1000.0
         self._stat_ts = time.perf_counter()
         self._last_frame_ts = time.perf_counter()
 
+    def _take(self, item: Frame | Tuple[str, Frame]) -> _Pending:
+        """Кадр из очереди: камера, время съёма и оценка FPS по темпу поступления."""
+        camera_id, frame = item if isinstance(item, tuple) else ("cam0", item)
+        now = time.perf_counter()
+        dt = now - self._last_frame_ts
+        if dt > 0:
+            current_fps = 1.0 / dt
+            try:
+                prev = fps_gauge._value.get()  # type: ignore[attr-defined]
+            except Exception:
+                prev = current_fps
+            fps_gauge.set(0.8 * prev + 0.2 * current_fps)
+        self._last_frame_ts = now
+        return _Pending(camera_id, frame, now, datetime.utcnow())
+
+    def _collect(self, first: Frame | Tuple[str, Frame]) -> List[_Pending]:
+        """Пачка: первый кадр + всё, что придёт до заполнения или истечения ожидания."""
+        pending = [self._take(first)]
+        deadline = pending[0].taken + self._batch_wait_s
+        while len(pending) < self._batch_size:
+            try:
+                item = self._in_q.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                break
+            if item is None:  # stop()
+                break
+            pending.append(self._take(item))
+        return pending
+
+    def _infer(self, pending: List[_Pending]) -> List[DetectionsBatch]:
+        start = time.perf_counter()
+        for p in pending:
+            detect_queue_wait.observe(start - p.taken)
+        detect_batch_size.observe(len(pending))
+
+        # measure inference latency
+        with detect_latency.time():
+            if len(pending) > 1 and hasattr(self._engine, "infer_batch"):
+                results = self._engine.infer_batch(
+                    [p.frame for p in pending],
+                    camera_ids=[p.camera_id for p in pending],
+                    timestamps=[p.timestamp for p in pending],
+                )
+            elif hasattr(self._engine, "detect"):
+                results = [self._engine.detect(p.frame) for p in pending]
+            else:
+                results = [
+                    self._engine.infer(
+                        p.frame, camera_id=p.camera_id, timestamp=p.timestamp, return_batch=True
+                    )
+                    for p in pending
+                ]
+
+        # FrameMailbox подбирает по задержке, какой кадр камеры пускать в детектор
+        if hasattr(self._in_q, "report_latency"):
+            self._in_q.report_latency(time.perf_counter() - start, len(pending))
+        return results
+
+    def _publish(self, batch: DetectionsBatch) -> Tuple[int, float]:
+        deps.last_detection = batch
+        dets = getattr(batch, "detections", [])
+        count = len(dets)
+        best = 0.0
+        if count:
+            best = max(
+                (getattr(d, "confidence", getattr(d, "score", 0.0)) for d in dets),
+                default=0.0,
+            )
+            bbox = getattr(dets[0], "bbox", None)
+            if bbox is None and all(hasattr(dets[0], k) for k in ("x1", "y1", "x2", "y2")):
+                bbox = (
+                    getattr(dets[0], "x1"),
+                    getattr(dets[0], "y1"),
+                    getattr(dets[0], "x2"),
+                    getattr(dets[0], "y2"),
+                )
+            LOG.info(
+                "Detections: count=%d best=%.2f bbox=%s",
+                count,
+                best,
+                bbox,
+            )
+
+        try:
+            self._out_q.put_nowait(batch)
+        except queue.Full:
+            LOG.debug("Output queue full - dropping detection")
+
+        bus.emit(Event.DETECTION, batch)
+        return count, best
+
     def loop(self) -> None:
-        LOG.info("Detector thread started")
+        LOG.info("Detector thread started (batch=%d)", self._batch_size)
         while self.state is State.RUNNING:
             try:
-                frame = self._in_q.get(timeout=_SLEEP)
+                item = self._in_q.get(timeout=_SLEEP)
             except queue.Empty:
-                frame = None
+                item = None
 
-            if frame is None:
+            if item is None:
                 continue
 
+            pending = self._collect(item)
+
             # track queue depth
             queue_size.set(self._in_q.qsize())
 
-            # Quick FPS estimate from capture cadence
-            now = time.perf_counter()
-            dt = now - self._last_frame_ts
-            if dt > 0:
-                current_fps = 1.0 / dt
-                try:
-                    prev = fps_gauge._value.get()  # type: ignore[attr-defined]
-                except Exception:
-                    prev = current_fps
-                fps_gauge.set(0.8 * prev + 0.2 * current_fps)
-            self._last_frame_ts = now
-
-            # measure inference latency
-            with detect_latency.time():
-                if hasattr(self._engine, "detect"):
-                    batch = self._engine.detect(frame)
-                else:
-                    batch = self._engine.infer(frame, return_batch=True)
-
-            deps.last_detection = batch
-            dets = getattr(batch, "detections", [])
-            count = len(dets)
-            best = 0.0
-            if count:
-                best = max(
-                    (getattr(d, "confidence", getattr(d, "score", 0.0)) for d in dets),
-                    default=0.0,
-                )
-                bbox = getattr(dets[0], "bbox", None)
-                if bbox is None and all(hasattr(dets[0], k) for k in ("x1", "y1", "x2", "y2")):
-                    bbox = (
-                        getattr(dets[0], "x1"),
-                        getattr(dets[0], "y1"),
-                        getattr(dets[0], "x2"),
-                        getattr(dets[0], "y2"),
-                    )
-                LOG.info(
-                    "Detections: count=%d best=%.2f bbox=%s",
-                    count,
-                    best,
-                    bbox,
-                )
-
-            try:
-                self._out_q.put_nowait(batch)
-            except queue.Full:
-                LOG.debug("Output queue full - dropping detection")
-
-            bus.emit(Event.DETECTION, batch)
+            count, best = 0, 0.0
+            for batch in self._infer(pending):
+                count, best = self._publish(batch)
 
             # periodic debug
             now = time.perf_counter()
             if now - self._stat_ts >= _STAT_EVERY:
                 LOG.info(
-                    "Detector heartbeat: frames_q=%d dets_q=%d last_batch=%d best=%.2f",
+                    "Detector heartbeat: frames_q=%d dets_q=%d batch=%d last_batch=%d best=%.2f"
+                    " dropped=%d skipped=%d",
                     self._in_q.qsize(),
                     self._out_q.qsize(),
+                    len(pending),
                     count,
                     best,
+                    getattr(self._in_q, "dropped", 0),
+                    getattr(self._in_q, "skipped", 0),
                 )
                 self._stat_ts = now
 
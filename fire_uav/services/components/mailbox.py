@@ -0,0 +1,117 @@
+# mypy: ignore-errors
+"""
+Очередь кадров camera → detector без устаревших кадров.
+
+`FrameMailbox` — `queue.Queue`, у которого `put` никогда не блокирует и не
+бросает `Full`: при заполнении вытесняется самый старый кадр. Ёмкость 1 —
+«почтовый ящик» с последним кадром: детектор всегда берёт свежий кадр, а не
+кадр пятилетней давности из хвоста очереди. `AdaptiveFrameSkipper` пропускает
+кадры ещё до ящика — в детектор идёт каждый k-й, k подбирается по измеренной
+задержке инференса и темпу камеры, так что детектор загружен на
+`detect_target_load`, а кадры берутся через равные промежутки.
+"""
+
+from __future__ import annotations
+
+import math
+import queue
+import threading
+import time
+from typing import Any, Final
+
+from fire_uav.config.settings import settings
+from fire_uav.services.metrics import frame_stride, frames_dropped, frames_skipped
+
+_ALPHA: Final = 0.2  # вес нового замера в скользящих средних
+
+
+class AdaptiveFrameSkipper:
+    """Пропускает в детектор каждый k-й кадр; k = ⌈задержка на кадр / (период камеры · load)⌉."""
+
+    def __init__(self, target_load: float = 0.9, max_stride: int = 15) -> None:
+        self.target_load = max(0.05, float(target_load))
+        self.max_stride = max(1, int(max_stride))
+        self.stride = 1
+        self._count = 0
+        self._last: float | None = None
+        self._interval: float | None = None  # период поступления кадров, с
+        self._latency: float | None = None  # инференс на один кадр, с
+        self._lock = threading.Lock()
+        frame_stride.set(self.stride)
+
+    @staticmethod
+    def _ewma(prev: float | None, value: float) -> float:
+        return value if prev is None else (1 - _ALPHA) * prev + _ALPHA * value
+
+    def admit(self, now: float | None = None) -> bool:
+        """Вызывается на каждый кадр камеры; True — кадр идёт в детектор."""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            if self._last is not None and now > self._last:
+                self._interval = self._ewma(self._interval, now - self._last)
+                self._update()
+            self._last = now
+            self._count += 1
+            if self._count < self.stride:
+                return False
+            self._count = 0
+            return True
+
+    def report_latency(self, seconds: float, frames: int = 1) -> None:
+        """Замер детектора: `seconds` на пачку из `frames` кадров."""
+        with self._lock:
+            self._latency = self._ewma(self._latency, seconds / max(1, frames))
+            self._update()
+
+    def _update(self) -> None:
+        if not self._interval or self._latency is None:
+            return
+        k = math.ceil(self._latency / (self._interval * self.target_load))
+        stride = min(self.max_stride, max(1, k))
+        if stride != self.stride:
+            self.stride = stride
+            frame_stride.set(stride)
+
+
+class FrameMailbox(queue.Queue):
+    """Очередь кадров с вытеснением старых; опционально — с `AdaptiveFrameSkipper` на входе."""
+
+    def __init__(self, capacity: int = 1, *, skipper: AdaptiveFrameSkipper | None = None) -> None:
+        super().__init__(maxsize=max(1, int(capacity)))
+        self.skipper = skipper
+        self.dropped = 0
+        self.skipped = 0
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:
+        if item is not None and self.skipper is not None and not self.skipper.admit():
+            self.skipped += 1
+            frames_skipped.inc()
+            return
+        with self.mutex:
+            if self._qsize() >= self.maxsize:
+                if self.queue.popleft() is not None:  # None — сигнал остановки, не кадр
+                    self.dropped += 1
+                    frames_dropped.inc()
+                self.unfinished_tasks -= 1
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def report_latency(self, seconds: float, frames: int = 1) -> None:
+        """Передаёт задержку инференса планировщику пропусков (если он есть)."""
+        if self.skipper is not None:
+            self.skipper.report_latency(seconds, frames)
+
+
+def make_frame_mailbox() -> FrameMailbox:
+    """Ящик кадров по настройкам: ёмкость не меньше пачки детектора."""
+    skipper = (
+        AdaptiveFrameSkipper(settings.detect_target_load, settings.detect_max_frame_stride)
+        if settings.detect_adaptive_skip
+        else None
+    )
+    capacity = max(settings.frame_queue_size, settings.detect_batch_size)
+    return FrameMailbox(capacity, skipper=skipper)
+
+
+__all__ = ["AdaptiveFrameSkipper", "FrameMailbox", "make_frame_mailbox"]
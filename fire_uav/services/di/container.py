@@ -4,6 +4,7 @@ import queue
 from typing import Any
 
 from fire_uav.services.components.detect import DetectThread
+from fire_uav.services.components.mailbox import make_frame_mailbox
 
 
 class Container:
@@ -12,7 +13,7 @@ class Container:
     """
 
     def __init__(self) -> None:
-        self.frames_q: queue.Queue[Any] = queue.Queue()
+        self.frames_q: queue.Queue[Any] = make_frame_mailbox()
         self.dets_q: queue.Queue[Any] = queue.Queue()
         self.detector = DetectThread(self.frames_q, self.dets_q)
 
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from fire_uav.module_core.detections.aggregator import (
+    DetectionAggregator,
+    DetectionEvent,
+    _Cluster,
+)
+from fire_uav.module_core.geometry import haversine_m, offset_latlon
+from fire_uav.module_core.schema import WorldCoord
+
+T0 = datetime(2024, 1, 1)
+
+
+class _LinearAggregator:
+    """Прежняя схема: полный перебор кластеров и чистка списком после каждого события."""
+
+    def __init__(self, window: int, votes: int, min_conf: float, dist_m: float, ttl: float):
+        self.window, self.votes, self.min_conf, self.dist_m = window, votes, min_conf, dist_m
+        self.ttl = timedelta(seconds=ttl)
+        self.clusters: list[dict] = []
+
+    def add_event(self, ev: DetectionEvent) -> tuple | None:
+        best, best_dist = None, float("inf")
+        for cl in self.clusters:
+            if cl["class_id"] != ev.class_id or not cl["events"]:
+                continue
+            last = cl["events"][-1].location
+            dist = haversine_m((last.lat, last.lon), (ev.location.lat, ev.location.lon))
+            if dist <= self.dist_m and dist < best_dist:
+                best, best_dist = cl, dist
+        if best is None:
+            best = {"class_id": ev.class_id, "events": [], "reported": None}
+            self.clusters.append(best)
+        best["events"] = (best["events"] + [ev])[-self.window :]
+        events = best["events"]
+        out = None
+        conf = sum(e.confidence for e in events) / len(events)
+        if len({e.frame_id for e in events}) >= self.votes and conf >= self.min_conf:
+            lat = sum(e.location.lat for e in events) / len(events)
+            lon = sum(e.location.lon for e in events) / len(events)
+            out = (ev.frame_id, ev.class_id, round(lat, 9), round(lon, 9), round(conf, 9))
+            best["events"], best["reported"] = [], ev.timestamp
+        now = ev.timestamp
+        self.clusters = [
+            cl
+            for cl in self.clusters
+            if (cl["events"] and now - cl["events"][-1].timestamp <= self.ttl)
+            or (not cl["events"] and not (cl["reported"] and now - cl["reported"] > self.ttl))
+        ]
+        return out
+
+
+def _stream(seed: int, n: int = 3000) -> list[DetectionEvent]:
+    rng = random.Random(seed)
+    sources = [
+        (rng.uniform(55.70, 55.72), rng.uniform(37.60, 37.63), rng.randrange(3)) for _ in range(40)
+    ]
+    events = []
+    t = T0
+    for i in range(n):
+        lat, lon, cls = rng.choice(sources)
+        lat, lon = offset_latlon(lat, lon, rng.gauss(0, 12), rng.gauss(0, 12))
+        # время в основном растёт, но иногда событие приходит с опозданием
+        t += timedelta(seconds=rng.uniform(0.0, 0.4))
+        ts = t - timedelta(seconds=rng.uniform(0, 3)) if rng.random() < 0.1 else t
+        events.append(
+            DetectionEvent(
+                class_id=cls,
+                confidence=rng.uniform(0.2, 0.95),
+                location=WorldCoord(lat=lat, lon=lon),
+                frame_id=f"f{i // 3}",
+                timestamp=ts,
+            )
+        )
+    return events
+
+
+def test_indexed_aggregator_matches_linear_scan() -> None:
+    for seed in range(3):
+        params = dict(window=6, votes=3, min_conf=0.5, dist_m=25.0, ttl=5.0)
+        ref = _LinearAggregator(**params)
+        agg = DetectionAggregator(
+            window=6, votes_required=3, min_confidence=0.5, max_distance_m=25.0, ttl_seconds=5.0
+        )
+        reported = 0
+        for ev in _stream(seed):
+            expected = ref.add_event(ev)
+            det = agg.add_event(ev)
+            got = None
+            if det is not None:
+                got = (
+                    det.frame_id,
+                    det.class_id,
+                    round(det.lat, 9),
+                    round(det.lon, 9),
+                    round(det.confidence, 9),
+                )
+                reported += 1
+            assert got == expected
+        assert reported > 50
+        assert len(agg._index) == sum(1 for cl in ref.clusters if cl["events"])
+
+
+def test_expired_clusters_leave_index() -> None:
+    agg = DetectionAggregator(
+        window=5, votes_required=3, min_confidence=0.1, max_distance_m=20.0, ttl_seconds=2.0
+    )
+    near = WorldCoord(lat=55.7, lon=37.6)
+    agg.add_event(DetectionEvent(0, 0.9, near, "a", T0))
+    assert len(agg._index) == 1
+    far = WorldCoord(lat=55.8, lon=37.6)
+    agg.add_event(DetectionEvent(0, 0.9, far, "b", T0 + timedelta(seconds=3)))
+    assert len(agg._index) == 1
+    # тот же очаг после истечения ttl начинает новый кластер
+    assert agg.add_event(DetectionEvent(0, 0.9, near, "c", T0 + timedelta(seconds=3.5))) is None
+    assert len(agg._index) == 2
+
+
+def test_cluster_running_stats_match_window() -> None:
+    cluster = _Cluster(class_id=0)
+    for ev in _stream(7, 400):
+        cluster.add(ev, 7)
+        events = list(cluster.events)
+        assert cluster.votes() == len({e.frame_id for e in events})
+        assert cluster.avg_conf() == pytest.approx(sum(e.confidence for e in events) / len(events))
+        centroid = cluster.centroid()
+        assert centroid.lat == pytest.approx(sum(e.location.lat for e in events) / len(events))
+        assert centroid.lon == pytest.approx(sum(e.location.lon for e in events) / len(events))
+    cluster.clear()
+    assert cluster.votes() == 0 and cluster.sum_conf == 0.0
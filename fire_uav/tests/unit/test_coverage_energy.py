@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import math
 
+import numpy as np
+import pytest
 from shapely.geometry import LineString, Polygon
 
 from fire_uav.domain.route.coverage import coverage_percent
 from fire_uav.domain.route.energy import EnergyModel
+from fire_uav.module_core.energy import PythonEnergyModel
+from fire_uav.module_core.energy.route_cost import energy_profile, split_by_energy
+from fire_uav.module_core.geometry import haversine_m, offset_latlon
+from fire_uav.module_core.schema import Route, Waypoint
 
 
 def test_coverage_full() -> None:
@@ -27,3 +33,95 @@ def test_energy_model() -> None:
     assert math.isclose(m.cruise_time_s(dist), 100.0)  # 1 200 / 12
     expect_wh = 100.0 / 3600.0 * 45.0
     assert math.isclose(m.energy_used_wh(dist), expect_wh, rel_tol=1e-6)
+
+
+def _zigzag(n_lines: int, length_m: float = 500.0, step_m: float = 50.0, alt: float = 100.0):
+    """Зиг-заг из n_lines галсов с точками через step_m, (lat, lon, alt)."""
+    pts = []
+    for k in range(n_lines):
+        xs = np.arange(0.0, length_m + 1e-9, step_m)
+        for x in xs if k % 2 == 0 else xs[::-1]:
+            pts.append((*offset_latlon(56.0, 37.0, x, k * 40.0), alt + 10.0 * (k % 3)))
+    return np.array(pts)
+
+
+def test_energy_profile_costs() -> None:
+    m = EnergyModel()
+    # прямая без набора высоты — только крейсерский полёт
+    lat, lon = offset_latlon(56.0, 37.0, 0.0, 1200.0)
+    flat = m.route_energy_wh([56.0, 56.0 + (lat - 56.0) / 2, lat], [37.0, 37.0, lon], [50.0] * 3)
+    assert math.isclose(flat, m.energy_used_wh(haversine_m((56.0, 37.0), (lat, lon))), rel_tol=1e-6)
+
+    pts = _zigzag(4)
+    prof = energy_profile(*pts.T, m)
+    assert math.isclose(prof.cost_wh(0, len(pts) - 1), prof.total_wh)
+    # кусок = сумма подкусков + разворот в точке стыка
+    for a, c, b in [(0, 5, 20), (3, 11, 12), (7, 30, 43)]:
+        joint = prof.turns[c + 1] - prof.turns[c]
+        assert math.isclose(prof.cost_wh(a, b), prof.cost_wh(a, c) + prof.cost_wh(c, b) + joint)
+    # развороты на концах галсов и набор высоты стоят энергии
+    cruise = m.energy_used_wh(sum(haversine_m(p[:2], q[:2]) for p, q in zip(pts, pts[1:])))
+    turns = 3 * 2 * 0.5 * m.turn_time_s * m.power_cruise_w / 3600  # 3 разворота по 180°
+    climb = 2 * 10.0 * m.mass_kg * 9.80665 / m.climb_efficiency / 3600
+    assert math.isclose(prof.total_wh, cruise + turns + climb, rel_tol=1e-6)
+
+    route = Route(version=1, waypoints=[Waypoint(lat=a, lon=b, alt=c) for a, b, c in pts])
+    assert math.isclose(PythonEnergyModel().energy_cost(route), prof.total_wh)
+
+
+def _split_reference(pts, m, home) -> list[tuple[int, int]]:  # noqa: ANN001
+    """Наивный жадный разрез: энергия каждой миссии пересчитывается целиком."""
+    home_pt = np.array([[*home, 0.0]])
+
+    def wh(seq) -> float:  # noqa: ANN001
+        return energy_profile(*np.asarray(seq).T, m).total_wh
+
+    def mission_wh(a: int, b: int) -> float:
+        return (
+            wh(np.vstack([home_pt, pts[a : a + 1]]))
+            + wh(pts[a : b + 1])
+            + wh(np.vstack([pts[b : b + 1], home_pt]))
+        )
+
+    out, a, budget = [], 0, m.battery_wh * (1 - m.reserve_fraction)
+    while a < len(pts) - 1:
+        last = a + 1
+        while last + 1 < len(pts) and mission_wh(a, last + 1) <= budget:
+            last += 1
+        out.append((a, last + 1))
+        a = last + 1
+    if a == len(pts) - 1:
+        out.append((a, a + 1))
+    return out
+
+
+def test_split_by_energy_matches_greedy_and_keeps_reserve() -> None:
+    m = EnergyModel(battery_wh=3.0)
+    pts = _zigzag(10)
+    home = offset_latlon(56.0, 37.0, -300.0, -200.0)
+    bounds = split_by_energy(*pts.T, m, home=home)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(pts)
+    assert all(b0[1] == b1[0] for b0, b1 in zip(bounds, bounds[1:]))
+    assert bounds == _split_reference(pts, m, home)
+
+    # без дома миссии длиннее, но энергия каждой в пределах батареи за вычетом резерва
+    free = split_by_energy(*pts.T, m)
+    assert len(free) <= len(bounds)
+    prof = energy_profile(*pts.T, m)
+    for a, b in free:
+        assert prof.cost_wh(a, b - 1) <= m.battery_wh * (1 - m.reserve_fraction) + 1e-12
+
+
+def test_native_route_energy_matches_python() -> None:
+    native_core = pytest.importorskip("native_core")
+    m = EnergyModel()
+    pts = _zigzag(6)
+    native = native_core.route_energy_cost(
+        *(list(c) for c in pts.T),
+        m.mass_kg,
+        m.power_cruise_w,
+        m.cruise_speed_mps,
+        m.turn_time_s,
+        m.climb_efficiency,
+    )
+    assert math.isclose(native, m.route_energy_wh(*pts.T), rel_tol=1e-9)
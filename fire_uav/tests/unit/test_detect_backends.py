@@ -0,0 +1,72 @@
+# mypy: ignore-errors
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from fire_uav.module_core.detect import backends
+from fire_uav.module_core.detect.nms import nms
+
+
+def test_nms_class_aware() -> None:
+    """Перекрытые боксы одного класса подавляются, разных классов — остаются."""
+    boxes = [[0, 0, 10, 10], [1, 1, 11, 11], [0, 0, 10, 10], [50, 50, 60, 60]]
+    scores = [0.9, 0.8, 0.7, 0.6]
+    assert nms(boxes, scores, 0.5).tolist() == [0, 3]
+    assert nms(boxes, scores, 0.5, classes=[0, 0, 1, 0]).tolist() == [0, 2, 3]
+    assert nms(boxes, scores, 0.5, max_det=1).tolist() == [0]
+
+
+def test_letterbox_rect_and_export_name(tmp_path) -> None:
+    """16:9 кадр идёт в 640×384, а имя экспорта меняется вместе с весами."""
+    assert backends.letterbox_shape([(720, 1280)], 640) == (384, 640)
+    img, r, (dx, dy) = backends.letterbox(np.zeros((720, 1280, 3), np.uint8), (384, 640))
+    assert img.shape == (384, 640, 3) and r == 0.5 and (dx, dy) == (0, 12)
+
+    weights = tmp_path / "best.pt"
+    weights.write_bytes(b"a")
+    first = backends.exported_path(weights)
+    weights.write_bytes(b"b")
+    assert first.parent == tmp_path and first.name.startswith("best.")
+    assert first.suffix == ".onnx" and first != backends.exported_path(weights)
+
+    with pytest.raises(ValueError):
+        backends.make_backend("tensorrt", weights, conf=0.5, iou=0.5, device="cpu")
+
+
+def test_onnx_backend_decodes_to_frame_coords(tmp_path) -> None:
+    """Выход сети (4 + nc, A) → боксы в пикселях исходного кадра после порога и NMS."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx import TensorProto, helper
+
+    # «сеть» с динамическим входом и постоянным выходом: cx, cy, w, h, score0, score1
+    pred = np.array(
+        [
+            [320, 322, 100],
+            [192, 194, 100],
+            [64, 64, 20],
+            [64, 64, 20],
+            [0.9, 0.8, 0.1],
+            [0.0, 0.0, 0.05],
+        ],
+        dtype=np.float32,
+    )[None]
+    graph = helper.make_graph(
+        [helper.make_node("Constant", [], ["output0"], value=onnx.numpy_helper.from_array(pred))],
+        "fake_yolo",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, ["b", 3, "h", "w"])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, [1, 6, 3])],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    path = tmp_path / "fake.onnx"
+    onnx.save_model(model, str(path))
+
+    backend = backends.make_backend("onnx", path, conf=0.25, iou=0.5, device="cpu")
+    assert backend.name == "onnx"
+    (raw,) = backend.predict([np.zeros((720, 1280, 3), np.uint8)])
+    # второй бокс подавлен NMS, третий ниже порога; вход 640×384, масштаб 0.5, сдвиг y 12
+    assert raw.classes.tolist() == [0]
+    np.testing.assert_allclose(raw.scores, [0.9], rtol=1e-6)
+    np.testing.assert_allclose(raw.boxes, [[576, 296, 704, 424]])
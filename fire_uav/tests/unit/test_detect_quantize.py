@@ -0,0 +1,118 @@
+# mypy: ignore-errors
+from __future__ import annotations
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from fire_uav.module_core.detect.evaluate import load_labels, mean_average_precision
+from fire_uav.module_core.interfaces.detector import RawDetections
+from fire_uav.module_core.settings_loader import update_settings
+
+
+def test_map_against_yolo_labels(tmp_path) -> None:
+    """Разметка YOLO читается в пиксели; точный бокс — потолок AP (0.995), чужой класс — 0."""
+    (tmp_path / "images").mkdir()
+    (tmp_path / "labels").mkdir()
+    image = tmp_path / "images" / "f.jpg"
+    (tmp_path / "labels" / "f.txt").write_text("1 0.5 0.5 0.2 0.4\n")
+    truth = load_labels(image, (100, 200))
+    np.testing.assert_allclose(truth.boxes, [[80, 30, 120, 70]])
+    assert load_labels(tmp_path / "images" / "none.jpg", (100, 200)) is None
+
+    hit = RawDetections(truth.boxes, np.array([0.9]), np.array([1]))
+    assert mean_average_precision([hit], [truth]) == pytest.approx(
+        {"map50": 0.995, "map50_95": 0.995, "recall50": 1.0}
+    )
+    wrong = RawDetections(truth.boxes, np.array([0.9]), np.array([0]))
+    assert mean_average_precision([wrong], [truth])["map50"] == 0.0
+
+
+def test_update_settings_keeps_other_keys(tmp_path) -> None:
+    cfg = tmp_path / "settings.json"
+    cfg.write_text(json.dumps({"yolo_conf": 0.3}))
+    assert update_settings({"detect_int8_model": "m.int8.onnx"}, cfg) == cfg
+    assert json.loads(cfg.read_text()) == {"yolo_conf": 0.3, "detect_int8_model": "m.int8.onnx"}
+
+
+def test_quantize_keeps_head_in_fp32(tmp_path) -> None:
+    """Свёртки тела квантуются, склейка выходов и всё после неё — нет; модель запускается."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx import TensorProto, helper, numpy_helper
+
+    from fire_uav.module_core.detect.backends import OnnxBackend
+    from fire_uav.module_core.detect.quantize import head_nodes, quantize_int8
+
+    rng = np.random.default_rng(0)
+
+    def weight(name, *shape):
+        return numpy_helper.from_array(rng.normal(0, 0.1, shape).astype(np.float32), name)
+
+    # тело: свёртка stride 32 + ReLU; голова: бокс (4) и класс (2) → Concat → Reshape → Sigmoid
+    graph = helper.make_graph(
+        [
+            helper.make_node("Conv", ["images", "w0"], ["f"], "body", strides=[32, 32]),
+            helper.make_node("Relu", ["f"], ["fr"], "act"),
+            helper.make_node("Conv", ["fr", "wb"], ["box"], "box_conv"),
+            helper.make_node("Conv", ["fr", "wc"], ["cls"], "cls_conv"),
+            helper.make_node("Concat", ["box", "cls"], ["cat"], "head_cat", axis=1),
+            helper.make_node("Reshape", ["cat", "shape"], ["flat"], "head_flat"),
+            helper.make_node("Sigmoid", ["flat"], ["output0"], "head_sigmoid"),
+        ],
+        "tiny_yolo",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, ["b", 3, "h", "w"])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, ["b", 6, "a"])],
+        [
+            weight("w0", 8, 3, 32, 32),
+            weight("wb", 4, 8, 1, 1),
+            weight("wc", 2, 8, 1, 1),
+            numpy_helper.from_array(np.array([0, 6, -1], np.int64), "shape"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    fp32 = tmp_path / "tiny.onnx"
+    onnx.save_model(model, str(fp32))
+    assert head_nodes(model) == [
+        "box_conv",
+        "cls_conv",
+        "head_cat",
+        "head_flat",
+        "head_sigmoid",
+    ]
+
+    calib = []
+    for i in range(2):
+        calib.append(tmp_path / f"c{i}.png")
+        cv2.imwrite(str(calib[-1]), rng.integers(0, 255, (96, 128, 3), dtype=np.uint8))
+    int8 = quantize_int8(fp32, calib, imgsz=128)
+    assert int8.name.startswith("tiny.") and int8.name.endswith(".int8.onnx")
+
+    # в QDQ веса квантованной свёртки приходят через DequantizeLinear, у FP32 — напрямую
+    weights = {n.name: n.input[1] for n in onnx.load(str(int8)).graph.node if n.op_type == "Conv"}
+    assert weights["body"] != "w0"
+    assert (weights["box_conv"], weights["cls_conv"]) == ("wb", "wc")
+    out = OnnxBackend(int8, conf=0.0, iou=0.5, imgsz=128).predict([cv2.imread(str(calib[0]))])
+    assert len(out) == 1
+
+
+def test_stale_int8_model_is_ignored(tmp_path, monkeypatch) -> None:
+    """INT8-модель от прежних весов не подменяет yolo_model: хэш в имени не совпадает."""
+    from fire_uav.config.settings import settings
+    from fire_uav.module_core.detect import backends, detection
+    from fire_uav.module_core.detect.quantize import quantized_path
+
+    weights = tmp_path / "best.pt"
+    weights.write_bytes(b"v1")
+    int8 = quantized_path(weights)
+    int8.write_bytes(b"onnx")
+    monkeypatch.setattr(backends, "ort", object())
+    monkeypatch.setattr(settings, "yolo_model", str(weights))
+    monkeypatch.setattr(settings, "detect_int8_model", str(int8))
+    assert detection._registered_int8_model() == str(int8)
+
+    weights.write_bytes(b"v2")  # веса переобучили, INT8 не пересобрали
+    assert detection._registered_int8_model() is None
@@ -2,18 +2,22 @@
 from __future__ import annotations
 
 import queue
+from datetime import datetime
+from types import SimpleNamespace
 
 import numpy as np
 
+import fire_uav.module_core.detect.detection as detection_mod
 import fire_uav.services.components.detect as detect_mod
+from fire_uav.module_core.interfaces.detector import RawDetections
 from fire_uav.services.components.base import State
 
 
 class _DummyEngine:  # заменяем тяжёлый YOLO
     def __init__(self, *_, **__) -> None: ...
 
-    def infer(self, frame, *, camera_id="cam0", return_batch=True):
-        return {"ok": True, "shape": frame.shape}
+    def infer(self, frame, *, camera_id="cam0", timestamp=None, return_batch=True):
+        return {"ok": True, "shape": frame.shape, "camera_id": camera_id, "ts": timestamp}
 
 
 def test_detect_thread(monkeypatch) -> None:
@@ -26,12 +30,90 @@ def test_detect_thread(monkeypatch) -> None:
     thr = detect_mod.DetectThread(in_q=in_q, out_q=out_q)
     thr.start()
 
+    before = datetime.utcnow()
     in_q.put(np.zeros((2, 2, 3), dtype=np.uint8))
 
     res = out_q.get(timeout=1.0)
     assert res["ok"] is True
     assert res["shape"] == (2, 2, 3)
+    assert before <= res["ts"] <= datetime.utcnow()  # время съёма из очереди, как у пачек
 
     thr.stop()
     thr.join(timeout=1.0)
     assert thr.state is State.STOPPED
+
+
+class _BatchEngine(_DummyEngine):
+    calls: list[int] = []
+
+    def infer_batch(self, frames, *, camera_ids=None, timestamps=None):
+        self.calls.append(len(frames))
+        return [
+            {"camera_id": cam, "shape": f.shape, "ts": ts}
+            for f, cam, ts in zip(frames, camera_ids, timestamps)
+        ]
+
+
+def test_detect_thread_batches_frames(monkeypatch) -> None:
+    """Кадры копятся в пачку, модель вызывается один раз, результат — по кадрам."""
+    monkeypatch.setattr(detect_mod, "DetectionEngine", _BatchEngine)
+    _BatchEngine.calls = []
+
+    in_q: queue.Queue = queue.Queue()
+    out_q: queue.Queue = queue.Queue()
+    for i in range(4):
+        in_q.put((f"cam{i % 2}", np.zeros((2 + i, 2, 3), dtype=np.uint8)))
+
+    thr = detect_mod.DetectThread(in_q=in_q, out_q=out_q, batch_size=4, batch_wait_ms=200)
+    thr.start()
+    res = [out_q.get(timeout=1.0) for _ in range(4)]
+    thr.stop()
+    thr.join(timeout=1.0)
+
+    assert _BatchEngine.calls == [4]
+    assert [r["camera_id"] for r in res] == ["cam0", "cam1", "cam0", "cam1"]
+    assert [r["shape"][0] for r in res] == [2, 3, 4, 5]
+    assert all(a["ts"] <= b["ts"] for a, b in zip(res, res[1:]))
+
+
+def test_detect_thread_flushes_partial_batch(monkeypatch) -> None:
+    """Неполная пачка уходит в модель по истечении ожидания."""
+    monkeypatch.setattr(detect_mod, "DetectionEngine", _BatchEngine)
+    _BatchEngine.calls = []
+
+    in_q: queue.Queue = queue.Queue()
+    out_q: queue.Queue = queue.Queue()
+    thr = detect_mod.DetectThread(in_q=in_q, out_q=out_q, batch_size=8, batch_wait_ms=10)
+    thr.start()
+    in_q.put(np.zeros((2, 2, 3), dtype=np.uint8))
+    in_q.put(np.zeros((2, 2, 3), dtype=np.uint8))
+    res = [out_q.get(timeout=1.0) for _ in range(2)]
+    thr.stop()
+    thr.join(timeout=1.0)
+
+    assert sum(_BatchEngine.calls) == 2 and max(_BatchEngine.calls) <= 2
+    assert {r["camera_id"] for r in res} == {"cam0"}
+
+
+def test_engine_timestamps_one_rule(monkeypatch) -> None:
+    """Кадр и его детекции — с одним временем; пачка без timestamps — одно время на вызов."""
+
+    def predict(frames):
+        box = np.array([[0, 0, 1, 1]], np.float32)
+        return [RawDetections(box, np.array([0.9]), np.array([0])) for _ in frames]
+
+    stub = SimpleNamespace(name="stub", predict=predict)
+    monkeypatch.setattr(detection_mod, "make_backend", lambda *_, **__: stub)
+    engine = detection_mod.DetectionEngine("stub.pt", device="cpu", wanted_classes=[0])
+    frame = np.zeros((4, 4, 3), np.uint8)
+
+    ts = datetime(2024, 1, 1)
+    batch = engine.infer(frame, timestamp=ts, return_batch=True)
+    assert batch.frame.timestamp == ts and batch.detections[0].timestamp == ts
+
+    batch = engine.infer(frame, return_batch=True)
+    assert batch.detections[0].timestamp == batch.frame.timestamp
+
+    out = engine.infer_batch([frame, frame, frame])
+    stamps = {b.frame.timestamp for b in out} | {d.timestamp for b in out for d in b.detections}
+    assert len(stamps) == 1
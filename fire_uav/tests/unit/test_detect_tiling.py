@@ -0,0 +1,61 @@
+# mypy: ignore-errors
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+import fire_uav.module_core.detect.detection as detection_mod
+from fire_uav.module_core.detect.tiling import tile_grid
+from fire_uav.module_core.interfaces.detector import IInferenceBackend, RawDetections
+
+
+class _BlobBackend(IInferenceBackend):
+    """«Модель» со входом 64 px: белые пятна после уменьшения кадра, как у YOLO мелочь пропадает."""
+
+    name = "blob"
+
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    def predict(self, frames_bgr):
+        self.calls.append(len(frames_bgr))
+        out = []
+        for frame in frames_bgr:
+            scale = 64 / max(frame.shape[:2])
+            small = cv2.resize(
+                frame[..., 0], None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+            n, _, stats, _ = cv2.connectedComponentsWithStats((small > 127).astype(np.uint8))
+            xywh = stats[1:n, :4].astype(np.float32) / scale
+            boxes = np.concatenate([xywh[:, :2], xywh[:, :2] + xywh[:, 2:]], axis=1)
+            out.append(
+                RawDetections(boxes, np.full(n - 1, 0.9, np.float32), np.zeros(n - 1, np.int64))
+            )
+        return out
+
+
+def test_tile_grid_covers_frame() -> None:
+    tiles = tile_grid((1080, 1920), 640, overlap=0.2)
+    assert len(tiles) == 4 * 2
+    assert (tiles[:, 2] - tiles[:, 0] == 640).all() and (tiles[:, 3] - tiles[:, 1] == 640).all()
+    assert tiles[:, 2].max() == 1920 and tiles[:, 3].max() == 1080
+    assert tile_grid((480, 640), 640).tolist() == [[0, 0, 640, 480]]
+
+
+def test_tiled_inference_finds_small_objects(monkeypatch) -> None:
+    """Мелкое пятно находится только в тайлах, крупное склеивается в один бокс кадра."""
+    backend = _BlobBackend()
+    monkeypatch.setattr(detection_mod, "make_backend", lambda *_, **__: backend)
+    frame = np.zeros((480, 640, 3), np.uint8)
+    frame[200:206, 100:106] = 255  # дальний человек: 6 px
+    frame[50:350, 300:600] = 255  # шлейф дыма больше тайла
+
+    whole = detection_mod.DetectionEngine("blob.pt", device="cpu", tile_size=0)
+    assert [d.bbox for d in whole.infer(frame)] == [(300, 50, 600, 350)]
+
+    tiled = detection_mod.DetectionEngine("blob.pt", device="cpu", tile_size=128)
+    backend.calls.clear()
+    boxes = sorted(d.bbox for d in tiled.infer(frame))
+    assert boxes == [(100, 200, 106, 206), (300, 50, 600, 350)]
+    # 6×5 тайлов + весь кадр, пачками по detect_tile_batch
+    assert sum(backend.calls) == 31 and max(backend.calls) <= 8
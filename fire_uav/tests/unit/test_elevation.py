@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pytest
+
+from fire_uav.module_core.route.elevation import ElevationService, profile
+from fire_uav.module_core.schema import Waypoint
+from fire_uav.module_core.terrain.dem import DEMTileStore
+
+N = 121
+
+
+@pytest.fixture()
+def dem(tmp_path: Path) -> DEMTileStore:
+    grid = np.add.outer(np.arange(N)[::-1] * 2, np.arange(N))  # 2 м на строку, 1 м на столбец
+    grid.astype(">i2").tofile(tmp_path / "N55E037.hgt")
+    return DEMTileStore(tmp_path)
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Локальная замена opentopodata: высота = 1000 + lat."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        locations = parse_qs(urlparse(self.path).query)["locations"][0].split("|")
+        results = [{"elevation": 1000 + float(loc.split(",")[0])} for loc in locations]
+        body = json.dumps({"results": results}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:  # noqa: ANN002
+        pass
+
+
+def test_profile_reads_local_dem(dem: DEMTileStore) -> None:
+    route = [Waypoint(lat=55.25, lon=37.5, alt=100.0), Waypoint(lat=55.75, lon=37.1, alt=100.0)]
+    elev = profile(route, ElevationService(dem))
+    assert elev == pytest.approx([0.25 * 120 * 2 + 0.5 * 120, 0.75 * 120 * 2 + 0.1 * 120])
+
+
+def test_http_fallback_only_for_uncovered_points(dem: DEMTileStore) -> None:
+    server = HTTPServer(("127.0.0.1", 0), _StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/v1/test"
+        out = ElevationService(dem, http_url=url).lookup([55.5, 60.0], [37.5, 10.0])
+    finally:
+        server.shutdown()
+    assert out[0] == pytest.approx(0.5 * 120 * 2 + 0.5 * 120)
+    assert out[1] == pytest.approx(1060.0)
+
+
+def test_offline_without_data_returns_nan(tmp_path: Path) -> None:
+    out = profile(
+        [Waypoint(lat=10.0, lon=10.0, alt=50.0)], ElevationService(DEMTileStore(tmp_path))
+    )
+    assert math.isnan(out[0])
@@ -0,0 +1,70 @@
+# mypy: ignore-errors
+from __future__ import annotations
+
+import queue
+
+import numpy as np
+
+import fire_uav.services.components.detect as detect_mod
+from fire_uav.services.components.mailbox import AdaptiveFrameSkipper, FrameMailbox
+
+
+def test_mailbox_keeps_latest_frames() -> None:
+    """put не блокирует: старые кадры вытесняются и считаются, детектор берёт свежие."""
+    latest = FrameMailbox(1)
+    for i in range(5):
+        latest.put_nowait(i)
+    assert latest.get_nowait() == 4 and latest.dropped == 4
+    assert latest.empty()
+
+    ring = FrameMailbox(3)
+    for i in range(5):
+        ring.put(i)
+    assert [ring.get_nowait() for _ in range(3)] == [2, 3, 4] and ring.dropped == 2
+
+    latest.put(7)
+    latest.put(None)  # сигнал остановки вытесняет кадр, но доходит до детектора
+    assert latest.get_nowait() is None
+    latest.put(8)
+    assert latest.get_nowait() == 8 and latest.dropped == 5
+
+
+def test_skipper_adapts_stride_to_latency() -> None:
+    """Камера 30 к/с, инференс 100 мс на кадр → в детектор идёт каждый 4-й кадр."""
+    skipper = AdaptiveFrameSkipper(target_load=0.9)
+    box = FrameMailbox(1, skipper=skipper)
+    assert skipper.admit(0.0)
+    for i in range(1, 30):
+        skipper.admit(i / 30)
+    box.report_latency(0.2, frames=2)
+    assert skipper.stride == 4  # ⌈0.1 / (1/30 · 0.9)⌉
+
+    admitted = [skipper.admit(1 + i / 30) for i in range(12)]
+    assert sum(admitted) == 3
+
+    box.report_latency(0.001)  # детектор разгрузился — k плавно возвращается к 1
+    for _ in range(40):
+        box.report_latency(0.001)
+    assert skipper.stride == 1
+
+
+class _SlowEngine:
+    def __init__(self, *_, **__) -> None: ...
+
+    def infer(self, frame, *, camera_id="cam0", timestamp=None, return_batch=True):
+        return {"shape": frame.shape}
+
+
+def test_detect_thread_reports_latency(monkeypatch) -> None:
+    monkeypatch.setattr(detect_mod, "DetectionEngine", _SlowEngine)
+    skipper = AdaptiveFrameSkipper()
+    in_q = FrameMailbox(1, skipper=skipper)
+    out_q: queue.Queue[dict] = queue.Queue()
+
+    thr = detect_mod.DetectThread(in_q=in_q, out_q=out_q, batch_size=1)
+    thr.start()
+    in_q.put(np.zeros((2, 2, 3), dtype=np.uint8))
+    assert out_q.get(timeout=1.0)["shape"] == (2, 2, 3)
+    thr.stop()
+    thr.join(timeout=1.0)
+    assert skipper._latency is not None
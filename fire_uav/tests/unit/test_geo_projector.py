@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from fire_uav.module_core.fusion.python_projector import PythonGeoProjector
+from fire_uav.module_core.interfaces.geo import IGeoProjector
+from fire_uav.module_core.schema import TelemetrySample
+
+TELEMETRY = TelemetrySample(
+    lat=55.75,
+    lon=37.62,
+    alt=120.0,
+    yaw=30.0,
+    pitch=-5.0,
+    roll=2.0,
+    battery=0.8,
+    timestamp=datetime(2024, 1, 1),
+)
+
+
+def _boxes(n: int = 64) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 1800, (n, 2))
+    wh = rng.uniform(5, 120, (n, 2))
+    return np.hstack([xy, xy + wh])
+
+
+def _per_box(projector: IGeoProjector, boxes: np.ndarray) -> np.ndarray:
+    return np.array(
+        [projector.project_bbox_to_ground(TELEMETRY, tuple(b), 1920, 1080) for b in boxes.tolist()]
+    )
+
+
+def test_python_project_many_matches_per_box() -> None:
+    projector = PythonGeoProjector()
+    boxes = _boxes()
+    out = projector.project_many(TELEMETRY, boxes, 1920, 1080)
+    assert out.shape == (len(boxes), 2)
+    np.testing.assert_allclose(out, _per_box(projector, boxes), rtol=0, atol=1e-10)
+    assert projector.project_many(TELEMETRY, np.empty((0, 4)), 1920, 1080).shape == (0, 2)
+
+
+def test_default_project_many_loops_over_single_projection() -> None:
+    class _Offset(IGeoProjector):
+        def compute_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+            return 0.0
+
+        def project_bbox_to_ground(self, telemetry, bbox, width, height):  # noqa: ANN001
+            return telemetry.lat + bbox[0], telemetry.lon + bbox[1]
+
+    out = _Offset().project_many(TELEMETRY, np.array([[1, 2, 3, 4], [5, 6, 7, 8]]), 10, 10)
+    np.testing.assert_allclose(out, [[56.75, 39.62], [60.75, 43.62]])
+
+
+def test_native_project_many_matches_per_box() -> None:
+    pytest.importorskip("native_core")
+    from fire_uav.module_core.native.geo import NativeGeoProjector
+
+    projector = NativeGeoProjector()
+    boxes = _boxes()
+    out = projector.project_many(TELEMETRY, boxes, 1920, 1080)
+    np.testing.assert_allclose(out, _per_box(projector, boxes), rtol=0, atol=1e-10)
+    with pytest.raises(ValueError):
+        projector.project_many(TELEMETRY, np.zeros((3, 3)), 1920, 1080)
@@ -17,4 +17,6 @@ def test_metrics_endpoint_ok():
     assert re.search(r"^camera_fps\s+\d+", text, re.MULTILINE)
     assert re.search(r"^detector_latency_seconds_bucket", text, re.MULTILINE)
     assert re.search(r"^detector_queue_size\s+\d+", text, re.MULTILINE)
+    assert re.search(r"^detector_frames_dropped_total\s+\d+", text, re.MULTILINE)
+    assert re.search(r"^detector_frames_skipped_total\s+\d+", text, re.MULTILINE)
     assert re.search(r"^coverage_percent\s+\d+(\.\d+)?", text, re.MULTILINE)
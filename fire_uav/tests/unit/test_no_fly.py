@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Point, Polygon, mapping
+
+from fire_uav.module_core.route import avoidance, no_fly
+from fire_uav.module_core.route.avoidance import nfz_avoider
+from fire_uav.module_core.route.no_fly import (
+    load_no_fly,
+    load_zones,
+    segment_violates_nfz,
+    subtract_no_fly,
+)
+
+
+def _write_zones(path: Path, centers: list[tuple[float, float]], r: float = 0.002) -> None:
+    feats = [
+        {"type": "Feature", "properties": {}, "geometry": mapping(Point(lon, lat).buffer(r))}
+        for lat, lon in centers
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": feats}))
+
+
+def _grid_centers(n: int) -> list[tuple[float, float]]:
+    rng = np.random.default_rng(0)
+    return [(56.0 + a, 37.0 + b) for a, b in rng.uniform(-1.0, 1.0, (n, 2))]
+
+
+def test_zones_are_cached_by_mtime(tmp_path: Path) -> None:
+    fn = tmp_path / "nfz.geojson"
+    _write_zones(fn, [(56.0, 37.0)])
+    zones = load_zones(fn)
+    assert zones is load_zones(str(fn)) and len(zones) == 1
+
+    _write_zones(fn, [(56.0, 37.0), (56.01, 37.01)])
+    st = fn.stat()
+    os.utime(fn, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert len(load_zones(fn)) == 2
+    assert load_zones(tmp_path / "missing.geojson") is None
+    assert subtract_no_fly(Point(0, 0).buffer(1), tmp_path / "missing.geojson").area > 3
+
+
+def test_subtract_matches_full_union(tmp_path: Path) -> None:
+    fn = tmp_path / "nfz.geojson"
+    _write_zones(fn, _grid_centers(2000))
+    aoi = Polygon([(36.9, 55.9), (37.1, 55.9), (37.1, 56.05), (36.9, 56.05)])
+    expected = aoi.difference(load_no_fly(fn))
+    got = subtract_no_fly(aoi, fn)
+    assert got.area == pytest.approx(expected.area, rel=1e-9)
+    assert shapely.symmetric_difference(got, expected).area < 1e-12
+    # AOI вдали от всех зон возвращается без изменений
+    far = Polygon([(40, 60), (40.01, 60), (40.01, 60.01)])
+    assert subtract_no_fly(far, fn) is far
+
+
+def test_segment_violates_nfz(tmp_path: Path) -> None:
+    fn = tmp_path / "nfz.geojson"
+    _write_zones(fn, [(56.0, 37.0)], r=0.01)
+    assert segment_violates_nfz((55.98, 37.0), (56.02, 37.0), fn)
+    assert not segment_violates_nfz((55.98, 37.02), (56.02, 37.02), fn)
+    assert not segment_violates_nfz((55.98, 37.0), (56.02, 37.0), None)
+
+    zones = load_zones(fn)
+    hit = zones.segments_violate([55.98, 55.98], [37.0, 37.02], [56.02, 56.02], [37.0, 37.02])
+    assert hit.tolist() == [True, False]
+
+
+def test_cache_is_bounded(tmp_path: Path) -> None:
+    no_fly._zones_cache.clear()
+    for i in range(no_fly._CACHE_SIZE + 2):
+        fn = tmp_path / f"nfz{i}.geojson"
+        _write_zones(fn, [(56.0, 37.0 + i)])
+        load_zones(fn)
+    assert len(no_fly._zones_cache) == no_fly._CACHE_SIZE
+
+
+def _leg_clear(path: list[tuple[float, float]], zones) -> bool:
+    lat, lon = np.array(path).T
+    return not zones.segments_violate(lat[:-1], lon[:-1], lat[1:], lon[1:]).any()
+
+
+def test_avoider_detours_around_zone_and_caches_graph(tmp_path: Path) -> None:
+    fn = tmp_path / "nfz.geojson"
+    _write_zones(fn, [(56.0, 37.0), (56.0, 37.02)])
+    avoider = nfz_avoider(fn, margin_m=20.0)
+    assert avoider is nfz_avoider(fn, margin_m=20.0)
+
+    start, end = (56.0, 36.98), (56.0, 37.04)
+    assert segment_violates_nfz(start, end, fn)
+    path = avoider.path(start, end)
+    assert path is not None and path[0] == start and path[-1] == end and len(path) > 2
+    assert _leg_clear(path, avoider.zones)
+    assert avoider.is_clear(*np.array(path).T)  # и с отступом
+    obs = avoider._obstacles(avoidance._SLACK_M)
+    rows = len(obs._rows)
+    assert rows and avoider.path(start, end) == path
+    assert avoider._obstacles(avoidance._SLACK_M) is obs and len(obs._rows) == rows  # граф из кэша
+
+    assert avoider.path((56.1, 36.98), (56.1, 37.04)) == [(56.1, 36.98), (56.1, 37.04)]
+    assert avoider.path(start, (56.0, 37.0)) is None  # цель внутри зоны
+
+
+def test_maneuver_avoids_no_fly_zones(tmp_path: Path) -> None:
+    from types import SimpleNamespace
+
+    from fire_uav.module_core.route.maneuvers import build_maneuver
+    from fire_uav.module_core.schema import Route, TelemetrySample, Waypoint
+
+    fn = tmp_path / "nfz.geojson"
+    _write_zones(fn, [(56.0, 37.0)])
+    settings = SimpleNamespace(
+        no_fly_geojson=str(fn), nfz_margin_m=20.0, maneuver_alt_m=60.0, orbit_radius_m=100.0
+    )
+    energy = SimpleNamespace(energy_cost=lambda route: 0.0, remaining_energy=lambda state: 1.0)
+    state = TelemetrySample(lat=56.0, lon=36.99, alt=60.0, battery=1.0)
+    base = Route(version=1, waypoints=[Waypoint(lat=56.0, lon=37.01, alt=60.0)])
+    zones = load_zones(fn)
+
+    # цель в 200 м от края зоны: орбита 100 м её не задевает, подлёт и возврат — в обход
+    target = (56.0, 37.0 + 0.002 + 200 / 62_300)
+    route = build_maneuver(state, *target, base, energy, settings)
+    assert route is not None
+    assert _leg_clear([(wp.lat, wp.lon) for wp in route.waypoints], zones)
+
+    # цель в 60 м от края: орбита сжимается, но остаётся вне зоны с отступом
+    near = (56.0, 37.0 + 0.002 + 60 / 62_300)
+    route = build_maneuver(state, *near, base, energy, settings)
+    assert route is not None
+    assert _leg_clear([(wp.lat, wp.lon) for wp in route.waypoints], zones)
+
+    assert build_maneuver(state, 56.0, 37.0, base, energy, settings) is None  # цель в зоне
+
+    # маленькая зона внутри радиуса орбиты: выход на окружность и возврат в центр — в обход
+    inner = tmp_path / "inner.geojson"
+    _write_zones(inner, [(56.0, 37.0 + 25 / 62_300)], r=5 / 62_300)
+    settings = SimpleNamespace(
+        no_fly_geojson=str(inner), nfz_margin_m=5.0, maneuver_alt_m=60.0, orbit_radius_m=50.0
+    )
+    route = build_maneuver(state, 56.0, 37.0, base, energy, settings)
+    assert route is not None
+    assert _leg_clear([(wp.lat, wp.lon) for wp in route.waypoints], load_zones(inner))
+
+
+def test_planner_rejoin_avoids_no_fly_zones(tmp_path: Path) -> None:
+    from types import SimpleNamespace
+
+    from fire_uav.module_core.route.python_planner import PythonRoutePlanner
+    from fire_uav.module_core.schema import Route, Waypoint
+
+    fn = tmp_path / "nfz.geojson"
+    _write_zones(fn, [(56.0, 37.0)])
+    energy = SimpleNamespace(energy_cost=lambda route: 0.0, remaining_energy=lambda state: 1.0)
+    settings = SimpleNamespace(no_fly_geojson=str(fn), nfz_margin_m=20.0)
+    planner = PythonRoutePlanner(energy_model=energy, settings=settings)
+
+    exit_wp = Waypoint(lat=56.0, lon=36.99, alt=60.0)
+    base = Route(version=1, waypoints=[Waypoint(lat=56.0, lon=37.01, alt=60.0)])
+    assert segment_violates_nfz((56.0, 36.99), (56.0, 37.01), fn)
+    path = planner.plan_rejoin(exit_wp, base)
+    assert len(path) > 2 and path[0] == exit_wp and path[-1] == base.waypoints[0]
+    assert _leg_clear([(wp.lat, wp.lon) for wp in path], load_zones(fn))
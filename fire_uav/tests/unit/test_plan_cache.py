@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from shapely.geometry import Polygon
+
+import fire_uav.module_core.route.planner as planner_mod
+from fire_uav.module_core.route.plan_cache import PlanCache, plan_key
+
+SQUARE = Polygon([(37.0, 56.0), (37.01, 56.0), (37.01, 56.006), (37.0, 56.006)])
+
+
+def test_key_ignores_ring_order_but_not_params(tmp_path: Path) -> None:
+    nfz = tmp_path / "nfz.geojson"
+    nfz.write_text('{"type": "FeatureCollection", "features": []}')
+    shifted = Polygon(list(SQUARE.exterior.coords)[2:-1] + list(SQUARE.exterior.coords)[:3])
+    reversed_ring = Polygon(list(SQUARE.exterior.coords)[::-1])
+    key = plan_key(SQUARE, {"gsd": 2.5}, nfz)
+    assert plan_key(shifted, {"gsd": 2.5}, nfz) == key
+    assert plan_key(reversed_ring.wkt, {"gsd": 2.5}, nfz) == key
+    assert plan_key(SQUARE, {"gsd": 3.0}, nfz) != key
+
+    st = nfz.stat()
+    os.utime(nfz, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert plan_key(SQUARE, {"gsd": 2.5}, nfz) != key
+
+
+def test_cache_lru_and_disk_round_trip(tmp_path: Path) -> None:
+    cache = PlanCache(tmp_path, max_entries=2)
+    for i in range(3):
+        cache.put(f"k{i}", [[(56.0 + i, 37.0, 100.0)]])
+    assert len(cache) == 2
+    # вытесненный из памяти план читается с диска
+    assert cache.get("k0") == [[(56.0, 37.0, 100.0)]]
+    assert PlanCache(tmp_path).get("k2") == [[(58.0, 37.0, 100.0)]]
+    assert PlanCache(None).get("k2") is None
+
+    (tmp_path / "broken.json").write_text("{not json")
+    assert cache.get("broken") is None
+
+
+def test_build_route_reuses_cached_plan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(planner_mod, "_plan_cache", PlanCache(tmp_path))
+    calls = []
+    generate = planner_mod.FlightPlanner.generate
+
+    def counting_generate(self):  # noqa: ANN001, ANN202
+        calls.append(1)
+        return generate(self)
+
+    monkeypatch.setattr(planner_mod.FlightPlanner, "generate", counting_generate)
+    first = planner_mod.build_route(SQUARE.wkt, 3)
+    second = planner_mod.build_route(SQUARE.wkt, 3)
+    assert first == second and sum(len(m) for m in first) > 0
+    assert len(calls) == 1
+    second[0].clear()  # результат — копия, кэш не портится
+    assert planner_mod.build_route(SQUARE.wkt, 3) == first
+
+    planner_mod.build_route(SQUARE.wkt, 4)
+    assert len(calls) == 2
+    assert len(list(tmp_path.glob("*.json"))) == 2
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+import shapely
+from shapely import affinity
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon
+
+from fire_uav.module_core.geometry import haversine_m, offset_latlon
+from fire_uav.module_core.route.energy import EnergyModel
+from fire_uav.module_core.route.local_frame import LocalFrame
+from fire_uav.module_core.route.local_search import (
+    improve_tour,
+    nearest_neighbor_tour,
+    tour_length,
+)
+from fire_uav.module_core.route.orientation import best_orientation, candidate_angles
+from fire_uav.module_core.route.ordering import ROUTE_ORDERINGS, order_segments, path_length
+from fire_uav.module_core.route.partition import partition_aoi
+from fire_uav.module_core.route.planner import FlightPlanner, GridParams, build_fleet_routes
+from fire_uav.module_core.route.sweep import sweep_polygon
+from fire_uav.module_core.route.tsp import COST_SCALE, distance_matrix, solve_path
+
+LAT0, LON0 = 56.0, 37.0
+
+
+def _square(side_m: float) -> Polygon:
+    """Квадрат side_m × side_m (x = lon, y = lat) с юго-западным углом в (LAT0, LON0)."""
+    lat1, lon1 = offset_latlon(LAT0, LON0, side_m, side_m)
+    return Polygon([(LON0, LAT0), (lon1, LAT0), (lon1, lat1), (LON0, lat1)])
+
+
+def test_local_frame_round_trip() -> None:
+    frame = LocalFrame(LAT0, LON0)
+    lon = LON0 + np.linspace(-0.05, 0.05, 11)
+    lat = LAT0 + np.linspace(-0.05, 0.05, 11)
+    x, y = frame.to_local(lon, lat)
+    back_lon, back_lat = frame.to_geo(x, y)
+    np.testing.assert_allclose(back_lon, lon, atol=1e-12)
+    np.testing.assert_allclose(back_lat, lat, atol=1e-12)
+    # на ~5 км метры ENU совпадают с гаверсинусом в пределах 0.1 %
+    dist = haversine_m((lat[-1], lon[-1]), (LAT0, LON0))
+    assert math.isclose(math.hypot(x[-1], y[-1]), dist, rel_tol=1e-3)
+
+
+def test_grid_spacing_is_metric_at_high_latitude() -> None:
+    side = 1_000.0
+    fp = FlightPlanner(_square(side), grid=GridParams(gsd_target_cm=2.0))
+    lines = fp.build_grid()
+    assert len(lines) == math.floor(side / fp.line_spacing_m) + 1
+
+    # соседние галсы отстоят на line_spacing_m (меряем по широте западных концов)
+    lats = sorted(min(ln.coords, key=lambda c: c[0])[1] for ln in lines)
+    gaps = [haversine_m((a, LON0), (b, LON0)) for a, b in zip(lats, lats[1:])]
+    assert max(abs(g - fp.line_spacing_m) for g in gaps) < 0.01 * fp.line_spacing_m
+
+    # точки съёмки вдоль галса — не дальше forward_spacing_m друг от друга
+    wps = fp.lines_to_waypoints(lines[:1])
+    steps = [haversine_m((a.lat, a.lon), (b.lat, b.lon)) for a, b in zip(wps, wps[1:])]
+    assert len(wps) == math.ceil(side / fp.forward_spacing_m) + 1
+    assert max(steps) <= fp.forward_spacing_m * 1.01
+    assert all(wp.alt == fp.altitude_m for wp in wps)
+
+
+def test_rotated_grid_stays_inside_aoi() -> None:
+    aoi = _square(600.0)
+    fp = FlightPlanner(aoi, grid=GridParams(orientation_deg=30.0))
+    wps = fp.lines_to_waypoints(fp.build_grid())
+    assert wps
+    inside = aoi.buffer(1e-7)
+    assert all(inside.contains(Point(wp.lon, wp.lat)) for wp in wps)
+
+
+def _reference_length(poly: Polygon, spacing: float) -> float:
+    """Прежний способ: по одной линии и shapely.intersection на строку."""
+    minx, miny, maxx, maxy = poly.bounds
+    total, y = 0.0, miny
+    while y < maxy - 1e-9:
+        total += LineString([(minx - 1, y), (maxx + 1, y)]).intersection(poly).length
+        y += spacing
+    return total
+
+
+def test_sweep_matches_shapely_intersections() -> None:
+    outer = Polygon([(0, 0), (400, -50), (520, 300), (180, 420), (-60, 250)])
+    holed = outer.difference(Point(200, 180).buffer(70))
+    parts = MultiPolygon([holed, Polygon([(700, 0), (900, 0), (800, 150)])])
+    for geom in (outer, holed, parts):
+        sweep = sweep_polygon(geom, 12.5)
+        assert len(sweep)
+        assert np.isclose(sweep.lengths().sum(), _reference_length(geom, 12.5), rtol=1e-9)
+        # все отрезки горизонтальны и лежат внутри полигона
+        np.testing.assert_allclose(sweep.start[:, 1], sweep.end[:, 1])
+        mids = shapely.points((sweep.start + sweep.end) / 2)
+        assert shapely.contains(geom.buffer(1e-6), mids).all()
+
+
+def test_sweep_rotation_and_photo_points() -> None:
+    square = Polygon([(0, 0), (300, 0), (300, 300), (0, 300)])
+    sweep = sweep_polygon(square, 20.0, angle_deg=90.0)
+    d = sweep.end - sweep.start
+    np.testing.assert_allclose(d[:, 0], 0.0, atol=1e-9)  # галсы вдоль оси Y
+    assert np.all(d[0::2, 1] > 0) and np.all(d[1::2, 1] < 0)  # зиг-заг
+
+    pts, seg = sweep.photo_points(7.0)
+    assert np.bincount(seg).min() >= 2
+    gaps = np.hypot(*np.diff(pts, axis=0).T)[np.diff(seg) == 0]
+    assert gaps.max() <= 7.0 + 1e-9
+
+
+def test_segment_ordering_keeps_lines_and_shortens_route() -> None:
+    # U-образный AOI: зиг-заг постоянно перелетает через вырез
+    u_shape = Polygon(
+        [(0, 0), (900, 0), (900, 600), (600, 600), (600, 200), (300, 200), (300, 600), (0, 600)]
+    )
+    sweep = sweep_polygon(u_shape, 25.0)
+    ordered = order_segments(sweep)
+    assert len(ordered) == len(sweep)
+    np.testing.assert_array_equal(ordered.start[0], sweep.start[0])
+    # каждый галс пройден целиком, в одном из направлений
+    before = {
+        tuple(np.round(np.sort([s, e], axis=0).ravel(), 6)) for s, e in zip(sweep.start, sweep.end)
+    }
+    after = {
+        tuple(np.round(np.sort([s, e], axis=0).ravel(), 6))
+        for s, e in zip(ordered.start, ordered.end)
+    }
+    assert before == after
+    zigzag = path_length(sweep.photo_points(10.0)[0])
+    assert path_length(ordered.photo_points(10.0)[0]) < 0.8 * zigzag
+
+
+def test_planner_ordering_modes() -> None:
+    aoi = _square(400.0)
+    for mode in ROUTE_ORDERINGS:
+        missions = FlightPlanner(aoi, ordering=mode).generate()
+        assert sum(len(m) for m in missions) > 0
+    with pytest.raises(ValueError):
+        FlightPlanner(aoi, ordering="spiral")
+
+
+def test_distance_matrix_and_tsp_permutation() -> None:
+    rng = np.random.default_rng(3)
+    xy = rng.uniform(0, 2_000, (700, 2))
+    cost = distance_matrix(xy)
+    ref = np.hypot(*(xy[:, None, :] - xy[None, :, :]).transpose(2, 0, 1)) * COST_SCALE
+    np.testing.assert_array_equal(cost, np.rint(ref).astype(np.int64))
+
+    order = solve_path(cost[:200, :200], time_limit_s=0.5)
+    assert order is not None and order[0] == 0
+    assert sorted(order) == list(range(200))
+    assert path_length(xy[order]) < 0.5 * path_length(xy[:200])
+
+
+def test_tsp_time_limit_includes_setup() -> None:
+    xy = np.random.default_rng(5).uniform(0, 2_000, (300, 2))
+    warm = improve_tour(xy, start=0, time_budget_s=0.2).tolist()
+    # лимит съеден подготовкой — возвращается тёплый старт, а не None
+    assert solve_path(distance_matrix(xy), time_limit_s=0.0, initial=warm) == warm
+
+
+def test_planner_falls_back_to_local_search_above_node_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import fire_uav.module_core.route.planner as planner_mod
+
+    def no_solver(*args: object, **kwargs: object) -> None:
+        raise AssertionError("OR-Tools must not be called above route_ortools_max_nodes")
+
+    monkeypatch.setitem(planner_mod.settings, "route_ortools_max_nodes", 10)
+    monkeypatch.setitem(planner_mod.settings, "route_tsp_time_limit_s", 0.5)
+    monkeypatch.setattr(planner_mod, "solve_path", no_solver)
+    fp = FlightPlanner(_square(500.0), ordering="tsp", optimizer="ortools")
+    wps = [wp for m in fp.generate() for wp in m]
+    assert len(wps) == len(fp.sweep().photo_points(fp.forward_spacing_m)[0]) > 10
+
+
+@pytest.mark.parametrize("closed", [True, False])
+def test_local_search_improves_nearest_neighbour(closed: bool) -> None:
+    xy = np.random.default_rng(7).uniform(0, 3_000, (600, 2))
+    nn = nearest_neighbor_tour(xy, start=5)
+    tour = improve_tour(xy, start=5, closed=closed, time_budget_s=5.0)
+    assert tour[0] == 5
+    assert sorted(tour.tolist()) == list(range(len(xy)))
+    assert tour_length(xy, tour, closed=closed) < 0.9 * tour_length(xy, nn, closed=closed)
+
+
+def test_planner_without_ortools_uses_local_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    import fire_uav.module_core.route.ordering as ordering_mod
+    import fire_uav.module_core.route.planner as planner_mod
+
+    monkeypatch.setattr(planner_mod, "HAVE_ORTOOLS", False)
+    monkeypatch.setattr(ordering_mod, "HAVE_ORTOOLS", False)
+    aoi = _square(500.0)
+    for mode in ROUTE_ORDERINGS:
+        fp = FlightPlanner(aoi, ordering=mode)
+        assert fp.optimizer == "local_search"
+        wps = [wp for m in fp.generate() for wp in m]
+        assert len(wps) == len(fp.sweep().photo_points(fp.forward_spacing_m)[0])
+
+
+def test_replan_continues_previous_plan() -> None:
+    fp = FlightPlanner(_square(800.0))
+    flat = [wp for m in fp.generate() for wp in m]
+    cut = len(flat) // 2 + 3  # посреди галса
+    rest = [wp for m in fp.replan(flat[:cut]) for wp in m]
+    # та же сетка и тот же порядок: остаток начинается с последней отснятой точки
+    expected = np.array([(wp.lat, wp.lon) for wp in flat[cut - 1 :]])
+    got = np.array([(wp.lat, wp.lon) for wp in rest])
+    assert got.shape == expected.shape
+    assert np.allclose(got, expected, atol=1e-9)
+
+    # покрытие копится: после пролёта остатка снимать нечего
+    assert fp.replan([(wp.lat, wp.lon, wp.alt) for wp in rest]) == []
+
+
+def test_replan_edited_aoi_keeps_grid() -> None:
+    aoi = _square(400.0)
+    fp = FlightPlanner(aoi)
+    flat = [wp for m in fp.generate() for wp in m]
+    bigger = affinity.scale(aoi, 1.5, 1.5, origin=(LON0, LAT0))
+    rest = [wp for m in fp.replan(flat, aoi=bigger) for wp in m]
+    assert rest
+
+    x_old, y_old = fp.frame.to_local([wp.lon for wp in flat], [wp.lat for wp in flat])
+    x, y = fp.frame.to_local([wp.lon for wp in rest], [wp.lat for wp in rest])
+    # новые галсы — на продолжении прежней сетки строк
+    phase = (y - y_old.min()) / fp.line_spacing_m
+    assert np.allclose(phase, np.round(phase), atol=1e-6)
+    # отснятый квадрат повторно не снимается (кроме стыка на его границе)
+    assert np.all((x >= x_old.max() - 1e-6) | (y > y_old.max() + 1e-6))
+
+
+def test_partition_is_balanced_and_tiles_aoi() -> None:
+    aoi = Polygon([(0, 0), (4000, 0), (4000, 2500), (2000, 3500), (0, 2500)]).difference(
+        Polygon([(1500, 1000), (2500, 1000), (2500, 1800), (1500, 1800)])
+    )
+    launch = np.array([(-500.0, 0.0), (4500.0, 0.0), (2000.0, 4000.0), (2000.0, -800.0)])
+    parts = partition_aoi(aoi, launch, swath_m=50.0)
+    assert len(parts) == 4
+    assert sum(p.area for p in parts) == pytest.approx(aoi.area, rel=1e-9)
+    assert shapely.union_all(parts).area == pytest.approx(aoi.area, rel=1e-9)
+    transit = [p.centroid.distance(Point(*xy)) for p, xy in zip(parts, launch)]
+    load = np.array([p.area for p in parts]) / 50.0 + 2 * np.array(transit)
+    assert load.max() / load.min() < 1.1
+    # каждый дрон получает часть со своей стороны AOI
+    assert parts[0].centroid.x < 2000 < parts[1].centroid.x
+    assert parts[2].centroid.y > parts[3].centroid.y
+
+
+def test_fleet_routes_parallel_matches_inline() -> None:
+    aoi = _square(1200.0)
+    lat1, lon1 = offset_latlon(LAT0, LON0, 1200.0, 1200.0)
+    launch = [(LAT0, LON0), (lat1, lon1), (LAT0, lon1)]
+    inline = build_fleet_routes(aoi.wkt, launch, workers=1)
+    assert build_fleet_routes(aoi.wkt, launch, workers=3) == inline
+    assert len(inline) == 3 and all(inline)
+    # каждый маршрут начинается ближе к своей точке старта, чем к чужим
+    for k, missions in enumerate(inline):
+        lat, lon, _ = missions[0][0]
+        d = [haversine_m((lat, lon), home) for home in launch]
+        assert int(np.argmin(d)) == k
+
+
+def test_orientation_search_aligns_with_long_side() -> None:
+    strip = affinity.rotate(Polygon([(0, 0), (5000, 0), (5000, 800), (0, 800)]), 33, origin=(0, 0))
+    assert 33.0 in candidate_angles(strip)
+    choice = best_orientation(strip, 40.0, EnergyModel(), baseline_deg=90.0)
+    assert choice.angle_deg == pytest.approx(33.0)
+    assert choice.baseline_angle_deg == 90.0
+    assert choice.savings_s > 0 and 0 < choice.savings_pct < 100
+
+    fp = FlightPlanner(LocalFrame(LAT0, LON0).geom_to_geo(strip))
+    assert fp.optimise_orientation().angle_deg == pytest.approx(33.0, abs=0.5)
+    assert fp.grid.orientation_deg == pytest.approx(33.0, abs=0.5)
+    # галсы идут вдоль длинной стороны: их немного
+    assert len(fp.sweep()) < 800 / fp.line_spacing_m + 3
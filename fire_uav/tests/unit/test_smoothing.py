@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from fire_uav.module_core.detections import assignment as assignment_mod
+from fire_uav.module_core.detections.smoothing import (
+    BBoxSmoother,
+    NativeBBoxSmoother,
+    iou_matrix,
+)
+
+T0 = datetime(2024, 1, 1)
+
+
+def _det(cls: int, bbox: tuple[int, int, int, int], t: float = 0.0) -> SimpleNamespace:
+    return SimpleNamespace(
+        class_id=cls,
+        confidence=0.8,
+        bbox=bbox,
+        timestamp=T0 + timedelta(seconds=t),
+        track_id=None,
+    )
+
+
+def test_iou_matrix_basic() -> None:
+    a = np.array([[0, 0, 10, 10], [100, 100, 110, 110]], dtype=np.float64)
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10]], dtype=np.float64)
+    m = iou_matrix(a, b)
+    assert m.shape == (2, 2)
+    assert np.isclose(m[0, 0], 1.0)
+    assert np.isclose(m[0, 1], 50.0 / 150.0)
+    assert np.all(m[1] == 0.0)
+
+
+def test_tracks_keep_ids_and_respect_class() -> None:
+    sm = BBoxSmoother()
+    first = sm.assign_and_smooth(
+        [_det(0, (0, 0, 50, 50)), _det(1, (0, 0, 50, 50)), _det(0, (300, 300, 340, 340))]
+    )
+    ids = [tid for _, _, tid in first]
+    assert ids == [0, 1, 2]
+
+    # порядок детекций перемешан, боксы слегка сдвинуты
+    second = sm.assign_and_smooth(
+        [
+            _det(0, (305, 302, 345, 342), 0.1),
+            _det(1, (2, 2, 52, 52), 0.1),
+            _det(0, (3, 1, 53, 51), 0.1),
+        ],
+    )
+    assert [tid for _, _, tid in second] == [2, 1, 0]
+    _, smoothed, _ = second[2]
+    assert smoothed == (1.5, 0.5, 51.5, 50.5)
+
+
+def test_stale_tracks_are_pruned() -> None:
+    sm = BBoxSmoother(max_age_seconds=1.0)
+    sm.assign_and_smooth([_det(0, (0, 0, 50, 50))])
+    out = sm.assign_and_smooth([_det(0, (0, 0, 50, 50), 5.0)])
+    assert out[0][2] == 1
+    assert list(sm.tracks) == [1]
+
+
+def test_hungarian_avoids_id_switch_on_split() -> None:
+    # жадный отдаёт треку 0 лучшую детекцию, и трек 1 остаётся без пары
+    scores = np.array([[0.9, 0.33], [0.36, -np.inf]])
+    rows, cols = assignment_mod.assign_max_score(scores)
+    assert dict(zip(rows.tolist(), cols.tolist())) == {0: 1, 1: 0}
+
+    new_tracks = {}
+    for mode in ("greedy", "hungarian"):
+        sm = BBoxSmoother(assignment=mode, iou_threshold=0.3, max_center_distance_px=0.0)
+        sm.assign_and_smooth([_det(0, (100, 0, 200, 100)), _det(0, (140, 0, 240, 100))])
+        out = sm.assign_and_smooth(
+            [_det(0, (100, 0, 190, 100), 0.1), _det(0, (50, 0, 150, 100), 0.1)]
+        )
+        new_tracks[mode] = sum(tid >= 2 for _, _, tid in out)
+    assert new_tracks == {"greedy": 1, "hungarian": 0}
+
+
+def test_lsap_fallback_matches_scipy() -> None:
+    pytest.importorskip("scipy")
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        nr, nc = rng.integers(1, 8, 2)
+        cost = rng.integers(0, 3, (nr, nc)).astype(np.float64)
+        ref = assignment_mod.linear_sum_assignment(cost)
+        got = assignment_mod._shortest_augmenting_path(cost)
+        assert np.array_equal(ref[0], got[0]) and np.array_equal(ref[1], got[1])
+
+
+def test_kalman_keeps_id_of_fast_moving_box() -> None:
+    # 25 px/кадр при ширине 50 px: EMA отстаёт на шаг и теряет пересечение с детекцией
+    ids = {}
+    for model in ("none", "kalman"):
+        sm = BBoxSmoother(motion_model=model, max_center_distance_px=0.0)
+        out = [
+            sm.assign_and_smooth([_det(0, (25 * i, 100, 25 * i + 50, 150), 0.1 * i)])
+            for i in range(12)
+        ]
+        ids[model] = {res[0][2] for res in out}
+    assert ids["kalman"] == {0}
+    assert len(ids["none"]) > 1
+
+
+def test_kalman_compensates_yaw() -> None:
+    frame = (1000, 1000)
+    sm = BBoxSmoother(motion_model="kalman", max_center_distance_px=0.0)
+    sm.assign_and_smooth(
+        [_det(0, (780, 480, 820, 520))], telemetry=SimpleNamespace(yaw=350.0), frame_size=frame
+    )
+    # БПЛА повернул на +20° (через 0°): точка (800, 500) ушла на дугу вокруг центра
+    out = sm.assign_and_smooth(
+        [_det(0, (762, 377, 802, 417), 0.1)], telemetry=SimpleNamespace(yaw=10.0), frame_size=frame
+    )
+    assert out[0][2] == 0
+
+    plain = BBoxSmoother(motion_model="kalman", yaw_compensation=False, max_center_distance_px=0.0)
+    plain.assign_and_smooth(
+        [_det(0, (780, 480, 820, 520))], telemetry=SimpleNamespace(yaw=350.0), frame_size=frame
+    )
+    out = plain.assign_and_smooth(
+        [_det(0, (762, 377, 802, 417), 0.1)], telemetry=SimpleNamespace(yaw=10.0), frame_size=frame
+    )
+    assert out[0][2] == 1
+
+
+def _random_frames(seed: int, n_frames: int = 30) -> list[list[SimpleNamespace]]:
+    rng = random.Random(seed)
+    objs = [(rng.uniform(0, 600), rng.uniform(0, 400), rng.randrange(2)) for _ in range(25)]
+    frames = []
+    for f in range(n_frames):
+        dets = [
+            _det(
+                cls,
+                (
+                    int(x + rng.gauss(0, 8)),
+                    int(y + rng.gauss(0, 8)),
+                    int(x + 60 + rng.gauss(0, 8)),
+                    int(y + 60 + rng.gauss(0, 8)),
+                ),
+                0.05 * f,
+            )
+            for x, y, cls in objs
+            if rng.random() > 0.15
+        ]
+        rng.shuffle(dets)
+        frames.append(dets)
+    return frames
+
+
+@pytest.mark.parametrize("mode", ["greedy", "hungarian"])
+def test_native_tracker_matches_python(mode: str) -> None:
+    pytest.importorskip("native_core")
+    py_sm = BBoxSmoother(assignment=mode)
+    nat_sm = NativeBBoxSmoother(assignment=mode)
+    for dets in _random_frames(1):
+        py_out = [(tid, box) for _, box, tid in py_sm.assign_and_smooth(dets)]
+        nat_out = [(tid, box) for _, box, tid in nat_sm.assign_and_smooth(dets)]
+        assert py_out == nat_out
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fire_uav.domain.video.camera import CameraParams
+from fire_uav.module_core.fusion.python_projector import PythonGeoProjector
+from fire_uav.module_core.fusion.terrain_projector import TerrainGeoProjector
+from fire_uav.module_core.geometry import EARTH_RADIUS_M
+from fire_uav.module_core.schema import TelemetrySample
+from fire_uav.module_core.terrain.dem import DEMTileStore
+
+N = 121  # отсчётов на градус в тестовой плитке
+M_PER_ROW = EARTH_RADIUS_M * math.radians(1.0 / (N - 1))
+
+
+def _write_hgt(path: Path, grid: np.ndarray) -> None:
+    grid.astype(">i2").tofile(path)
+
+
+def _slope_tile(tmp_path: Path, rise_per_row: int = 20) -> Path:
+    # высота растёт к северу на rise_per_row метров на строку, по долготе постоянна
+    rows_from_south = np.arange(N)[::-1, None]
+    _write_hgt(tmp_path / "N55E037.hgt", 100 + rise_per_row * rows_from_south + 0 * np.arange(N))
+    return tmp_path
+
+
+def test_hgt_bilinear_and_voids(tmp_path: Path) -> None:
+    grid = np.add.outer(np.arange(N)[::-1] * 3, np.arange(N) * 2)  # линейная по lat и lon
+    grid[0, 0] = -32768
+    _write_hgt(tmp_path / "N55E037.hgt", grid)
+    dem = DEMTileStore(tmp_path, max_open_tiles=1)
+    assert len(dem) == 1
+
+    lats = np.array([55.5, 55.0, 55.123])
+    lons = np.array([37.5, 37.0, 37.777])
+    expected = (lats - 55.0) * (N - 1) * 3 + (lons - 37.0) * (N - 1) * 2
+    np.testing.assert_allclose(dem.elevation(lats, lons), expected, atol=1e-6)
+    # вне покрытия и рядом с void — NaN
+    out = dem.elevation([54.5, 55.9999], [37.5, 37.0001])
+    assert np.isnan(out).all()
+
+
+def test_geotiff_tile(tmp_path: Path) -> None:
+    tifffile = pytest.importorskip("tifffile")
+    heights = np.add.outer(np.arange(50)[::-1] * 4.0, np.arange(40) * 1.0).astype(np.float32)
+    d = 0.001
+    tifffile.imwrite(
+        tmp_path / "dem.tif",
+        heights,
+        extratags=[
+            (33550, "d", 3, (d, d, 0.0)),
+            (33922, "d", 6, (0.0, 0.0, 0.0, 10.0, 60.0, 0.0)),
+            (34735, "H", 8, (1, 1, 0, 1, 1024, 0, 1, 2)),
+        ],
+    )
+    dem = DEMTileStore(tmp_path)
+    # центр пикселя (row, col) = (60 - (row + 0.5) d, 10 + (col + 0.5) d)
+    lat, lon = 60.0 - 10.5 * d, 10.0 + 20.25 * d
+    assert dem.elevation_at(lat, lon) == pytest.approx((49 - 10) * 4.0 + 19.75)
+    assert math.isnan(dem.elevation_at(61.0, 10.0))
+
+
+def _telemetry(**kw: float) -> TelemetrySample:
+    data = dict(lat=55.5, lon=37.5, alt=120.0, battery=0.9, timestamp=datetime(2024, 1, 1))
+    data.update(kw)
+    return TelemetrySample(**data)
+
+
+def test_flat_dem_matches_nadir_projector(tmp_path: Path) -> None:
+    _write_hgt(tmp_path / "N55E037.hgt", np.full((N, N), 250))
+    camera = CameraParams(resolution_px=1920)
+    terrain = TerrainGeoProjector(DEMTileStore(tmp_path), camera)
+    flat = PythonGeoProjector(camera)
+    boxes = np.array([[100, 100, 140, 160], [900, 500, 1000, 600], [1800, 1000, 1900, 1070]])
+    tel = _telemetry()
+    np.testing.assert_allclose(
+        terrain.project_many(tel, boxes, 1920, 1080),
+        flat.project_many(tel, boxes, 1920, 1080),
+        atol=1e-9,
+    )
+
+
+def test_ray_hits_rising_slope_earlier(tmp_path: Path) -> None:
+    dem = DEMTileStore(_slope_tile(tmp_path))
+    camera = CameraParams(resolution_px=1920)
+    terrain = TerrainGeoProjector(dem, camera)
+    # нос вверх на 30°: надирная камера смотрит вперёд-вниз на север, в сторону подъёма
+    tel = _telemetry(pitch=30.0)
+    lat, lon = terrain.project_bbox_to_ground(tel, (950, 530, 970, 550), 1920, 1080)
+
+    slope = 20.0 / M_PER_ROW
+    dy, dz = math.sin(math.radians(30)), -math.cos(math.radians(30))
+    t = 120.0 / (slope * dy - dz)
+    north_m = dy * t
+    assert lat == pytest.approx(55.5 + math.degrees(north_m / EARTH_RADIUS_M), abs=1e-7)
+    assert lon == pytest.approx(37.5, abs=1e-9)
+    flat_north = 120.0 * math.tan(math.radians(30))
+    assert north_m < flat_north
+
+
+def test_factory_selects_dem_projector(tmp_path: Path) -> None:
+    from types import SimpleNamespace
+
+    from fire_uav.module_core.factories import get_geo_projector
+
+    _slope_tile(tmp_path)
+    cfg = SimpleNamespace(geo_projector="dem", dem_dir=tmp_path, dem_max_open_tiles=4)
+    assert isinstance(get_geo_projector(cfg), TerrainGeoProjector)
+    cfg.dem_dir = tmp_path / "missing"
+    assert isinstance(get_geo_projector(cfg), PythonGeoProjector)